@@ -16,7 +16,10 @@ from pybotx import (
 
 from app.api.dependencies.bot import bot_dependency
 from app.api.exceptions.botx import handle_exceptions
+from app.bot.command_queue import CommandQueueFullError
 from app.logger import logger
+from app.metrics.instruments import COMMAND_QUEUE_REJECTED
+from app.services.server_timing import add_server_timing
 
 router = APIRouter()
 
@@ -25,16 +28,26 @@ router = APIRouter()
 @handle_exceptions
 async def command_handler(request: Request, bot: Bot = bot_dependency) -> JSONResponse:
     """Receive commands from users. Max timeout - 5 seconds."""
-    bot.async_execute_raw_bot_command(
-        await request.json(),
-        request_headers=request.headers,
-    )
+    try:
+        bot.async_execute_raw_bot_command(
+            await request.json(),
+            request_headers=request.headers,
+        )
+    except CommandQueueFullError as exc:
+        logger.warning(exc)
+        COMMAND_QUEUE_REJECTED.inc()
+        return JSONResponse(
+            build_bot_disabled_response("Bot is overloaded, try again later"),
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+        )
+
     return JSONResponse(
         build_command_accepted_response(), status_code=HTTPStatus.ACCEPTED
     )
 
 
 @router.post("/smartapps/request")
+@add_server_timing
 @handle_exceptions
 async def sync_smartapp_event_handler(
     request: Request, bot: Bot = bot_dependency
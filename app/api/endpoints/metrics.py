@@ -0,0 +1,21 @@
+"""Endpoint to expose application metrics."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from pybotx import Bot
+
+from app.api.dependencies.bot import bot_dependency
+from app.metrics.collector import collect_metrics
+from app.metrics.registry import render_dump
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(bot: Bot = bot_dependency) -> PlainTextResponse:
+    """Metrics of all application processes in Prometheus text format."""
+    return PlainTextResponse(
+        render_dump(collect_metrics(bot)), media_type=PROMETHEUS_CONTENT_TYPE
+    )
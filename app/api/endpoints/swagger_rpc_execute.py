@@ -1,26 +1,72 @@
 """Execute RPC method endpoint."""
+import asyncio
 from json import JSONDecodeError
+from typing import Any, Dict, List
 
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import JSONResponse
-from pybotx import Bot
-from pybotx_smartapp_rpc import RPCErrorResponse, SmartApp
+from pybotx import Bot, BotAccountWithSecret, UserFromSearch
+from pybotx_smartapp_rpc import RPCError, RPCErrorResponse, RPCResponse, SmartApp
 from pybotx_smartapp_rpc.models.request import RPCRequest
 from starlette.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
 
 from app.api.dependencies.bot import bot_dependency
 from app.services.execute_rpc import (
     RPCAuthConfig,
+    RPCBatchCall,
     event_factory,
     expand_config,
     security,
 )
+from app.services.server_timing import add_server_timing, timed
+from app.settings import settings
 from app.smartapp.smartapp import smartapp as smartapp_rpc
 
 router = APIRouter(include_in_schema=False)
 
 
+# Registered before `/{method}` to not be shadowed by it
+@router.post("/batch", response_class=JSONResponse)
+@add_server_timing
+async def rpc_batch_execute(
+    calls: List[RPCBatchCall],
+    credentials: RPCAuthConfig = Depends(security),
+    bot: Bot = bot_dependency,
+) -> JSONResponse:
+    """Execute RPC methods concurrently with the same auth config.
+
+    Responses are returned in order of calls.
+    """
+    if len(calls) > settings.RPC_BATCH_MAX_CALLS:
+        batch_error = RPCError(
+            reason="Too many calls in batch",
+            id="BatchTooLarge",
+            meta={"max_calls": settings.RPC_BATCH_MAX_CALLS},
+        )
+        return JSONResponse(
+            status_code=HTTP_400_BAD_REQUEST, content=[batch_error.dict()]
+        )
+
+    with timed("auth"):
+        bot_account, user_info = await expand_config(credentials, bot)
+    semaphore = asyncio.Semaphore(settings.RPC_BATCH_CONCURRENCY)
+
+    async def execute_call(call: RPCBatchCall) -> RPCResponse:  # noqa: WPS430
+        async with semaphore:
+            return await perform_rpc_call(
+                bot, call.method, call.params, credentials, bot_account, user_info
+            )
+
+    rpc_responses = await asyncio.gather(*map(execute_call, calls))
+
+    return JSONResponse(
+        status_code=HTTP_200_OK,
+        content=[rpc_response.jsonable_dict() for rpc_response in rpc_responses],
+    )
+
+
 @router.post("/{method:str}", response_class=JSONResponse)
+@add_server_timing
 async def rpc_execute(
     method: str,
     request: Request,
@@ -28,13 +74,36 @@ async def rpc_execute(
     bot: Bot = bot_dependency,
 ) -> JSONResponse:
     """Execute RPC method."""
-    bot_account, user_info = await expand_config(credentials, bot)
+    with timed("auth"):
+        bot_account, user_info = await expand_config(credentials, bot)
 
     try:
         method_payload = await request.json()
     except JSONDecodeError:
         method_payload = {}
 
+    rpc_response = await perform_rpc_call(
+        bot, method, method_payload, credentials, bot_account, user_info
+    )
+    if isinstance(rpc_response, RPCErrorResponse):
+        return JSONResponse(
+            status_code=HTTP_400_BAD_REQUEST,
+            content=rpc_response.jsonable_dict()["errors"],
+        )
+
+    return JSONResponse(
+        status_code=HTTP_200_OK, content=rpc_response.jsonable_dict().get("result")
+    )
+
+
+async def perform_rpc_call(
+    bot: Bot,
+    method: str,
+    method_payload: Dict[str, Any],
+    credentials: RPCAuthConfig,
+    bot_account: BotAccountWithSecret,
+    user_info: UserFromSearch,
+) -> RPCResponse:
     event = event_factory(
         method,
         method_payload,
@@ -47,15 +116,6 @@ async def rpc_execute(
     smartapp = SmartApp(bot, event.bot.id, event.chat.id, event)
     rpc_request = RPCRequest(method=method, type="smartapp_rpc", params=method_payload)
 
-    rpc_response = await smartapp_rpc._router.perform_rpc_request(  # noqa: WPS437
+    return await smartapp_rpc._router.perform_rpc_request(  # noqa: WPS437
         smartapp, rpc_request
     )
-    if isinstance(rpc_response, RPCErrorResponse):
-        return JSONResponse(
-            status_code=HTTP_400_BAD_REQUEST,
-            content=rpc_response.jsonable_dict()["errors"],
-        )
-
-    return JSONResponse(
-        status_code=HTTP_200_OK, content=rpc_response.jsonable_dict().get("result")
-    )
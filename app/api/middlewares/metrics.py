@@ -0,0 +1,47 @@
+"""Middleware to observe duration of HTTP requests."""
+
+import time
+from http import HTTPStatus
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics.instruments import HTTP_REQUEST_DURATION
+
+UNMATCHED_PATH = "unmatched"
+
+
+class HTTPMetricsMiddleware:
+    """Observe requests duration by route path template and response status.
+
+    Route template is used instead of request path, so path parameters don't
+    produce new series.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_start: Message = {}
+
+        async def send_with_status(message: Message) -> None:  # noqa: WPS430
+            if message["type"] == "http.response.start":
+                response_start.update(message)
+            await send(message)
+
+        start = time.perf_counter()
+        try:  # noqa: WPS501
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            # Response isn't started if application failed
+            status = response_start.get("status", HTTPStatus.INTERNAL_SERVER_ERROR)
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                path=UNMATCHED_PATH if route is None else route.path,
+                status=int(status),
+            )
@@ -1,23 +1,56 @@
 """Configuration for bot instance."""
+import asyncio
 from typing import Optional
 
-from httpx import AsyncClient, Limits
-from pybotx import Bot, CallbackRepoProto
+from httpx import AsyncClient, AsyncHTTPTransport, Limits
+from pybotx import Bot, CallbackRepoProto, UnknownBotAccountError
+from pybotx.models.commands import BotCommand
 
+from app.bot.command_queue import CommandQueue
 from app.bot.commands import common
+from app.bot.transport import InstrumentedTransport
+from app.services.bot_accounts import get_bot_accounts_index
 from app.settings import settings
 
 BOTX_CALLBACK_TIMEOUT = 30
 
 
+class QueuedCommandsBot(Bot):
+    """Bot which passes commands through `state.command_queue` if it's set."""
+
+    def async_execute_bot_command(  # type: ignore
+        self, bot_command: BotCommand
+    ) -> "asyncio.Future[None]":
+        command_queue: Optional[CommandQueue] = getattr(
+            self.state, "command_queue", None
+        )
+        if command_queue is None:
+            return super().async_execute_bot_command(bot_command)
+
+        # Unknown bot must be rejected before queueing, as in parent
+        bot_id = bot_command.bot.id
+        if get_bot_accounts_index(self).get(bot_id) is None:
+            raise UnknownBotAccountError(bot_id)
+
+        return command_queue.put(bot_command)
+
+    async def execute_bot_command_now(self, bot_command: BotCommand) -> None:
+        """Execute command bypassing queue and wait for it."""
+        await Bot.async_execute_bot_command(self, bot_command)
+
+
 def get_bot(callback_repo: Optional[CallbackRepoProto] = None) -> Bot:
-    return Bot(
+    return QueuedCommandsBot(
         collectors=[common.collector],
         bot_accounts=settings.BOT_CREDENTIALS,
         default_callback_timeout=BOTX_CALLBACK_TIMEOUT,
         httpx_client=AsyncClient(
             timeout=60,
-            limits=Limits(max_keepalive_connections=None, max_connections=None),
+            transport=InstrumentedTransport(
+                AsyncHTTPTransport(
+                    limits=Limits(max_keepalive_connections=None, max_connections=None)
+                )
+            ),
         ),
         callback_repo=callback_repo,
     )
@@ -0,0 +1,130 @@
+"""Bounded queue of incoming bot commands."""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, Hashable, List, Tuple
+
+from pybotx.models.commands import BotCommand
+
+from app.logger import logger
+
+CommandExecutor = Callable[[BotCommand], Awaitable[None]]
+QueuedCommand = Tuple[BotCommand, "asyncio.Future[None]"]
+
+
+class CommandQueueFullError(Exception):
+    """There is no room for command in queue."""
+
+
+@dataclass
+class CommandQueueStats:
+    depth: int
+    capacity: int
+    consumers: int
+    processed: int
+    rejected: int
+
+
+class CommandQueue:
+    """Commands queue processed by fixed number of consumers.
+
+    Commands of one chat are processed one by one in order of arrival, and
+    any idle consumer takes the next command of a chat which isn't being
+    processed. So slow command blocks only its chat. Capacity limits commands
+    waiting in queue.
+    """
+
+    def __init__(
+        self, executor: CommandExecutor, capacity: int, consumers_count: int
+    ) -> None:
+        self._executor = executor
+        self._capacity = capacity
+        self._consumers_count = consumers_count
+        self._chats_commands: Dict[Hashable, Deque[QueuedCommand]] = {}
+        # Chats with queued commands which aren't processed by any consumer
+        self._ready_chats: "asyncio.Queue[Hashable]" = asyncio.Queue()
+        self._consumers: List["asyncio.Task[None]"] = []
+        self._depth = 0
+        self._processed = 0
+        self._rejected = 0
+
+    @property
+    def stats(self) -> CommandQueueStats:
+        return CommandQueueStats(
+            depth=self._depth,
+            capacity=self._capacity,
+            consumers=self._consumers_count,
+            processed=self._processed,
+            rejected=self._rejected,
+        )
+
+    def start(self) -> None:
+        self._consumers = [
+            asyncio.create_task(self._consume()) for _ in range(self._consumers_count)
+        ]
+
+    async def stop(self) -> None:
+        """Wait for queued commands and stop consumers."""
+        await self._ready_chats.join()
+
+        for consumer in self._consumers:
+            consumer.cancel()
+
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+
+    def put(self, bot_command: BotCommand) -> "asyncio.Future[None]":
+        """Queue command and return future resolved when it's processed."""
+        if self._depth >= self._capacity:
+            self._rejected += 1
+            raise CommandQueueFullError(
+                f"Commands queue is full: {self._depth} commands"
+            )
+
+        chat_key = _get_chat_key(bot_command)
+        processed_future = asyncio.get_running_loop().create_future()
+        chat_commands = self._chats_commands.get(chat_key)
+        if chat_commands is None:
+            # Chat is neither queued nor processed, so it's ready
+            chat_commands = deque()
+            self._chats_commands[chat_key] = chat_commands
+            self._ready_chats.put_nowait(chat_key)
+
+        chat_commands.append((bot_command, processed_future))
+        self._depth += 1
+
+        return processed_future
+
+    async def _consume(self) -> None:
+        while True:  # noqa: WPS457
+            chat_key = await self._ready_chats.get()
+            chat_commands = self._chats_commands[chat_key]
+            bot_command, processed_future = chat_commands.popleft()
+            self._depth -= 1
+            try:
+                await self._executor(bot_command)
+            except Exception:
+                logger.exception("Bot command processing failed")
+            finally:
+                self._processed += 1
+                self._release_chat(chat_key, chat_commands)
+                if not processed_future.done():
+                    processed_future.set_result(None)
+
+    def _release_chat(
+        self, chat_key: Hashable, chat_commands: Deque[QueuedCommand]
+    ) -> None:
+        # Next command of chat waits for commands of other ready chats
+        if chat_commands:
+            self._ready_chats.put_nowait(chat_key)
+        else:
+            self._chats_commands.pop(chat_key)
+
+        self._ready_chats.task_done()
+
+
+def _get_chat_key(bot_command: BotCommand) -> Hashable:
+    chat = getattr(bot_command, "chat", None)
+    # Commands without chat don't have to wait for each other
+    return object() if chat is None else chat.id
@@ -8,9 +8,10 @@ from pybotx import (
     SyncSmartAppEventResponsePayload,
 )
 
+from app.bot.middlewares.chat_order import chat_order_middleware
 from app.smartapp.smartapp import smartapp
 
-collector = HandlerCollector()
+collector = HandlerCollector(middlewares=[chat_order_middleware])
 
 
 @collector.smartapp_event
@@ -0,0 +1,32 @@
+"""Middleware processing messages of one chat in order of arrival."""
+
+from functools import partial
+from typing import Hashable
+
+from pybotx import Bot, IncomingMessage
+from pybotx.bot.handler import IncomingMessageHandlerFunc
+
+from app.services.keyed_executor import KeyedExecutor
+from app.settings import settings
+
+chat_order_executor = KeyedExecutor()
+
+
+async def chat_order_middleware(
+    message: IncomingMessage, bot: Bot, call_next: IncomingMessageHandlerFunc
+) -> None:
+    """Wait for previous messages of the chat (and sender, if configured).
+
+    Messages of different chats are processed in parallel. Handler mustn't
+    wait for next message of its chat, it would never come.
+    """
+    await chat_order_executor.run(
+        get_order_key(message), partial(call_next, message, bot)
+    )
+
+
+def get_order_key(message: IncomingMessage) -> Hashable:
+    if settings.COMMANDS_ORDER_BY_SENDER:
+        return (message.chat.id, message.sender.huid)
+
+    return message.chat.id
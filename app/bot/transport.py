@@ -0,0 +1,51 @@
+"""HTTP transport of bot with requests metrics and tracing."""
+
+import re
+import time
+
+import httpx
+
+from app.metrics.instruments import BOTX_REQUEST_DURATION
+from app.services.server_timing import timed
+from app.tracing.spans import SpanKind, tracer
+
+# Ids of bots, chats and users would produce series per each of them
+ID_PATTERN = re.compile(
+    "[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE
+)
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Observe duration of requests sent by wrapped transport and trace them."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        path = ID_PATTERN.sub("{id}", request.url.path)
+        start = time.perf_counter()
+        with tracer.span(
+            f"botx {request.method} {path}",
+            SpanKind.CLIENT,
+            {"http.method": request.method, "url.path": path},
+        ) as span:
+            try:
+                with timed("botx"):
+                    response = await self._transport.handle_async_request(request)
+            except BaseException:  # noqa: WPS424
+                self._observe(request.method, path, start, "error")
+                raise
+
+            if span is not None:
+                span.attributes["http.status_code"] = response.status_code
+
+        self._observe(request.method, path, start, str(response.status_code))
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+    def _observe(self, method: str, path: str, start: float, status: str) -> None:
+        BOTX_REQUEST_DURATION.observe(
+            time.perf_counter() - start, method=method, path=path, status=status
+        )
@@ -0,0 +1,207 @@
+"""Repository for work with redis with in-process cache in front of it."""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager, suppress
+from typing import (
+    Any,
+    AsyncIterator,
+    Hashable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
+from uuid import uuid4
+
+from redis import asyncio as aioredis
+
+from app.caching.keys import KeyBuilder, build_key
+from app.caching.local_cache import LocalCache, LocalCacheStats
+from app.caching.redis_repo import ManyExpire, RedisRepo, RedisRepoPipeline, load_dump
+from app.caching.serializers import Serializer
+from app.logger import logger
+
+INVALIDATION_CHANNEL = "local_cache_invalidation"
+RESUBSCRIBE_DELAY = 1
+
+
+class CachedRedisRepo(RedisRepo):
+    """Redis repo with bounded in-process LRU cache as the first tier.
+
+    Changed keys are dropped from local caches of all processes (web workers
+    and tasks worker) through redis pub/sub. Values are cached locally only
+    while subscribed to invalidations, so a broken subscription can't leave
+    stale values behind. Values changed in redis bypassing the repo (or by
+    its `expire`) may be served from local cache for up to `local_ttl`.
+    """
+
+    def __init__(
+        self,
+        redis: aioredis.Redis,
+        prefix: Optional[str] = None,
+        expire: Optional[int] = None,
+        serializer: Optional[Serializer] = None,
+        key_builder: KeyBuilder = build_key,
+        local_maxsize: int = 1024,
+        local_ttl: float = 60,
+    ) -> None:
+        super().__init__(redis, prefix, expire, serializer, key_builder)
+
+        self._local_cache = LocalCache(local_maxsize, local_ttl)
+        self._channel = self._key_prefix + INVALIDATION_CHANNEL
+        self._instance_id = uuid4().hex
+        self._pubsub: Optional[aioredis.client.PubSub] = None
+        self._listener: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def local_cache_stats(self) -> LocalCacheStats:
+        return self._local_cache.stats
+
+    async def start(self) -> None:
+        self._pubsub = await self._subscribe()
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+
+            self._listener = None
+
+        await self._release_pubsub()
+
+    async def get(self, key: Hashable, default: Any = None) -> Any:
+        cached_data = self._local_cache.get(self._key(key))
+        if cached_data is None:
+            return await super().get(key, default)
+
+        return load_dump(self._serializer, cached_data, default)
+
+    async def set(
+        self, key: Hashable, storage_value: Any, expire: Optional[int] = None
+    ) -> None:
+        await super().set(key, storage_value, expire)
+        await self._invalidate([self._key(key)])
+
+    async def delete(self, key: Hashable) -> None:
+        await super().delete(key)
+        await self._invalidate([self._key(key)])
+
+    async def rget(self, key: Hashable, default: Any = None) -> Any:
+        storage_value = await super().rget(key, default)
+        await self._invalidate([self._key(key)])
+
+        return storage_value
+
+    async def get_many(  # noqa: WPS615
+        self, keys: Sequence[Hashable], default: Any = None
+    ) -> List[Any]:
+        cached_values = [self._local_cache.get(self._key(key)) for key in keys]
+        missed_keys = [
+            key for key, cached_data in zip(keys, cached_values) if cached_data is None
+        ]
+
+        fetched_values: Iterator[Any] = iter([])
+        if missed_keys:
+            fetched_values = iter(await super().get_many(missed_keys, default))
+
+        return [
+            next(fetched_values)
+            if cached_data is None
+            else load_dump(self._serializer, cached_data, default)
+            for cached_data in cached_values
+        ]
+
+    async def set_many(  # noqa: WPS615
+        self,
+        storage_values: Mapping[Hashable, Any],
+        expire: ManyExpire = None,
+    ) -> None:
+        await super().set_many(storage_values, expire)
+        await self._invalidate([self._key(key) for key in storage_values])
+
+    async def delete_many(self, keys: Sequence[Hashable]) -> None:
+        await super().delete_many(keys)
+        await self._invalidate([self._key(key) for key in keys])
+
+    @asynccontextmanager
+    async def pipeline(
+        self, transaction: bool = True
+    ) -> AsyncIterator[RedisRepoPipeline]:
+        async with super().pipeline(transaction) as repo_pipeline:
+            yield repo_pipeline
+            changed_keys = repo_pipeline.changed_keys
+
+        await self._invalidate(changed_keys)
+
+    async def _get_dump(self, redis_key: str) -> Optional[bytes]:
+        generation = self._local_cache.generation
+        cached_data = await super()._get_dump(redis_key)
+        if cached_data is not None:
+            self._cache_locally(redis_key, cached_data, generation)
+
+        return cached_data
+
+    async def _get_dumps(self, redis_keys: List[str]) -> List[Optional[bytes]]:
+        generation = self._local_cache.generation
+        fetched_values = await super()._get_dumps(redis_keys)
+        for redis_key, fetched_data in zip(redis_keys, fetched_values):
+            if fetched_data is not None:
+                self._cache_locally(redis_key, fetched_data, generation)
+
+        return fetched_values
+
+    def _cache_locally(
+        self, redis_key: str, cached_data: bytes, generation: int
+    ) -> None:
+        if self._pubsub is not None:
+            self._local_cache.put(redis_key, cached_data, generation=generation)
+
+    async def _invalidate(self, redis_keys: List[str]) -> None:
+        if not redis_keys:
+            return
+
+        self._local_cache.invalidate(redis_keys)
+
+        message = json.dumps({"sender": self._instance_id, "keys": redis_keys})
+        await self._redis.publish(self._channel, message)
+
+    async def _subscribe(self) -> aioredis.client.PubSub:
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(self._channel)
+
+        return pubsub
+
+    async def _release_pubsub(self) -> None:
+        self._local_cache.clear()
+
+        pubsub = self._pubsub
+        self._pubsub = None
+        if pubsub is not None:
+            await pubsub.aclose()
+
+    async def _listen(self) -> None:
+        while True:  # noqa: WPS457
+            try:
+                await self._consume_invalidations()
+            except Exception:
+                logger.exception("Local cache invalidations listener failed")
+
+            await self._release_pubsub()
+            await asyncio.sleep(RESUBSCRIBE_DELAY)
+
+    async def _consume_invalidations(self) -> None:
+        if self._pubsub is None:
+            self._pubsub = await self._subscribe()
+
+        async for message in self._pubsub.listen():
+            if message["type"] == "message":
+                self._handle_invalidation(message["data"])
+
+    def _handle_invalidation(self, message_data: bytes) -> None:
+        message = json.loads(message_data)
+        if message["sender"] != self._instance_id:
+            self._local_cache.invalidate(message["keys"])
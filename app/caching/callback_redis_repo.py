@@ -1,7 +1,7 @@
 """Repository for work callbacks with redis."""
 
 import asyncio
-import pickle  # noqa: S403
+from contextlib import suppress
 from typing import Dict, Optional
 from uuid import UUID
 
@@ -10,18 +10,28 @@ from pybotx.bot.exceptions import BotShuttingDownError, BotXMethodCallbackNotFou
 from pybotx.models.method_callbacks import BotXMethodCallback
 from redis import asyncio as aioredis
 
+from app.caching.serializers import PickleSerializer, SerializationError, Serializer
+from app.logger import logger
+from app.tracing.spans import traced_method
+
+PENDING_CALLBACK_EXPIRE = 60 * 60
+RESUBSCRIBE_DELAY = 1
+
 
 class CallbackRedisRepo(CallbackRepoProto):
     def __init__(
         self,
         redis: aioredis.Redis,
         prefix: Optional[str] = None,
+        serializer: Optional[Serializer] = None,
     ):
         self._redis = redis
         self._prefix = prefix or ""
+        self._serializer = serializer or PickleSerializer()
         self._pubsubs: Dict[UUID, aioredis.client.PubSub] = {}
         self._futures: Dict[UUID, asyncio.Future] = {}
 
+    @traced_method("redis callback")
     async def create_botx_method_callback(
         self,
         sync_id: UUID,
@@ -31,17 +41,19 @@ class CallbackRedisRepo(CallbackRepoProto):
         self._futures[sync_id] = asyncio.Future()
         self._pubsubs[sync_id] = pubsub
 
+    @traced_method("redis callback")
     async def set_botx_method_callback_result(
         self,
         callback: BotXMethodCallback,
     ) -> None:
-        dump = pickle.dumps(callback)
+        dump = self._serializer.dumps(callback)
         status_code = await self._redis.publish(
             f"{self._prefix}:{callback.sync_id}", dump
         )
         if status_code != 1:
             raise BotXMethodCallbackNotFoundError(sync_id=callback.sync_id)
 
+    @traced_method("redis callback")
     async def wait_botx_method_callback(
         self,
         sync_id: UUID,
@@ -54,6 +66,8 @@ class CallbackRedisRepo(CallbackRepoProto):
             )
         except asyncio.TimeoutError:
             raise CallbackNotReceivedError(sync_id) from None
+        finally:
+            await self._release_pubsub(sync_id)
 
         future = self._futures[sync_id]
         if future.done():
@@ -63,15 +77,17 @@ class CallbackRedisRepo(CallbackRepoProto):
 
         return callback
 
+    @traced_method("redis callback")
     async def pop_botx_method_callback(
         self,
         sync_id: UUID,
     ) -> "asyncio.Future[BotXMethodCallback]":
+        await self._release_pubsub(sync_id)
         return self._futures[sync_id]
 
     async def stop_callbacks_waiting(self) -> None:
-        for pubsub in self._pubsubs.values():
-            await pubsub.unsubscribe()
+        for pubsub_sync_id in list(self._pubsubs):
+            await self._release_pubsub(pubsub_sync_id)
 
         for sync_id, future in self._futures.items():
             if not future.done():
@@ -87,11 +103,189 @@ class CallbackRedisRepo(CallbackRepoProto):
         except KeyError:
             raise BotXMethodCallbackNotFoundError(sync_id) from None
 
-    @classmethod
+    async def _release_pubsub(self, sync_id: UUID) -> None:
+        pubsub = self._pubsubs.pop(sync_id, None)
+        if pubsub is None:
+            return
+
+        await pubsub.unsubscribe()
+        await pubsub.aclose()
+
     async def _get_callback(  # type: ignore
-        cls,
+        self,
         channel: aioredis.client.PubSub,
     ) -> BotXMethodCallback:
         async for message in channel.listen():
             if message["type"] == "message":
-                return pickle.loads(message["data"])  # noqa: S301
+                return self._serializer.loads(message["data"])
+
+
+class MultiplexedCallbackRedisRepo(CallbackRepoProto):
+    """Callback repo with one pattern subscription per process.
+
+    Instead of a dedicated pubsub connection per BotX method call, a single
+    listener dispatches incoming callbacks to the `sync_id -> Future` table.
+    The sender side checks a pending marker key, so callbacks that nobody
+    waits for are still rejected with `BotXMethodCallbackNotFoundError`.
+    """
+
+    def __init__(
+        self,
+        redis: aioredis.Redis,
+        prefix: Optional[str] = None,
+        pending_expire: int = PENDING_CALLBACK_EXPIRE,
+        serializer: Optional[Serializer] = None,
+    ):
+        self._redis = redis
+        self._prefix = prefix or ""
+        self._serializer = serializer or PickleSerializer()
+        self._pending_expire = pending_expire
+        self._futures: Dict[UUID, asyncio.Future] = {}
+        self._pubsub: Optional[aioredis.client.PubSub] = None
+        self._subscription: Optional["asyncio.Task[None]"] = None
+        self._listener: Optional["asyncio.Task[None]"] = None
+
+    @traced_method("redis callback")
+    async def create_botx_method_callback(
+        self,
+        sync_id: UUID,
+    ) -> None:
+        await self._ensure_subscribed()
+
+        self._futures[sync_id] = asyncio.get_running_loop().create_future()
+        await self._redis.set(self._pending_key(sync_id), 1, ex=self._pending_expire)
+
+    @traced_method("redis callback")
+    async def set_botx_method_callback_result(
+        self,
+        callback: BotXMethodCallback,
+    ) -> None:
+        sync_id = callback.sync_id
+        if not await self._redis.delete(self._pending_key(sync_id)):
+            raise BotXMethodCallbackNotFoundError(sync_id=sync_id)
+
+        dump = self._serializer.dumps(callback)
+        await self._redis.publish(f"{self._prefix}:{sync_id}", dump)
+
+    @traced_method("redis callback")
+    async def wait_botx_method_callback(
+        self,
+        sync_id: UUID,
+        timeout: float,
+    ) -> BotXMethodCallback:
+        future = self._get_future(sync_id)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            await self._redis.delete(self._pending_key(sync_id))
+            raise CallbackNotReceivedError(sync_id) from None
+        finally:
+            self._futures.pop(sync_id, None)
+
+    @traced_method("redis callback")
+    async def pop_botx_method_callback(
+        self,
+        sync_id: UUID,
+    ) -> "asyncio.Future[BotXMethodCallback]":
+        # Pending marker is left to expire: late callback will be published
+        # but dropped by listener, because future is already removed.
+        future = self._get_future(sync_id)
+        del self._futures[sync_id]  # noqa: WPS420
+
+        return future
+
+    async def stop_callbacks_waiting(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+
+            self._listener = None
+
+        await self._release_pubsub()
+        self._subscription = None
+
+        for sync_id, future in self._futures.items():
+            if not future.done():
+                future.set_exception(
+                    BotShuttingDownError(
+                        f"Callback with sync_id `{sync_id!s}` can't be received",
+                    ),
+                )
+
+    def _get_future(self, sync_id: UUID) -> asyncio.Future:
+        try:
+            return self._futures[sync_id]
+        except KeyError:
+            raise BotXMethodCallbackNotFoundError(sync_id) from None
+
+    def _pending_key(self, sync_id: UUID) -> str:
+        return f"{self._prefix}:pending_callback:{sync_id}"
+
+    async def _ensure_subscribed(self) -> None:
+        if self._subscription is None:
+            self._subscription = asyncio.create_task(self._subscribe())
+            self._subscription.add_done_callback(self._reset_failed_subscription)
+
+        # Shield so that cancelled caller doesn't break subscription for others
+        await asyncio.shield(self._subscription)
+
+    def _reset_failed_subscription(self, subscription: "asyncio.Task[None]") -> None:
+        # Next call subscribes again instead of re-raising the same error
+        if subscription.cancelled() or subscription.exception() is not None:
+            if self._subscription is subscription:
+                self._subscription = None
+
+    async def _subscribe(self) -> None:
+        self._pubsub = await self._open_pubsub()
+        self._listener = asyncio.create_task(self._listen())
+
+    async def _open_pubsub(self) -> aioredis.client.PubSub:
+        pubsub = self._redis.pubsub()
+        await pubsub.psubscribe(f"{self._prefix}:*")
+
+        return pubsub
+
+    async def _release_pubsub(self) -> None:
+        pubsub = self._pubsub
+        self._pubsub = None
+        if pubsub is not None:
+            await pubsub.aclose()
+
+    async def _listen(self) -> None:
+        while True:  # noqa: WPS457
+            try:
+                await self._consume_callbacks()
+            except Exception:
+                logger.exception("Callbacks listener failed, resubscribing")
+
+            await self._release_pubsub()
+            await asyncio.sleep(RESUBSCRIBE_DELAY)
+
+    async def _consume_callbacks(self) -> None:
+        if self._pubsub is None:
+            self._pubsub = await self._open_pubsub()
+
+        async for message in self._pubsub.listen():
+            if message["type"] == "pmessage":
+                self._dispatch(message["channel"], message["data"])
+
+    def _dispatch(self, channel: bytes, callback_dump: bytes) -> None:
+        try:
+            sync_id = UUID(channel.decode().rsplit(":", 1)[-1])
+        except ValueError:
+            return
+
+        future = self._futures.get(sync_id)
+        if future is None or future.done():
+            return
+
+        # Broken callback fails only its waiter, not the shared listener
+        try:
+            callback = self._serializer.loads(callback_dump)
+        except SerializationError as exc:
+            logger.warning(f"Callback `{sync_id}` can't be decoded")
+            future.set_exception(exc)
+            return
+
+        future.set_result(callback)
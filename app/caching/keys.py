@@ -0,0 +1,53 @@
+"""Cache keys building."""
+
+import hashlib
+import json
+from typing import Callable, Hashable, Iterable
+from uuid import UUID
+
+KeyBuilder = Callable[[Hashable], str]
+
+MAX_PLAIN_KEY_LENGTH = 128
+
+
+def build_key(key: Hashable) -> str:
+    """Build readable redis key, keys longer than `MAX_PLAIN_KEY_LENGTH` are hashed.
+
+    `str`, `int`, `float`, `bool`, `None`, `UUID` and tuples and frozensets of
+    them are encoded with a type tag, so e.g. `1` and `"1"` don't collide.
+    Items of frozensets are sorted, so keys don't depend on hash seed of
+    process. Keys of other types raise `TypeError`.
+    """
+    encoded_key = _encode_key(key)
+    if len(encoded_key) <= MAX_PLAIN_KEY_LENGTH:
+        return encoded_key
+
+    key_hash = hashlib.md5(encoded_key.encode()).hexdigest()  # noqa: S303
+    return f"h:{key_hash}"
+
+
+def _encode_key(key: Hashable) -> str:  # noqa: WPS212
+    if isinstance(key, str):
+        return f"s:{key}"
+    if key is None:
+        return "n:"
+    # bool is subclass of int, so it must be checked first
+    if isinstance(key, bool):
+        return f"b:{key:d}"
+    if isinstance(key, int):
+        return f"i:{key}"
+    if isinstance(key, float):
+        return f"f:{key!r}"
+    if isinstance(key, UUID):
+        return f"u:{key}"
+    if isinstance(key, tuple):
+        return "t:{0}".format(_dump_items(map(_encode_key, key)))
+    if isinstance(key, frozenset):
+        return "fs:{0}".format(_dump_items(sorted(map(_encode_key, key))))
+
+    key_type = type(key).__name__
+    raise TypeError(f"Unsupported type of cache key: `{key_type}`")
+
+
+def _dump_items(encoded_items: Iterable[str]) -> str:
+    return json.dumps(list(encoded_items), separators=(",", ":"), ensure_ascii=False)
@@ -0,0 +1,88 @@
+"""In-process LRU cache with TTL."""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+
+from app.metrics.instruments import REDIS_LOCAL_CACHE_EVENTS
+
+# Monotonic deadline and stored dump
+CacheEntry = Tuple[float, bytes]
+
+
+@dataclass
+class LocalCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class LocalCache:
+    """Bounded LRU cache for serialized values.
+
+    Values are stored as dumps, so callers can't mutate cached objects.
+    Events are counted both in `stats` and in `redis_local_cache_events_total`
+    metric.
+    `generation` is bumped on every invalidation: value fetched from the
+    slower storage is put only if no invalidation happened meanwhile.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.stats = LocalCacheStats()
+        self.generation = 0
+
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._count_event("misses")
+            return None
+
+        deadline, dump = entry
+        if deadline <= time.monotonic():
+            del self._entries[key]  # noqa: WPS420
+            self._count_event("misses")
+            return None
+
+        self._entries.move_to_end(key)
+        self._count_event("hits")
+        return dump
+
+    def put(
+        self,
+        key: str,
+        dump: bytes,
+        ttl: Optional[float] = None,
+        generation: Optional[int] = None,
+    ) -> None:
+        if generation is not None and generation != self.generation:
+            return
+
+        if ttl is None or ttl > self._ttl:
+            ttl = self._ttl
+
+        self._entries[key] = (time.monotonic() + ttl, dump)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self._count_event("evictions")
+
+    def invalidate(self, keys: Iterable[str]) -> None:
+        self.generation += 1
+        for key in keys:
+            if self._entries.pop(key, None) is not None:
+                self._count_event("invalidations")
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def _count_event(self, event: str) -> None:
+        setattr(self.stats, event, getattr(self.stats, event) + 1)
+        REDIS_LOCAL_CACHE_EVENTS.inc(event=event)
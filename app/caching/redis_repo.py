@@ -1,11 +1,109 @@
 """Repository for work with redis."""
 
-import hashlib
-import pickle  # noqa: S403
-from typing import Any, Hashable, Optional
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
 
 from redis import asyncio as aioredis
 
+from app.caching.keys import KeyBuilder, build_key
+from app.caching.serializers import PickleSerializer, SerializationError, Serializer
+from app.logger import logger
+from app.metrics.instruments import REDIS_OPERATION_DURATION, observed_method
+from app.services.server_timing import timed_method
+from app.tracing.spans import traced_method
+
+ExpireMapping = Mapping[Hashable, Optional[int]]
+ManyExpire = Union[int, ExpireMapping, None]
+
+# Marks queued commands which reply shouldn't be decoded
+NO_REPLY = object()
+
+
+def load_dump(serializer: Serializer, dump: Optional[bytes], default: Any) -> Any:
+    """Load value, missing or undecodable dump is a cache miss.
+
+    Dumps become undecodable when serializer settings are changed.
+    """
+    if dump is None:
+        return default
+
+    try:
+        return serializer.loads(dump)
+    except SerializationError:
+        logger.warning("Can't load cached value, it's treated as missing")
+        return default
+
+
+class RedisRepoPipeline:
+    """Queue repo commands to send them in one round-trip.
+
+    Replies of queued commands are available in `replies` after execution:
+    decoded value (or default) for `get` and `None` for `set` and `delete`.
+    Keys queued for `set` and `delete` are collected in `changed_keys`.
+    """
+
+    def __init__(
+        self,
+        pipeline: aioredis.client.Pipeline,
+        key_builder: KeyBuilder,
+        serializer: Serializer,
+        expire: Optional[int],
+    ) -> None:
+        self.replies: List[Any] = []
+        self.changed_keys: List[str] = []
+
+        self._pipeline = pipeline
+        self._key = key_builder
+        self._serializer = serializer
+        self._expire = expire
+        self._defaults: List[Any] = []
+
+    def get(self, key: Hashable, default: Any = None) -> None:
+        self._pipeline.get(self._key(key))
+        self._defaults.append(default)
+
+    def set(
+        self, key: Hashable, storage_value: Any, expire: Optional[int] = None
+    ) -> None:
+        if expire is None:
+            expire = self._expire
+
+        redis_key = self._key(key)
+        dumps = self._serializer.dumps(storage_value)
+        self._pipeline.set(redis_key, dumps, ex=expire)
+        self._defaults.append(NO_REPLY)
+        self.changed_keys.append(redis_key)
+
+    def delete(self, key: Hashable) -> None:
+        redis_key = self._key(key)
+        self._pipeline.delete(redis_key)
+        self._defaults.append(NO_REPLY)
+        self.changed_keys.append(redis_key)
+
+    @timed_method("redis")
+    async def execute(self) -> List[Any]:
+        raw_replies = await self._pipeline.execute()
+        self.replies = [
+            self._decode_reply(raw_reply, default)
+            for raw_reply, default in zip(raw_replies, self._defaults)
+        ]
+        return self.replies
+
+    def _decode_reply(self, raw_reply: Any, default: Any) -> Any:
+        if default is NO_REPLY:
+            return None
+
+        return load_dump(self._serializer, raw_reply, default)
+
 
 class RedisRepo:
     def __init__(
@@ -13,12 +111,21 @@ class RedisRepo:
         redis: aioredis.Redis,
         prefix: Optional[str] = None,
         expire: Optional[int] = None,
+        serializer: Optional[Serializer] = None,
+        key_builder: KeyBuilder = build_key,
     ) -> None:
         self._redis = redis
         self._prefix = prefix
         self._expire = expire
+        self._serializer = serializer or PickleSerializer()
+        self._key_builder = key_builder
         self._delimiter = "_"
 
+        if prefix is not None:
+            self._key_prefix = prefix + self._delimiter
+        else:
+            self._key_prefix = ""
+
     async def ping(self) -> Optional[str]:
         try:
             await self._redis.ping()
@@ -27,34 +134,113 @@ class RedisRepo:
 
         return None
 
+    @observed_method(REDIS_OPERATION_DURATION)
+    @traced_method("redis")
+    @timed_method("redis")
     async def get(self, key: Hashable, default: Any = None) -> Any:
-        cached_data = await self._redis.get(self._key(key))
-        if cached_data is None:
-            return default
-
-        return pickle.loads(cached_data)  # noqa: S301
+        cached_data = await self._get_dump(self._key(key))
+        return load_dump(self._serializer, cached_data, default)
 
+    @observed_method(REDIS_OPERATION_DURATION)
+    @traced_method("redis")
+    @timed_method("redis")
     async def set(
         self, key: Hashable, storage_value: Any, expire: Optional[int] = None
     ) -> None:
         if expire is None:
             expire = self._expire
 
-        dumps = pickle.dumps(storage_value)
+        dumps = self._serializer.dumps(storage_value)
         await self._redis.set(self._key(key), dumps, ex=expire)
 
+    @observed_method(REDIS_OPERATION_DURATION)
+    @traced_method("redis")
+    @timed_method("redis")
     async def delete(self, key: Hashable) -> None:
         await self._redis.delete(self._key(key))
 
+    @observed_method(REDIS_OPERATION_DURATION)
+    @traced_method("redis")
+    @timed_method("redis")
     async def rget(self, key: Hashable, default: Any = None) -> Any:
-        storage_value = await self.get(key, default)
-        await self.delete(key)
-        return storage_value
+        cached_data = await self._redis.getdel(self._key(key))
+        return load_dump(self._serializer, cached_data, default)
+
+    @observed_method(REDIS_OPERATION_DURATION)
+    @traced_method("redis")
+    @timed_method("redis")
+    async def get_many(  # noqa: WPS615
+        self, keys: Sequence[Hashable], default: Any = None
+    ) -> List[Any]:
+        if not keys:
+            return []
+
+        cached_values = await self._get_dumps([self._key(key) for key in keys])
+        return [
+            load_dump(self._serializer, cached_data, default)
+            for cached_data in cached_values
+        ]
+
+    @observed_method(REDIS_OPERATION_DURATION)
+    @traced_method("redis")
+    @timed_method("redis")
+    async def set_many(  # noqa: WPS615
+        self,
+        storage_values: Mapping[Hashable, Any],
+        expire: ManyExpire = None,
+    ) -> None:
+        """Set many values at once.
+
+        `expire` may be a mapping from key to its own expire.
+        """
+        if not storage_values:
+            return
+
+        if expire is None and self._expire is None:
+            await self._redis.mset(
+                {
+                    self._key(key): self._serializer.dumps(storage_value)
+                    for key, storage_value in storage_values.items()
+                }
+            )
+            return
+
+        async with self._pipeline(transaction=False) as pipeline:
+            for key, storage_value in storage_values.items():
+                if isinstance(expire, Mapping):
+                    pipeline.set(key, storage_value, expire.get(key))
+                else:
+                    pipeline.set(key, storage_value, expire)
+
+    @observed_method(REDIS_OPERATION_DURATION)
+    @traced_method("redis")
+    @timed_method("redis")
+    async def delete_many(self, keys: Sequence[Hashable]) -> None:
+        if keys:
+            await self._redis.delete(*[self._key(key) for key in keys])
+
+    @asynccontextmanager
+    async def pipeline(
+        self, transaction: bool = True
+    ) -> AsyncIterator[RedisRepoPipeline]:
+        """Send queued commands on exit, in MULTI/EXEC if `transaction` is set."""
+        async with self._pipeline(transaction) as repo_pipeline:
+            yield repo_pipeline
 
     def _key(self, arg: Hashable) -> str:
-        if self._prefix is not None:
-            prefix = self._prefix + self._delimiter
-        else:
-            prefix = ""
+        return self._key_prefix + self._key_builder(arg)
+
+    async def _get_dump(self, redis_key: str) -> Optional[bytes]:
+        return await self._redis.get(redis_key)
+
+    async def _get_dumps(self, redis_keys: List[str]) -> List[Optional[bytes]]:
+        return await self._redis.mget(redis_keys)
 
-        return prefix + hashlib.md5(pickle.dumps(arg)).hexdigest()  # noqa: S303
+    @asynccontextmanager
+    async def _pipeline(self, transaction: bool) -> AsyncIterator[RedisRepoPipeline]:
+        async with self._redis.pipeline(transaction=transaction) as redis_pipeline:
+            repo_pipeline = RedisRepoPipeline(
+                redis_pipeline, self._key, self._serializer, self._expire
+            )
+            yield repo_pipeline
+            await repo_pipeline.execute()
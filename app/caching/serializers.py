@@ -0,0 +1,146 @@
+"""Serializers for values stored in redis."""
+
+import json
+import pickle  # noqa: S403
+import zlib
+from dataclasses import asdict, is_dataclass
+from importlib import import_module
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, parse_obj_as
+from pydantic.json import pydantic_encoder
+
+from app.schemas.enums import RedisSerializers
+
+TYPE_FIELD = "__type__"
+DATA_FIELD = "__data__"
+
+RAW_HEADER = b"\x00"
+ZLIB_HEADER = b"\x01"
+
+
+class SerializationError(Exception):
+    """Dump can't be loaded, e.g. it's written with other serializer settings."""
+
+
+class Serializer:
+    def dumps(self, storage_value: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, dump: bytes) -> Any:
+        raise NotImplementedError
+
+
+class PickleSerializer(Serializer):
+    def dumps(self, storage_value: Any) -> bytes:
+        return pickle.dumps(storage_value)
+
+    def loads(self, dump: bytes) -> Any:
+        try:
+            return pickle.loads(dump)  # noqa: S301
+        except Exception as exc:
+            raise SerializationError("Invalid pickle dump") from exc
+
+
+class JSONSerializer(Serializer):
+    """JSON serializer with pydantic models and dataclasses support.
+
+    Models and dataclasses are stored with their import path and are
+    validated back on load. Other non-JSON types (UUID, datetime, etc.)
+    are loaded as their JSON representation.
+    """
+
+    def dumps(self, storage_value: Any) -> bytes:
+        return json.dumps(
+            storage_value,
+            default=self._encode_object,
+            separators=(",", ":"),
+            ensure_ascii=False,
+        ).encode()
+
+    def loads(self, dump: bytes) -> Any:
+        try:
+            return json.loads(dump, object_hook=self._decode_object)
+        except Exception as exc:
+            raise SerializationError("Invalid JSON dump") from exc
+
+    @classmethod
+    def _encode_object(cls, storage_value: Any) -> Any:
+        if isinstance(storage_value, BaseModel):
+            model_data = storage_value.dict()
+        elif is_dataclass(storage_value) and not isinstance(storage_value, type):
+            model_data = asdict(storage_value)
+        else:
+            return pydantic_encoder(storage_value)
+
+        obj_type = type(storage_value)
+        return {
+            TYPE_FIELD: f"{obj_type.__module__}:{obj_type.__qualname__}",
+            DATA_FIELD: model_data,
+        }
+
+    @classmethod
+    def _decode_object(cls, json_object: Dict[str, Any]) -> Any:
+        if TYPE_FIELD not in json_object:
+            return json_object
+
+        obj_type = cls._import_type(json_object[TYPE_FIELD])
+        return parse_obj_as(obj_type, json_object[DATA_FIELD])
+
+    @classmethod
+    def _import_type(cls, type_path: str) -> type:
+        module_name, qualname = type_path.split(":")
+
+        obj_type: Any = import_module(module_name)
+        for attr_name in qualname.split("."):
+            obj_type = getattr(obj_type, attr_name)
+
+        is_model = isinstance(obj_type, type) and issubclass(obj_type, BaseModel)
+        if not is_model and not is_dataclass(obj_type):
+            raise ValueError(f"`{type_path}` is not a model or dataclass")
+
+        return obj_type
+
+
+class CompressedSerializer(Serializer):
+    """Compress dumps of wrapped serializer which are bigger than threshold."""
+
+    def __init__(self, serializer: Serializer, threshold: int, level: int = 6) -> None:
+        self._serializer = serializer
+        self._threshold = threshold
+        self._level = level
+
+    def dumps(self, storage_value: Any) -> bytes:
+        dump = self._serializer.dumps(storage_value)
+        if len(dump) < self._threshold:
+            return RAW_HEADER + dump
+
+        return ZLIB_HEADER + zlib.compress(dump, self._level)
+
+    def loads(self, dump: bytes) -> Any:
+        header, payload = dump[:1], dump[1:]
+        if header == ZLIB_HEADER:
+            try:
+                payload = zlib.decompress(payload)
+            except zlib.error as exc:
+                raise SerializationError("Invalid compressed dump") from exc
+        elif header != RAW_HEADER:
+            raise SerializationError(f"Unknown dump header {header!r}")
+
+        return self._serializer.loads(payload)
+
+
+def build_serializer(
+    serializer_name: RedisSerializers,
+    compression_threshold: Optional[int] = None,
+) -> Serializer:
+    serializer: Serializer
+    if serializer_name == RedisSerializers.JSON:
+        serializer = JSONSerializer()
+    else:
+        serializer = PickleSerializer()
+
+    if compression_threshold is not None:
+        serializer = CompressedSerializer(serializer, compression_threshold)
+
+    return serializer
@@ -1,14 +1,78 @@
 """CRUD implementation."""
 
-from typing import Any, Dict, TypeVar
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import (  # noqa: WPS235
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
 
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.inspection import inspect
 
 from app.db.sqlalchemy import AsyncSession
+from app.metrics.instruments import CRUD_OPERATION_DURATION, observed_method
 
 T = TypeVar("T")  # noqa: WPS111
 
+# `True` to return the whole object or field names to return row with them
+Returning = Union[bool, Sequence[str]]
+
+# Name of primary key value parameter in prebuilt statements
+PKEY_PARAM = "crud_pkey_val"
+
+# Keeps statements far below postgres limit of 32767 bind parameters
+BULK_CHUNK_SIZE = 1000
+STREAM_CHUNK_SIZE = 1000
+
+
+def chunked(sequence: Sequence[T], chunk_size: int) -> Iterator[Sequence[T]]:
+    yield from (
+        sequence[chunk_start : chunk_start + chunk_size]  # noqa: E203
+        for chunk_start in range(0, len(sequence), chunk_size)
+    )
+
+
+@dataclass(frozen=True)
+class ModelStatements:
+    """Primary key and statements by it, built once per model."""
+
+    primary_key: Any
+    select_by_pkey: Any
+    update_by_pkey: Any
+    delete_by_pkey: Any
+
+
+@lru_cache(maxsize=None)
+def get_model_statements(cls_model: Any) -> ModelStatements:
+    mapper = inspect(cls_model)
+    primary_key_name = mapper.get_property_by_column(mapper.primary_key[0]).key
+    primary_key = getattr(cls_model, primary_key_name)
+    is_pkey_matched = primary_key == bindparam(PKEY_PARAM)
+
+    return ModelStatements(
+        primary_key=primary_key,
+        select_by_pkey=select(cls_model).where(is_pkey_matched),
+        update_by_pkey=(
+            update(cls_model)  # type: ignore
+            .where(is_pkey_matched)
+            .execution_options(synchronize_session="fetch")
+        ),
+        delete_by_pkey=(
+            delete(cls_model)  # type: ignore
+            .where(is_pkey_matched)
+            .execution_options(synchronize_session="fetch")
+        ),
+    )
+
 
 class CRUD:
     """CRUD operations for models."""
@@ -16,72 +80,241 @@ class CRUD:
     def __init__(self, session: AsyncSession, cls_model: Any):
         self._session = session
         self._cls_model = cls_model
+        self._statements = get_model_statements(cls_model)
+
+    @property
+    def metrics_labels(self) -> Dict[str, str]:
+        return {"model": self._cls_model.__tablename__}
 
-    async def create(self, *, model_data: Dict[str, Any]) -> Any:
-        """Create object."""
+    @observed_method(CRUD_OPERATION_DURATION)
+    async def create(
+        self, *, model_data: Dict[str, Any], returning: Returning = False
+    ) -> Any:
+        """Create object.
+
+        Return primary key or, if `returning` is set, the created object
+        (or its fields) from the same statement.
+        """
         query = insert(self._cls_model).values(**model_data)
+        if returning:
+            return await self._execute_returning(query, returning)
 
         res = await self._session.execute(query)  # type: ignore
         return res.inserted_primary_key  # type: ignore
 
+    @observed_method(CRUD_OPERATION_DURATION)
     async def update(
         self,
         *,
         pkey_val: Any,
         model_data: Dict[str, Any],
-    ) -> None:
-        """Update object by primary key."""
-        primary_key = inspect(self._cls_model).primary_key[0]
-        query = (
-            update(self._cls_model)  # type: ignore
-            .where(primary_key == pkey_val)
-            .values(**model_data)
-            .execution_options(synchronize_session="fetch")
-        )
+        returning: Returning = False,
+    ) -> Any:
+        """Update object by primary key.
+
+        Return updated object (or its fields) if `returning` is set.
+        """
+        query = self._statements.update_by_pkey.values(**model_data)
+        if returning:
+            return await self._execute_returning(query, returning, pkey_val)
 
-        await self._session.execute(query)
+        await self._session.execute(query, {PKEY_PARAM: pkey_val})
+        return None
 
+    @observed_method(CRUD_OPERATION_DURATION)
     async def delete(self, *, pkey_val: Any) -> None:
         """Delete object by primary key value."""
-        primary_key = inspect(self._cls_model).primary_key[0].name
-        query = (
-            delete(self._cls_model)  # type: ignore
-            .where(getattr(self._cls_model, primary_key) == pkey_val)
-            .execution_options(synchronize_session="fetch")
+        await self._session.execute(
+            self._statements.delete_by_pkey, {PKEY_PARAM: pkey_val}
         )
 
-        await self._session.execute(query)
-
+    @observed_method(CRUD_OPERATION_DURATION)
     async def get(self, *, pkey_val: Any) -> Any:
         """Get object by primary key."""
-        primary_key = inspect(self._cls_model).primary_key[0]
-        query = select(self._cls_model).where(primary_key == pkey_val)
-
-        rows = await self._session.execute(query)  # type: ignore
+        rows = await self._session.execute(
+            self._statements.select_by_pkey, {PKEY_PARAM: pkey_val}
+        )
         return rows.scalars().one()
 
+    @observed_method(CRUD_OPERATION_DURATION)
     async def get_or_none(self, *, pkey_val: Any) -> Any:
         """Get object by primary key or none."""
-        primary_key = inspect(self._cls_model).primary_key[0]
-        query = select(self._cls_model).where(primary_key == pkey_val)
-
-        rows = await self._session.execute(query)  # type: ignore
+        rows = await self._session.execute(
+            self._statements.select_by_pkey, {PKEY_PARAM: pkey_val}
+        )
         return rows.scalar()
 
+    @observed_method(CRUD_OPERATION_DURATION)
     async def all(
         self,
+        *,
+        after: Any = None,
+        limit: Optional[int] = None,
     ) -> Any:
-        """Get all objects by db model."""
-        query = select(self._cls_model)
+        """Get all objects by db model.
+
+        With `after` or `limit` objects are ordered by primary key and paginated
+        by its value: pass primary key of the last object to get the next page.
+        """
+        query = self._paginate(select(self._cls_model), after, limit)
 
         rows = await self._session.execute(query)
         return rows.scalars().all()
 
-    async def get_by_field(self, *, field: str, field_value: Any) -> Any:
-        """Return objects from db with condition field=val."""
+    @observed_method(CRUD_OPERATION_DURATION)
+    async def get_by_field(
+        self,
+        *,
+        field: str,
+        field_value: Any,
+        after: Any = None,
+        limit: Optional[int] = None,
+    ) -> Any:
+        """Return objects from db with condition field=val.
+
+        Pagination is the same as in `all`.
+        """
         query = select(self._cls_model).where(
             getattr(self._cls_model, field) == field_value
         )
+        query = self._paginate(query, after, limit)
 
         rows = await self._session.execute(query)  # type: ignore
         return rows.scalars().all()
+
+    async def stream(
+        self,
+        *,
+        field: Optional[str] = None,
+        field_value: Any = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[Any]:
+        """Iterate over objects fetching them from db by chunks.
+
+        Objects are filtered by condition field=val if `field` is set.
+        """
+        query = select(self._cls_model).order_by(self._statements.primary_key)
+        if field is not None:
+            query = query.where(getattr(self._cls_model, field) == field_value)
+
+        rows = await self._session.stream(query.execution_options(yield_per=chunk_size))
+        async for db_object in rows.scalars():
+            yield db_object
+
+    @observed_method(CRUD_OPERATION_DURATION)
+    async def create_many(
+        self,
+        *,
+        models_data: Sequence[Dict[str, Any]],
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> List[Any]:
+        """Create objects with multi-row inserts and return them in data order.
+
+        Order of rows returned by multi-row insert isn't guaranteed, so they
+        are sorted by SQLAlchemy "insertmanyvalues" to the order of data.
+        """
+        query = insert(self._cls_model).returning(
+            self._cls_model, sort_by_parameter_order=True
+        )
+        created_objects: List[Any] = []
+        for chunk in chunked(models_data, chunk_size):
+            rows = await self._session.execute(query, list(chunk))
+            created_objects.extend(rows.scalars().all())
+
+        return created_objects
+
+    @observed_method(CRUD_OPERATION_DURATION)
+    async def update_many(
+        self,
+        *,
+        models_data: Sequence[Dict[str, Any]],
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> None:
+        """Update objects by primary keys, which must be in each of `models_data`."""
+        for chunk in chunked(models_data, chunk_size):
+            await self._session.execute(update(self._cls_model), list(chunk))
+
+    @observed_method(CRUD_OPERATION_DURATION)
+    async def delete_many(
+        self,
+        *,
+        pkey_vals: Sequence[Any],
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> None:
+        """Delete objects by primary key values."""
+        primary_key = self._statements.primary_key
+        query = delete(self._cls_model).execution_options(  # type: ignore
+            synchronize_session="fetch"
+        )
+        for chunk in chunked(pkey_vals, chunk_size):
+            await self._session.execute(query.where(primary_key.in_(chunk)))
+
+    @observed_method(CRUD_OPERATION_DURATION)
+    async def upsert_many(
+        self,
+        *,
+        models_data: Sequence[Dict[str, Any]],
+        conflict_fields: Optional[Sequence[str]] = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> List[Any]:
+        """Insert objects or update them on conflict and return them.
+
+        Conflicts are checked by primary key if `conflict_fields` are not set.
+        All fields from `models_data` except the conflict ones are updated.
+        """
+        if conflict_fields is None:
+            conflict_fields = [self._statements.primary_key.key]
+
+        upserted_objects: List[Any] = []
+        for chunk in chunked(models_data, chunk_size):
+            query = pg_insert(self._cls_model).values(list(chunk))
+            updated_fields = {
+                field: query.excluded[field]
+                for field in chunk[0]
+                if field not in conflict_fields
+            }
+            if updated_fields:
+                query = query.on_conflict_do_update(
+                    index_elements=conflict_fields, set_=updated_fields
+                )
+            else:
+                query = query.on_conflict_do_nothing(index_elements=conflict_fields)
+
+            rows = await self._session.execute(
+                query.returning(self._cls_model).execution_options(
+                    populate_existing=True
+                )
+            )
+            upserted_objects.extend(rows.scalars().all())
+
+        return upserted_objects
+
+    def _paginate(self, query: Any, after: Any, limit: Optional[int]) -> Any:
+        if after is None and limit is None:
+            return query
+
+        primary_key = self._statements.primary_key
+        query = query.order_by(primary_key).limit(limit)
+        if after is not None:
+            query = query.where(primary_key > after)
+
+        return query
+
+    async def _execute_returning(
+        self, query: Any, returning: Returning, pkey_val: Any = None
+    ) -> Any:
+        query_params = {PKEY_PARAM: pkey_val} if pkey_val is not None else {}
+        if isinstance(returning, bool):
+            rows = await self._session.execute(
+                query.returning(self._cls_model).execution_options(
+                    populate_existing=True
+                ),
+                query_params,
+            )
+            return rows.scalars().one()
+
+        rows = await self._session.execute(
+            query.returning(*[getattr(self._cls_model, field) for field in returning]),
+            query_params,
+        )
+        return rows.one()
@@ -0,0 +1,133 @@
+"""Write-behind buffer coalescing concurrent inserts into multi-row inserts."""
+
+import asyncio
+from itertools import groupby
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.db.crud import BULK_CHUNK_SIZE, CRUD, get_model_statements
+from app.db.sqlalchemy import AsyncSessionFactory
+
+PendingInsert = Tuple[Dict[str, Any], "asyncio.Future[Any]"]
+
+
+class InsertBuffer:
+    """Collect inserts of one model and flush them in one transaction.
+
+    Rows are inserted `delay` seconds after the first of them or as soon as
+    `max_size` rows are collected. Each caller gets primary key of its row.
+    If flush fails, its rows are inserted one by one, so only callers of
+    invalid rows get exception. Rows are committed independently of callers
+    transactions.
+    """
+
+    def __init__(
+        self,
+        session_factory: AsyncSessionFactory,
+        cls_model: Any,
+        delay: float,
+        max_size: int = BULK_CHUNK_SIZE,
+    ) -> None:
+        self._session_factory = session_factory
+        self._cls_model = cls_model
+        self._primary_key_name = get_model_statements(cls_model).primary_key.key
+        self._delay = delay
+        self._max_size = max_size
+
+        self._pending: List[PendingInsert] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._flush_tasks: Set["asyncio.Task[None]"] = set()
+
+    async def insert(self, model_data: Dict[str, Any]) -> Any:
+        """Add row to buffer and wait for its primary key."""
+        pkey_future = asyncio.get_running_loop().create_future()
+        self._pending.append((model_data, pkey_future))
+
+        if len(self._pending) >= self._max_size:
+            self._start_flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(
+                self._delay, self._start_flush
+            )
+
+        return await pkey_future
+
+    async def flush(self) -> None:
+        """Insert collected rows now and wait for all started flushes."""
+        self._start_flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks)
+
+    def _start_flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        pending_inserts = self._pending
+        self._pending = []
+        if not pending_inserts:
+            return
+
+        flush_task = asyncio.create_task(self._insert_rows(pending_inserts))
+        self._flush_tasks.add(flush_task)
+        flush_task.add_done_callback(self._flush_tasks.discard)
+
+    async def _insert_rows(self, pending_inserts: List[PendingInsert]) -> None:
+        # Multi-row insert requires the same fields in each row
+        pending_inserts.sort(key=lambda pending_insert: _get_fields(pending_insert[0]))
+
+        try:
+            pkey_vals = await self._create_rows(
+                [model_data for model_data, _ in pending_inserts]
+            )
+        except Exception as exc:
+            if len(pending_inserts) == 1:
+                _set_exception(pending_inserts[0][1], exc)
+            else:
+                # Find invalid rows, so that only their callers get errors
+                await self._insert_rows_one_by_one(pending_inserts)
+            return
+
+        for (_, pkey_future), pkey_val in zip(pending_inserts, pkey_vals):
+            _set_result(pkey_future, pkey_val)
+
+    async def _insert_rows_one_by_one(
+        self, pending_inserts: List[PendingInsert]
+    ) -> None:
+        for model_data, pkey_future in pending_inserts:
+            try:
+                pkey_vals = await self._create_rows([model_data])
+            except Exception as exc:
+                _set_exception(pkey_future, exc)
+            else:
+                _set_result(pkey_future, pkey_vals[0])
+
+    async def _create_rows(self, models_data: List[Dict[str, Any]]) -> List[Any]:
+        created_objects: List[Any] = []
+        async with self._session_factory() as db_session:
+            crud = CRUD(session=db_session, cls_model=self._cls_model)
+            for _, same_fields_data in groupby(models_data, key=_get_fields):
+                created_objects.extend(
+                    await crud.create_many(models_data=list(same_fields_data))
+                )
+
+            await db_session.commit()
+
+        return [
+            getattr(created_object, self._primary_key_name)
+            for created_object in created_objects
+        ]
+
+
+def _get_fields(model_data: Dict[str, Any]) -> List[str]:
+    return sorted(model_data)
+
+
+def _set_result(pkey_future: "asyncio.Future[Any]", pkey_val: Any) -> None:
+    # Future is done if caller is cancelled
+    if not pkey_future.done():
+        pkey_future.set_result(pkey_val)
+
+
+def _set_exception(pkey_future: "asyncio.Future[Any]", exc: Exception) -> None:
+    if not pkey_future.done():
+        pkey_future.set_exception(exc)
@@ -17,7 +17,7 @@ import app.db.record.models  # isort:skip
 
 postgres_dsn = make_url_sync(settings.POSTGRES_DSN)
 context_config = context.config
-fileConfig(context_config.config_file_name)
+fileConfig(context_config.config_file_name, disable_existing_loggers=False)
 target_metadata = Base.metadata
 context_config.set_main_option("sqlalchemy.url", postgres_dsn)
 
@@ -1,31 +1,48 @@
 """Record repo."""
 
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
-from app.db.crud import CRUD
+from app.db.crud import CRUD, STREAM_CHUNK_SIZE
+from app.db.insert_buffer import InsertBuffer
 from app.db.record.models import RecordModel
 from app.db.sqlalchemy import AsyncSession
 from app.schemas.record import Record
 
 
 class RecordRepo:
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self, session: AsyncSession, insert_buffer: Optional[InsertBuffer] = None
+    ):
         """Initialize repo with CRUD."""
         self._crud = CRUD(session=session, cls_model=RecordModel)
+        self._insert_buffer = insert_buffer
 
     async def create(self, record_data: str) -> Record:
         """Create record row in db."""
-        row = await self._crud.create(model_data={"record_data": record_data})
-        record_in_db = await self._crud.get(pkey_val=row.id)
+        record_in_db = await self._crud.create(
+            model_data={"record_data": record_data}, returning=True
+        )
         return Record.from_orm(record_in_db)
 
+    async def create_deferred(self, record_data: str) -> int:
+        """Create record row through insert buffer and return its id.
+
+        Row is committed with concurrent deferred inserts, independently of
+        repo session. Without buffer row is created in repo session.
+        """
+        if self._insert_buffer is None:
+            record = await self.create(record_data)
+            return record.id
+
+        return await self._insert_buffer.insert({"record_data": record_data})
+
     async def update(self, record_id: int, record_data: str) -> Record:
         """Update record row in db."""
-        await self._crud.update(
+        record_in_db = await self._crud.update(
             pkey_val=record_id,
             model_data={"record_data": record_data},
+            returning=True,
         )
-        record_in_db = await self._crud.get(pkey_val=record_id)
         return Record.from_orm(record_in_db)
 
     async def delete(self, record_id: int) -> None:
@@ -42,15 +59,31 @@ class RecordRepo:
 
         return None
 
-    async def get_all(self) -> List[Record]:
-        """Get all objects."""
-        records_in_db = await self._crud.all()
+    async def get_all(
+        self, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Record]:
+        """Get all objects, by pages of `limit` after `after` id if set."""
+        records_in_db = await self._crud.all(after=after, limit=limit)
         return [Record.from_orm(record) for record in records_in_db]
 
-    async def filter_by_record_data(self, record_data: str) -> List[Record]:
+    async def iter_all(
+        self, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[Record]:
+        """Iterate over all objects fetching them by chunks."""
+        async for record in self._crud.stream(chunk_size=chunk_size):
+            yield Record.from_orm(record)
+
+    async def filter_by_record_data(
+        self,
+        record_data: str,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Record]:
         """Get all objects."""
         records_in_db = await self._crud.get_by_field(
             field="record_data",
             field_value=record_data,
+            after=after,
+            limit=limit,
         )
         return [Record.from_orm(record) for record in records_in_db]
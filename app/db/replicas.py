@@ -0,0 +1,172 @@
+"""Routing of read-only sessions statements to read replicas."""
+
+import asyncio
+import time
+from itertools import count
+from typing import Any, Dict, List, Optional, Sequence, Set, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session, SessionTransaction
+from sqlalchemy.sql import text
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.selectable import GenerativeSelect
+
+from app.schemas.enums import ReplicaBalancing
+
+# Seconds after which failed replica is probed again
+REPLICA_RECHECK_INTERVAL = 30
+
+
+class ReplicaBalancer:
+    """Choose replica for session transaction.
+
+    Replicas failed on health check aren't chosen. They are probed again in
+    background `recheck_interval` seconds after failure, or on next
+    `check_health`.
+    """
+
+    def __init__(
+        self,
+        engines: Sequence[AsyncEngine],
+        strategy: ReplicaBalancing,
+        recheck_interval: float = REPLICA_RECHECK_INTERVAL,
+    ) -> None:
+        self._engines = list(engines)
+        self._strategy = strategy
+        self._recheck_interval = recheck_interval
+        # Failed replicas with monotonic time of their next probe
+        self._unhealthy: Dict[int, float] = {}
+        self._probes: Set["asyncio.Task[None]"] = set()
+        self._round_robin_counter = count()
+
+    @property
+    def engines(self) -> List[AsyncEngine]:
+        return self._engines
+
+    def choose(self) -> Optional[AsyncEngine]:
+        self._start_overdue_probes()
+
+        healthy_engines = [
+            replica_engine
+            for replica_engine in self._engines
+            if id(replica_engine) not in self._unhealthy
+        ]
+        if not healthy_engines:
+            return None
+
+        if self._strategy == ReplicaBalancing.LEAST_CONNECTIONS:
+            return min(healthy_engines, key=_checked_out_connections_count)
+
+        engine_index = next(self._round_robin_counter) % len(healthy_engines)
+        return healthy_engines[engine_index]
+
+    async def check_health(self) -> List[str]:
+        """Check connection to each replica and return errors of failed ones."""
+        errors = []
+        for replica_index, replica_engine in enumerate(self._engines):
+            replica_error = await self._probe(replica_engine)
+            if replica_error is not None:
+                errors.append(f"replica {replica_index}: {replica_error}")
+
+        return errors
+
+    async def _probe(self, replica_engine: AsyncEngine) -> Optional[str]:
+        try:
+            async with replica_engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        except Exception as exc:
+            next_probe_time = time.monotonic() + self._recheck_interval
+            self._unhealthy[id(replica_engine)] = next_probe_time
+            return str(exc)
+
+        self._unhealthy.pop(id(replica_engine), None)
+        return None
+
+    async def _recheck(self, replica_engine: AsyncEngine) -> None:
+        await self._probe(replica_engine)
+
+    def _start_overdue_probes(self) -> None:
+        now = time.monotonic()
+        for replica_engine in self._engines:
+            next_probe_time = self._unhealthy.get(id(replica_engine))
+            if next_probe_time is None or next_probe_time > now:
+                continue
+
+            # Replica stays unhealthy while probe is running
+            self._unhealthy[id(replica_engine)] = now + self._recheck_interval
+            probe = asyncio.create_task(self._recheck(replica_engine))
+            self._probes.add(probe)
+            probe.add_done_callback(self._probes.discard)
+
+
+class RoutingSession(Session):
+    """Session which routes reads of read-only sessions to replicas.
+
+    Session is read-only if `info["read_only"]` is set. Only SELECT
+    statements (without FOR UPDATE) and statements with `replica` execution
+    option are routed to replica. Other statements, e.g. textual ones, and
+    flushes go to primary, and the rest of transaction stays on primary after
+    them. Replica is chosen once per transaction, primary is used if there is
+    no healthy one.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        replica_balancer: Optional[ReplicaBalancer] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._replica_balancer = replica_balancer
+        self._transaction_bind: Optional[Union[Engine, Connection]] = None
+
+    def get_bind(  # type: ignore
+        self, mapper: Any = None, clause: Any = None, **kwargs: Any
+    ) -> Union[Engine, Connection]:
+        primary_bind = super().get_bind(mapper, clause=clause, **kwargs)
+        if self._replica_balancer is None or not self.info.get("read_only"):
+            return primary_bind
+
+        if self._transaction_bind is None and clause is None:
+            # Connection requested before any statement
+            return primary_bind
+
+        if self._flushing or not _is_replica_read(clause):
+            self._transaction_bind = primary_bind
+        elif self._transaction_bind is None:
+            replica_engine = self._replica_balancer.choose()
+            self._transaction_bind = (
+                primary_bind if replica_engine is None else replica_engine.sync_engine
+            )
+
+        return self._transaction_bind
+
+    def reset_transaction_bind(self) -> None:
+        self._transaction_bind = None
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_bind_on_transaction_end(
+    session: RoutingSession, transaction: SessionTransaction
+) -> None:
+    if transaction.parent is None:
+        session.reset_transaction_bind()
+
+
+def _is_replica_read(clause: Any) -> bool:
+    if clause is None:
+        return True
+
+    if isinstance(clause, Executable) and clause.get_execution_options().get("replica"):
+        return True
+
+    if not isinstance(clause, GenerativeSelect):
+        return False
+
+    return clause._for_update_arg is None  # noqa: WPS437
+
+
+def _checked_out_connections_count(replica_engine: AsyncEngine) -> int:
+    return replica_engine.pool.checkedout()  # type: ignore
@@ -1,9 +1,12 @@
 """SQLAlchemy helpers."""
 
+import time
 from asyncio import current_task
-from typing import Callable
+from typing import Any, Callable, Dict
+from uuid import uuid4
 
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, event
+from sqlalchemy.engine import Connection, Engine, ExceptionContext, ExecutionContext
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -11,13 +14,28 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import SessionTransaction, declarative_base
+from sqlalchemy.pool import ConnectionPoolEntry, Pool
 from sqlalchemy.pool.impl import AsyncAdaptedQueuePool
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.sql.selectable import GenerativeSelect
 
+from app.db.replicas import ReplicaBalancer, RoutingSession
+from app.logger import logger
+from app.services.server_timing import add_timing
 from app.settings import settings
+from app.tracing.spans import SpanKind, tracer
 
 AsyncSessionFactory = Callable[..., AsyncSession]
 
+# Long statements, e.g. multi-row inserts, are truncated in spans
+SPAN_STATEMENT_MAX_LENGTH = 1000
+
+# Textual statements starting with them don't write
+READ_STATEMENT_KEYWORDS = frozenset(("SELECT", "SHOW", "EXPLAIN"))
+# Key of session info in info of connection used by session
+SESSION_INFO_KEY = "session_info"
+
 
 def make_url_async(url: str) -> str:
     """Add +asyncpg to url scheme."""
@@ -39,20 +57,216 @@ convention = {
 
 Base = declarative_base(metadata=MetaData(naming_convention=convention))
 
-engine: AsyncEngine = create_async_engine(
-    make_url_async(settings.POSTGRES_DSN), poolclass=AsyncAdaptedQueuePool
+
+class CheckoutTimingPool(AsyncAdaptedQueuePool):
+    """Pool which logs connections checkouts waiting longer than threshold."""
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:  # noqa: WPS501
+            return super()._do_get()
+        finally:
+            wait_time = time.perf_counter() - start
+            if wait_time >= settings.POSTGRES_POOL_CHECKOUT_WARNING_THRESHOLD:
+                logger.warning(
+                    f"DB pool checkout waited {wait_time:.3f}s: {self.status()}"
+                )
+
+
+def build_connect_args() -> Dict[str, Any]:
+    connect_args: Dict[str, Any] = {}
+
+    if settings.POSTGRES_PGBOUNCER_MODE:
+        # pgbouncer may route statements of one connection to different
+        # server connections, so statements aren't cached and names are unique
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    else:
+        connect_args["statement_cache_size"] = settings.POSTGRES_STATEMENT_CACHE_SIZE
+        connect_args[
+            "prepared_statement_cache_size"
+        ] = settings.POSTGRES_STATEMENT_CACHE_SIZE
+
+    if settings.POSTGRES_STATEMENT_TIMEOUT is not None:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.POSTGRES_STATEMENT_TIMEOUT)
+        }
+
+    return connect_args
+
+
+def build_engine(dsn: str) -> AsyncEngine:
+    return create_async_engine(
+        make_url_async(dsn),
+        poolclass=CheckoutTimingPool,
+        pool_size=settings.POSTGRES_POOL_SIZE,
+        max_overflow=settings.POSTGRES_POOL_MAX_OVERFLOW,
+        pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+        pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+        pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+        connect_args=build_connect_args(),
+    )
+
+
+engine: AsyncEngine = build_engine(settings.POSTGRES_DSN)
+
+replica_balancer = ReplicaBalancer(
+    [build_engine(dsn) for dsn in settings.POSTGRES_REPLICA_DSNS],
+    settings.POSTGRES_REPLICA_BALANCING,
 )
 
 
 async def build_db_session_factory() -> AsyncSessionFactory:
     await verify_db_connection(engine)
 
-    return async_scoped_session(
-        async_sessionmaker(bind=engine, expire_on_commit=False),
-        scopefunc=current_task,
+    # Unavailable replicas shouldn't prevent startup, they are skipped instead
+    for replica_error in await replica_balancer.check_health():
+        logger.warning(f"DB replica is unavailable: {replica_error}")
+
+    return async_scoped_session(build_db_sessionmaker(), scopefunc=current_task)
+
+
+def build_db_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Build factory of sessions not bound to tasks, for background work."""
+    return async_sessionmaker(
+        bind=engine,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        replica_balancer=replica_balancer,
+    )
+
+
+def has_writes(db_session: AsyncSession) -> bool:
+    """Check if session executed non-select statements or has pending changes."""
+    if db_session.info.get("has_writes"):
+        return True
+
+    return bool(db_session.new or db_session.dirty or db_session.deleted)
+
+
+def is_write_statement(statement: Any) -> bool:
+    """Check if statement may write, textual one is checked by first keyword."""
+    if isinstance(statement, TextClause):
+        statement_keywords = statement.text.split(None, 1) or [""]
+        return statement_keywords[0].upper() not in READ_STATEMENT_KEYWORDS
+
+    return not isinstance(statement, GenerativeSelect)
+
+
+@event.listens_for(RoutingSession, "after_begin")
+def _bind_connection_to_session(
+    session: RoutingSession, transaction: SessionTransaction, connection: Connection
+) -> None:
+    # Statements executed on session connection, even Core ones, mark session
+    connection.info[SESSION_INFO_KEY] = session.info
+
+
+@event.listens_for(Engine, "before_execute")
+def _track_writes(
+    connection: Connection,
+    statement: Any,
+    multiparams: Any,
+    statement_params: Any,
+    execution_options: Any,
+) -> None:
+    session_info = connection.info.get(SESSION_INFO_KEY)
+    if session_info is not None and is_write_statement(statement):
+        session_info["has_writes"] = True
+
+
+@event.listens_for(Pool, "checkin")
+def _unbind_connection_from_session(
+    dbapi_connection: Any, connection_record: ConnectionPoolEntry
+) -> None:
+    connection_record.info.pop(SESSION_INFO_KEY, None)
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_writes_on_transaction_end(
+    session: RoutingSession, transaction: SessionTransaction
+) -> None:
+    if transaction.parent is None:
+        session.info.pop("has_writes", None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_timing(
+    connection: Any,
+    cursor: Any,
+    statement: str,
+    statement_params: Any,
+    context: ExecutionContext,
+    executemany: bool,
+) -> None:
+    context.timing_start = time.perf_counter()  # type: ignore
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_statement_timing(
+    connection: Any,
+    cursor: Any,
+    statement: str,
+    statement_params: Any,
+    context: ExecutionContext,
+    executemany: bool,
+) -> None:
+    add_timing("db", time.perf_counter() - context.timing_start)  # type: ignore
+
+
+@event.listens_for(Engine, "handle_error")
+def _end_failed_statement_timing(exception_context: ExceptionContext) -> None:
+    timing_start = getattr(exception_context.execution_context, "timing_start", None)
+    if timing_start is not None:
+        add_timing("db", time.perf_counter() - timing_start)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_span(
+    connection: Any,
+    cursor: Any,
+    statement: str,
+    statement_params: Any,
+    context: ExecutionContext,
+    executemany: bool,
+) -> None:
+    if tracer.exporter is None:
+        return
+
+    operation_name = statement.split(None, 1)[0].upper() if statement else ""
+    context.tracing_span = tracer.start_span(  # type: ignore
+        f"db {operation_name}",
+        SpanKind.CLIENT,
+        attributes={
+            "db.system": "postgresql",
+            "db.statement": statement[:SPAN_STATEMENT_MAX_LENGTH],
+            "server.address": str(connection.engine.url.host),
+        },
     )
 
 
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_statement_span(
+    connection: Any,
+    cursor: Any,
+    statement: str,
+    statement_params: Any,
+    context: ExecutionContext,
+    executemany: bool,
+) -> None:
+    span = getattr(context, "tracing_span", None)
+    if span is not None:
+        tracer.end_span(span)
+
+
+@event.listens_for(Engine, "handle_error")
+def _fail_statement_span(exception_context: ExceptionContext) -> None:
+    span = getattr(exception_context.execution_context, "tracing_span", None)
+    if span is not None:
+        span.fail(exception_context.original_exception)
+        tracer.end_span(span)
+
+
 async def verify_db_connection(engine: AsyncEngine) -> None:
     connection = await engine.connect()
     await connection.close()
@@ -60,3 +274,5 @@ async def verify_db_connection(engine: AsyncEngine) -> None:
 
 async def close_db_connections() -> None:
     await engine.dispose()
+    for replica_engine in replica_balancer.engines:
+        await replica_engine.dispose()
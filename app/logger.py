@@ -1,15 +1,22 @@
 """Configured application logger."""
 
+import json
 import logging
 import sys
-from typing import TYPE_CHECKING
+import threading
+import time
+import traceback
+from queue import Full, Queue
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, TextIO
 
 from loguru import logger as _logger
 
 from app.settings import settings
 
 if TYPE_CHECKING:  # To avoid circular import
-    from loguru import Logger
+    from loguru import Logger, Record
+
+LOG_QUEUE_MAX_SIZE = 10000
 
 
 # This code copied from loguru docs, ignoring all linters warnings
@@ -28,37 +35,175 @@ class InterceptHandler(logging.Handler):
             frame = frame.f_back  # type: ignore [assignment]
             depth += 1
 
-        logger.opt(depth=depth, exception=record.exc_info).log(
-            level, record.getMessage()
+        # Loguru names record by module of caller frame, not by stdlib logger
+        logger.bind(logger_name=record.name).opt(
+            depth=depth, exception=record.exc_info
+        ).log(level, record.getMessage())
+
+
+def get_logger_name(record: "Record") -> str:
+    """Return name of stdlib logger of intercepted record or module name."""
+    return str(record["extra"].get("logger_name", record["name"]))
+
+
+class RateLimitFilter:
+    """Pass at most `limit` records per second of each logger.
+
+    Warnings and errors always pass. Number of records dropped in previous
+    second is added to the next passed record of logger as `dropped_records`.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self._limit = limit
+        self._window_start = time.monotonic()
+        self._counts: Dict[str, int] = {}
+        self._dropped: Dict[str, int] = {}
+
+    def __call__(self, record: "Record") -> bool:
+        if record["level"].no >= logging.WARNING:
+            return True
+
+        now = time.monotonic()
+        if now - self._window_start >= 1:
+            self._window_start = now
+            self._counts.clear()
+
+        logger_name = get_logger_name(record)
+        records_count = self._counts.get(logger_name, 0) + 1
+        self._counts[logger_name] = records_count
+        if records_count > self._limit:
+            self._dropped[logger_name] = self._dropped.get(logger_name, 0) + 1
+            return False
+
+        dropped_count = self._dropped.pop(logger_name, None)
+        if dropped_count is not None:
+            record["extra"]["dropped_records"] = dropped_count
+
+        return True
+
+
+class BackgroundStreamWriter:
+    """Write messages to stream from separate thread.
+
+    Logging call only puts message to queue, so slow stream doesn't block
+    event loop. Messages that don't fit into full queue and messages failed to
+    be written are dropped and counted in `dropped_count`. Remaining messages
+    are written on `stop`, which is called by loguru on handler removal and at
+    exit.
+    """
+
+    def __init__(self, stream: TextIO, max_size: int = LOG_QUEUE_MAX_SIZE) -> None:
+        self._stream = stream
+        self._messages: "Queue[Optional[str]]" = Queue(max_size)
+        self._dropped_count = 0
+        self._dropped_count_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._write_messages, daemon=True)
+        self._thread.start()
+
+    @property
+    def dropped_count(self) -> int:
+        return self._dropped_count
+
+    def write(self, message: str) -> None:
+        try:
+            self._messages.put_nowait(message)
+        except Full:
+            self._count_dropped(1)
+
+    def stop(self) -> None:
+        self._messages.put(None)
+        self._thread.join()
+
+    def _write_messages(self) -> None:
+        is_stopped = False
+        while not is_stopped:
+            # Messages logged meanwhile are written at once
+            messages: List[Optional[str]] = [self._messages.get()]
+            while not self._messages.empty():
+                messages.append(self._messages.get())
+
+            is_stopped = None in messages
+            self._write_batch(list(filter(None, messages)))
+
+    def _write_batch(self, messages: List[str]) -> None:
+        # Writing thread must survive stream errors, logger can't report them
+        try:
+            self._write_to_stream("".join(messages))
+        except Exception:
+            self._count_dropped(len(messages))
+            sys.stderr.write("Log messages writing failed:\n")
+            traceback.print_exc(file=sys.stderr)
+
+    def _write_to_stream(self, text: str) -> None:
+        self._stream.write(text)
+        self._stream.flush()
+
+    def _count_dropped(self, messages_count: int) -> None:
+        with self._dropped_count_lock:
+            self._dropped_count += messages_count
+
+
+def format_json(record: "Record") -> str:
+    """Serialize record to one JSON line in `extra[json]`."""
+    extra = dict(record["extra"])
+    extra.pop("logger_name", None)
+    json_record: Dict[str, Any] = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "logger": get_logger_name(record),
+        "function": record["function"],
+        "line": record["line"],
+    }
+    if extra:
+        json_record["extra"] = extra
+    if record["exception"] is not None:
+        json_record["exception"] = "".join(
+            traceback.format_exception(*record["exception"])
         )
 
+    record["extra"]["json"] = json.dumps(
+        json_record, default=str, ensure_ascii=False, separators=(",", ":")
+    )
+    return "{extra[json]}\n"
+
 
 def setup_logger() -> "Logger":
+    log_level = logging.DEBUG if settings.DEBUG else logging.INFO
+
     # Remove every logger's handlers and propagate to root logger
     for name in logging.root.manager.loggerDict.keys():
         logging.getLogger(name).handlers = []
         logging.getLogger(name).propagate = True
 
-    # Intercept everything at the root logger
-    logging.basicConfig(handlers=[InterceptHandler()], level=0)
+    # Intercept everything at the root logger. Records below log level are
+    # rejected by stdlib before intercepting, so callers frames aren't walked.
+    logging.basicConfig(handlers=[InterceptHandler(level=log_level)], level=log_level)
     if settings.SQL_DEBUG:
         logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
 
     # httpx duplicates pybotx logs
     _logger.disable("httpx")
+    logging.getLogger("httpx").disabled = True
 
     _logger.enable("pybotx")
 
+    handler_config: Dict[str, Any] = {
+        "sink": sys.stdout,
+        "level": log_level,
+        "enqueue": True,
+    }
+    if settings.LOG_JSON:
+        handler_config = {
+            "sink": BackgroundStreamWriter(sys.stdout),
+            "level": log_level,
+            "format": format_json,
+        }
+    if settings.LOG_RATE_LIMIT:
+        handler_config["filter"] = RateLimitFilter(settings.LOG_RATE_LIMIT)
+
     # Setup loguru main logger
-    _logger.configure(
-        handlers=[
-            {
-                "sink": sys.stdout,
-                "level": logging.DEBUG if settings.DEBUG else logging.INFO,
-                "enqueue": True,
-            }
-        ],
-    )
+    _logger.configure(handlers=[handler_config])
 
     return _logger
 
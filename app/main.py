@@ -1,5 +1,6 @@
 """Application with configuration for events, routers and middleware."""
 
+import asyncio
 from functools import partial
 from typing import Any, Dict, Optional
 
@@ -7,39 +8,124 @@ from fastapi import FastAPI
 from pybotx import Bot, CallbackRepoProto
 from redis import asyncio as aioredis
 
+from app.api.middlewares.metrics import HTTPMetricsMiddleware
 from app.api.routers import router
-from app.bot.bot import get_bot
+from app.bot.bot import QueuedCommandsBot, get_bot
+from app.bot.command_queue import CommandQueue
+from app.caching.cached_redis_repo import CachedRedisRepo
 from app.caching.redis_repo import RedisRepo
+from app.caching.serializers import build_serializer
 from app.constants import BOT_PROJECT_NAME
-from app.db.sqlalchemy import build_db_session_factory, close_db_connections
+from app.db.insert_buffer import InsertBuffer
+from app.db.record.models import RecordModel
+from app.db.sqlalchemy import (
+    build_db_session_factory,
+    build_db_sessionmaker,
+    close_db_connections,
+)
+from app.metrics.collector import write_metrics_periodically
+from app.metrics.registry import REGISTRY, MultiprocessMetricsStore
+from app.services.bot_accounts import BotAccountsIndex
 from app.services.openapi import custom_openapi
 from app.services.static_files import StaticFilesCustomHeaders
 from app.settings import settings
 from app.smartapp.smartapp import smartapp
+from app.tracing.exporter import FileSpanExporter
+from app.tracing.spans import tracer
 
 
 async def startup(bot: Bot) -> None:
+    # -- Tracing --
+    if settings.TRACING_EXPORT_DIR:
+        tracer.exporter = FileSpanExporter(
+            settings.TRACING_EXPORT_DIR, BOT_PROJECT_NAME
+        )
+
     # -- Bot --
     await bot.startup()
+    bot.state.bot_accounts_index = BotAccountsIndex(bot.bot_accounts)
+    bot.state.command_queue = None
+    if settings.COMMAND_QUEUE_SIZE and isinstance(bot, QueuedCommandsBot):
+        bot.state.command_queue = CommandQueue(
+            bot.execute_bot_command_now,
+            capacity=settings.COMMAND_QUEUE_SIZE,
+            consumers_count=settings.COMMAND_QUEUE_CONSUMERS,
+        )
+        bot.state.command_queue.start()
 
     # -- Database --
     bot.state.db_session_factory = await build_db_session_factory()
+    bot.state.record_insert_buffer = None
+    if settings.DB_INSERT_BUFFER_DELAY:
+        bot.state.record_insert_buffer = InsertBuffer(
+            build_db_sessionmaker(),
+            RecordModel,
+            delay=settings.DB_INSERT_BUFFER_DELAY,
+            max_size=settings.DB_INSERT_BUFFER_MAX_SIZE,
+        )
 
     # -- Redis --
     bot.state.redis = aioredis.from_url(settings.REDIS_DSN)
-    bot.state.redis_repo = RedisRepo(redis=bot.state.redis, prefix=BOT_PROJECT_NAME)
+    serializer = build_serializer(
+        settings.REDIS_SERIALIZER, settings.REDIS_COMPRESSION_THRESHOLD
+    )
+    if settings.REDIS_LOCAL_CACHE_SIZE:
+        bot.state.redis_repo = CachedRedisRepo(
+            redis=bot.state.redis,
+            prefix=BOT_PROJECT_NAME,
+            serializer=serializer,
+            local_maxsize=settings.REDIS_LOCAL_CACHE_SIZE,
+            local_ttl=settings.REDIS_LOCAL_CACHE_TTL,
+        )
+        await bot.state.redis_repo.start()
+    else:
+        bot.state.redis_repo = RedisRepo(
+            redis=bot.state.redis,
+            prefix=BOT_PROJECT_NAME,
+            serializer=serializer,
+        )
+
+    # -- Metrics --
+    bot.state.metrics_store = None
+    bot.state.metrics_writer = None
+    if settings.METRICS_MULTIPROCESS_DIR:
+        bot.state.metrics_store = MultiprocessMetricsStore(
+            settings.METRICS_MULTIPROCESS_DIR, settings.METRICS_WRITE_INTERVAL
+        )
+        bot.state.metrics_writer = asyncio.create_task(
+            write_metrics_periodically(bot, settings.METRICS_WRITE_INTERVAL)
+        )
 
 
 async def shutdown(bot: Bot) -> None:
     # -- Bot --
+    if bot.state.command_queue is not None:
+        await bot.state.command_queue.stop()
+
     await bot.shutdown()
 
     # -- Redis --
+    if isinstance(bot.state.redis_repo, CachedRedisRepo):
+        await bot.state.redis_repo.stop()
+
     await bot.state.redis.aclose()
 
     # -- Database --
+    if bot.state.record_insert_buffer is not None:
+        await bot.state.record_insert_buffer.flush()
+
     await close_db_connections()
 
+    # -- Metrics --
+    if bot.state.metrics_writer is not None:
+        bot.state.metrics_writer.cancel()
+        # Gauges of stopped process mustn't be summed with running ones
+        bot.state.metrics_store.write(REGISTRY.dump(include_gauges=False))
+
+    # -- Tracing --
+    if tracer.exporter is not None:
+        tracer.exporter.flush()
+
 
 def get_application(
     add_internal_error_handler: bool = True,
@@ -59,6 +145,7 @@ def get_application(
     application.add_event_handler("shutdown", partial(shutdown, bot))
 
     application.include_router(router)
+    application.add_middleware(HTTPMetricsMiddleware)
 
     # mount static
     application.mount(
@@ -0,0 +1,51 @@
+"""Collection of metrics of application processes."""
+
+import asyncio
+from typing import Optional
+
+from pybotx import Bot
+
+from app.db.sqlalchemy import engine
+from app.logger import logger
+from app.metrics.instruments import COMMAND_QUEUE_DEPTH, DB_POOL_CHECKED_OUT
+from app.metrics.registry import (
+    REGISTRY,
+    MetricsDump,
+    MultiprocessMetricsStore,
+    merge_dumps,
+)
+
+
+def update_bot_gauges(bot: Bot) -> None:
+    """Set gauges of process state from bot resources."""
+    command_queue = getattr(bot.state, "command_queue", None)
+    if command_queue is not None:
+        COMMAND_QUEUE_DEPTH.set(command_queue.stats.depth)
+
+    DB_POOL_CHECKED_OUT.set(engine.pool.checkedout())  # type: ignore
+
+
+def collect_metrics(bot: Bot) -> MetricsDump:
+    """Collect metrics of this process or, if they are shared, of all processes."""
+    metrics_store: Optional[MultiprocessMetricsStore] = bot.state.metrics_store
+    if metrics_store is None:
+        update_bot_gauges(bot)
+        return REGISTRY.dump()
+
+    write_process_metrics(bot)
+    return merge_dumps(metrics_store.read_all())
+
+
+def write_process_metrics(bot: Bot) -> None:
+    update_bot_gauges(bot)
+    bot.state.metrics_store.write(REGISTRY.dump())
+
+
+async def write_metrics_periodically(bot: Bot, interval: float) -> None:
+    """Share metrics of this process with other ones."""
+    while True:  # noqa: WPS457
+        await asyncio.sleep(interval)
+        try:
+            write_process_metrics(bot)
+        except Exception:
+            logger.exception("Metrics writing failed")
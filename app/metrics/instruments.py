@@ -0,0 +1,85 @@
+"""Application metrics and helpers to collect them."""
+
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator, TypeVar, cast
+
+from app.metrics.registry import Counter, Gauge, Histogram
+
+TCallable = TypeVar("TCallable", bound=Callable[..., Any])
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Duration of HTTP requests to application.",
+    labelnames=("method", "path", "status"),
+)
+RPC_METHOD_DURATION = Histogram(
+    "rpc_method_duration_seconds",
+    "Duration of SmartApp RPC methods.",
+    labelnames=("method", "status"),
+)
+CRUD_OPERATION_DURATION = Histogram(
+    "crud_operation_duration_seconds",
+    "Duration of CRUD operations.",
+    labelnames=("model", "operation", "status"),
+)
+REDIS_OPERATION_DURATION = Histogram(
+    "redis_operation_duration_seconds",
+    "Duration of redis repo operations.",
+    labelnames=("operation", "status"),
+)
+BOTX_REQUEST_DURATION = Histogram(
+    "botx_request_duration_seconds",
+    "Duration of requests to BotX API.",
+    labelnames=("method", "path", "status"),
+)
+COMMAND_QUEUE_DEPTH = Gauge(
+    "command_queue_depth",
+    "Number of bot commands waiting in queue.",
+)
+COMMAND_QUEUE_REJECTED = Counter(
+    "command_queue_rejected_total",
+    "Number of bot commands rejected by full queue.",
+)
+REDIS_LOCAL_CACHE_EVENTS = Counter(
+    "redis_local_cache_events_total",
+    "Number of local redis cache hits, misses, evictions and invalidations.",
+    labelnames=("event",),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Number of database connections checked out from pool.",
+)
+
+
+@contextmanager
+def measure(histogram: Histogram, **labels: Any) -> Iterator[None]:
+    """Observe duration of block with `status` label set to `ok` or `error`."""
+    status = "ok"
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:  # noqa: WPS424
+        status = "error"
+        raise
+    finally:
+        histogram.observe(time.perf_counter() - start, status=status, **labels)
+
+
+def observed_method(histogram: Histogram) -> Callable[[TCallable], TCallable]:
+    """Observe duration of async method with its name as `operation` label.
+
+    Other labels are taken from `metrics_labels` attribute of instance.
+    """
+
+    def decorator(method: TCallable) -> TCallable:
+        @wraps(method)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            labels = getattr(self, "metrics_labels", {})
+            with measure(histogram, operation=method.__name__, **labels):
+                return await method(self, *args, **kwargs)
+
+        return cast(TCallable, wrapper)
+
+    return decorator
@@ -0,0 +1,271 @@
+"""Prometheus-style metrics, their aggregation across processes and rendering."""
+
+import json
+import os
+import time
+from bisect import bisect_left
+from contextlib import suppress
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Dump not replaced for this number of write intervals is of stopped process
+STALE_WRITE_INTERVALS = 3
+
+LabelValues = Tuple[str, ...]
+Labels = List[Tuple[str, str]]
+# Dump of metric is JSON-compatible, so it can be stored for other processes
+MetricDump = Dict[str, Any]
+MetricsDump = Dict[str, MetricDump]
+
+
+class Metric:
+    metric_type = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional["MetricsRegistry"] = None,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._samples: Dict[LabelValues, Any] = {}
+
+        (registry or REGISTRY).register(self)
+
+    def dump(self) -> MetricDump:
+        return {
+            "type": self.metric_type,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "samples": [
+                [list(label_values), sample]
+                for label_values, sample in self._samples.items()
+            ],
+        }
+
+    def _label_values(self, labels: Dict[str, Any]) -> LabelValues:
+        return tuple(str(labels[labelname]) for labelname in self.labelnames)
+
+
+class Counter(Metric):
+    metric_type = "counter"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        label_values = self._label_values(labels)
+        self._samples[label_values] = self._samples.get(label_values, 0) + amount
+
+
+class Gauge(Metric):
+    """Gauge of process state, summed across processes."""
+
+    metric_type = "gauge"
+
+    def set(self, gauge_value: float, **labels: Any) -> None:  # noqa: WPS125
+        self._samples[self._label_values(labels)] = gauge_value
+
+
+class Histogram(Metric):
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: Optional["MetricsRegistry"] = None,
+    ) -> None:
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = list(buckets)
+
+    def observe(self, amount: float, **labels: Any) -> None:
+        label_values = self._label_values(labels)
+        if label_values not in self._samples:
+            # Per-bucket counts, then sum and count of observations
+            samples_count = len(self.buckets) + 2
+            self._samples[label_values] = [0 for _ in range(samples_count)]
+
+        sample = self._samples[label_values]
+
+        bucket_index = bisect_left(self.buckets, amount)
+        if bucket_index < len(self.buckets):
+            sample[bucket_index] += 1
+        sample[-2] += amount
+        sample[-1] += 1
+
+    def dump(self) -> MetricDump:
+        metric_dump = super().dump()
+        metric_dump["buckets"] = self.buckets
+        return metric_dump
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric `{metric.name}` is already registered")
+
+        self._metrics[metric.name] = metric
+
+    def dump(self, include_gauges: bool = True) -> MetricsDump:
+        return {
+            metric.name: metric.dump()
+            for metric in self._metrics.values()
+            if include_gauges or metric.metric_type != Gauge.metric_type
+        }
+
+
+class MultiprocessMetricsStore:
+    """Metrics dumps of app processes in directory shared by them.
+
+    Each process replaces its own file, so readers never see partial dumps.
+    Gauges of processes which haven't written their dumps for
+    `STALE_WRITE_INTERVALS` are skipped, as gauges of killed processes.
+    """
+
+    def __init__(self, directory: str, write_interval: float) -> None:
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._write_interval = write_interval
+        # Restarted worker may get pid of finished one, start time keeps both
+        file_name = "{0}-{1}.json".format(os.getpid(), time.time_ns())
+        self._path = self._directory / file_name
+
+    def write(self, metrics_dump: MetricsDump) -> None:
+        tmp_path = self._path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(metrics_dump))
+        os.replace(tmp_path, self._path)
+
+    def read_all(self) -> List[MetricsDump]:
+        stale_time = time.time() - self._write_interval * STALE_WRITE_INTERVALS
+        metrics_dumps = []
+        for dump_path in self._directory.glob("*.json"):
+            # File may be replaced or written by other process meanwhile
+            with suppress(OSError, ValueError):
+                metrics_dump = json.loads(dump_path.read_text())
+                if dump_path.stat().st_mtime < stale_time:
+                    metrics_dump = _remove_gauges(metrics_dump)
+
+                metrics_dumps.append(metrics_dump)
+
+        return metrics_dumps
+
+
+def clear_metrics_directory(directory: str) -> None:
+    """Remove dumps of processes of previous application run."""
+    for dump_pattern in ("*.json", "*.tmp"):
+        for dump_path in Path(directory).glob(dump_pattern):
+            dump_path.unlink(missing_ok=True)
+
+
+def merge_dumps(metrics_dumps: Iterable[MetricsDump]) -> MetricsDump:
+    """Sum samples of metrics with the same names and labels."""
+    merged_dump: MetricsDump = {}
+    for metrics_dump in metrics_dumps:
+        for name, metric_dump in metrics_dump.items():
+            merged_metric = merged_dump.setdefault(name, {**metric_dump, "samples": []})
+            if merged_metric.get("buckets") != metric_dump.get("buckets"):
+                continue
+
+            merged_metric["samples"] = _merge_samples(
+                merged_metric["samples"] + metric_dump["samples"]
+            )
+
+    return merged_dump
+
+
+def render_dump(metrics_dump: MetricsDump) -> str:
+    """Render metrics in Prometheus text exposition format."""
+    lines = []
+    for name, metric_dump in sorted(metrics_dump.items()):
+        metric_type = metric_dump["type"]
+        lines.append("# HELP {0} {1}".format(name, metric_dump["help"]))
+        lines.append(f"# TYPE {name} {metric_type}")
+
+        for label_values, sample in metric_dump["samples"]:
+            labels = list(zip(metric_dump["labelnames"], label_values))
+            if metric_type == Histogram.metric_type:
+                lines += _render_histogram(name, labels, metric_dump["buckets"], sample)
+            else:
+                lines.append(_render_sample(name, labels, sample))
+
+    # Exposition format requires line feed at the end
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _remove_gauges(metrics_dump: MetricsDump) -> MetricsDump:
+    return {
+        name: metric_dump
+        for name, metric_dump in metrics_dump.items()
+        if metric_dump["type"] != Gauge.metric_type
+    }
+
+
+def _render_histogram(
+    name: str, labels: Labels, buckets: List[float], sample: List[Any]
+) -> List[str]:
+    sample_sum, total_count = sample[-2:]
+    bucket_name = f"{name}_bucket"
+    lines = []
+    cumulative_count = 0
+    for bound, bucket_count in zip(buckets, sample[:-2]):
+        cumulative_count += bucket_count
+        bucket_labels = labels + [("le", str(bound))]
+        lines.append(_render_sample(bucket_name, bucket_labels, cumulative_count))
+
+    inf_bucket_labels = labels + [("le", "+Inf")]
+    lines.append(_render_sample(bucket_name, inf_bucket_labels, total_count))
+    lines.append(_render_sample(f"{name}_sum", labels, sample_sum))
+    lines.append(_render_sample(f"{name}_count", labels, total_count))
+
+    return lines
+
+
+def _render_sample(name: str, labels: Labels, sample: Any) -> str:
+    rendered_labels = _render_labels(labels)
+    return f"{name}{rendered_labels} {sample}"
+
+
+def _merge_samples(samples: List[List[Any]]) -> List[List[Any]]:
+    merged_samples: Dict[LabelValues, Any] = {}
+    for label_values, sample in samples:
+        label_key = tuple(label_values)
+        merged_sample = merged_samples.get(label_key)
+        if merged_sample is None:
+            merged_samples[label_key] = sample
+        elif isinstance(sample, list):
+            merged_samples[label_key] = [
+                merged_count + count
+                for merged_count, count in zip(merged_sample, sample)
+            ]
+        else:
+            merged_samples[label_key] = merged_sample + sample
+
+    return [
+        [list(merged_label_values), merged_sample_value]
+        for merged_label_values, merged_sample_value in merged_samples.items()
+    ]
+
+
+def _render_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+
+    rendered_labels = ",".join(
+        '{0}="{1}"'.format(
+            labelname,
+            label_value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\""),
+        )
+        for labelname, label_value in labels
+    )
+    return f"{{{rendered_labels}}}"
+
+
+REGISTRY = MetricsRegistry()
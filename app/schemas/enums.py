@@ -9,3 +9,13 @@ class StrEnum(str, Enum):  # noqa: WPS600
 class HealthCheckStatuses(StrEnum):
     OK = "ok"
     ERROR = "error"
+
+
+class RedisSerializers(StrEnum):
+    PICKLE = "pickle"
+    JSON = "json"
+
+
+class ReplicaBalancing(StrEnum):
+    ROUND_ROBIN = "round_robin"
+    LEAST_CONNECTIONS = "least_connections"
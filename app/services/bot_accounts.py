@@ -0,0 +1,38 @@
+"""Index of bot accounts for fast lookups by bot id and host."""
+
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional
+from uuid import UUID
+
+from pybotx import Bot, BotAccountWithSecret
+
+
+class BotAccountsIndex:
+    def __init__(self, bot_accounts: Iterable[BotAccountWithSecret]) -> None:
+        self._bot_accounts = list(bot_accounts)
+        self._by_id: Dict[UUID, BotAccountWithSecret] = {}
+        self._by_host: Dict[str, List[BotAccountWithSecret]] = defaultdict(list)
+
+        for bot_account in self._bot_accounts:
+            self._by_id[bot_account.id] = bot_account
+            self._by_host[bot_account.host].append(bot_account)
+
+    def __iter__(self) -> Iterator[BotAccountWithSecret]:
+        """Iterate over bot accounts in credentials order."""
+        return iter(self._bot_accounts)
+
+    def get(self, bot_id: UUID) -> Optional[BotAccountWithSecret]:
+        return self._by_id.get(bot_id)
+
+    def list_by_host(self, host: str) -> List[BotAccountWithSecret]:
+        return self._by_host.get(host, [])
+
+
+def get_bot_accounts_index(bot: Bot) -> BotAccountsIndex:
+    """Get index built on startup or build it for bot without one."""
+    bot_accounts_index = getattr(bot.state, "bot_accounts_index", None)
+    if bot_accounts_index is None:
+        bot_accounts_index = BotAccountsIndex(bot.bot_accounts)
+        bot.state.bot_accounts_index = bot_accounts_index
+
+    return bot_accounts_index
@@ -1,6 +1,7 @@
 """Module for user searching on cts."""
 
-from typing import Optional, Tuple
+import asyncio
+from typing import Awaitable, Dict, Iterable, List, Optional, Sequence, Tuple
 from uuid import UUID
 
 from pybotx import (
@@ -11,28 +12,155 @@ from pybotx import (
     UserNotFoundError,
 )
 
+from app.caching.redis_repo import RedisRepo
+from app.logger import logger
+from app.services.bot_accounts import get_bot_accounts_index
+from app.settings import settings
+
+USER_CACHE_KEY_PREFIX = "user_from_search"
+USER_NOT_FOUND = "user_not_found"
+BATCH_SEARCH_CONCURRENCY = 10
+
+UserSearchResult = Tuple[UserFromSearch, BotAccountWithSecret]
+UserSearch = Awaitable[Optional[UserSearchResult]]
+
 
 class UserIsBotError(Exception):
     """Error for raising when found user is bot."""
 
 
-async def search_user_on_each_cts(
-    bot: Bot, huid: UUID
-) -> Optional[Tuple[UserFromSearch, BotAccountWithSecret]]:
+async def search_user_by_huid(bot: Bot, bot_id: UUID, huid: UUID) -> UserFromSearch:
+    """Search user by huid on bot's cts with results cached in redis.
+
+    Missing users are cached too, `UserNotFoundError` is raised for them.
+    """
+    redis_repo: RedisRepo = bot.state.redis_repo
+    cache_key = (USER_CACHE_KEY_PREFIX, bot_id, huid)
+
+    cached_user = await redis_repo.get(cache_key)
+    if cached_user == USER_NOT_FOUND:
+        raise UserNotFoundError(f"User with huid `{huid}` not found (cached)")
+    if cached_user is not None:
+        return cached_user
+
+    try:
+        user = await bot.search_user_by_huid(bot_id=bot_id, huid=huid)
+    except UserNotFoundError:
+        await redis_repo.set(
+            cache_key, USER_NOT_FOUND, expire=settings.USER_NOT_FOUND_CACHE_TTL
+        )
+        raise
+
+    await redis_repo.set(cache_key, user, expire=settings.USER_CACHE_TTL)
+    return user
+
+
+async def search_user_on_each_cts(bot: Bot, huid: UUID) -> Optional[UserSearchResult]:
     """Search user by huid on all cts on which bot is registered.
 
+    All cts are queried concurrently, each one for up to `USER_SEARCH_TIMEOUT`
+    seconds. The first found user wins and other searches are cancelled.
+    Failed cts is skipped, error is raised only if search failed on each cts.
+
     return type: tuple of UserFromSearch instance and host.
     """
 
-    for bot_account in bot.bot_accounts:
-        try:
-            user = await bot.search_user_by_huid(bot_id=bot_account.id, huid=huid)
-        except UserNotFoundError:
+    searches = [
+        asyncio.create_task(_search_user_on_cts(bot, bot_account, huid))
+        for bot_account in get_bot_accounts_index(bot)
+    ]
+
+    # Searches that are still running after the first hit are cancelled
+    try:  # noqa: WPS501
+        return await _wait_first_found_user(searches)
+    finally:
+        for search in searches:
+            search.cancel()
+
+
+async def search_users_on_each_cts(
+    bot: Bot,
+    huids: Iterable[UUID],
+    concurrency: int = BATCH_SEARCH_CONCURRENCY,
+) -> Dict[UUID, Optional[UserSearchResult]]:
+    """Search many users on all cts with no more than `concurrency` at once.
+
+    Missing users and bots are mapped to `None`.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def search_user(huid: UUID) -> Optional[UserSearchResult]:  # noqa: WPS430
+        async with semaphore:
+            try:
+                return await search_user_on_each_cts(bot, huid)
+            except UserIsBotError:
+                return None
+
+    unique_huids = list(dict.fromkeys(huids))
+    search_results = await asyncio.gather(*map(search_user, unique_huids))
+
+    return dict(zip(unique_huids, search_results))
+
+
+async def _search_user_on_cts(
+    bot: Bot, bot_account: BotAccountWithSecret, huid: UUID
+) -> Optional[UserSearchResult]:
+    try:
+        user = await asyncio.wait_for(
+            search_user_by_huid(bot, bot_account.id, huid),
+            timeout=settings.USER_SEARCH_TIMEOUT,
+        )
+    except UserNotFoundError:
+        return None
+    except asyncio.TimeoutError:
+        logger.warning(f"User search on `{bot_account.host}` timed out")
+        return None
+    except Exception:
+        logger.exception(f"User search on `{bot_account.host}` failed")
+        raise
+
+    return user, bot_account
+
+
+async def _wait_first_found_user(
+    searches: Sequence[UserSearch],
+) -> Optional[UserSearchResult]:
+    """Return first found user, failed cts are treated as not found on them.
+
+    Error of search is raised only if search on each cts has failed.
+    """
+    is_bot_found = False
+    search_errors: List[Exception] = []
+    for search in asyncio.as_completed(searches):
+        search_result = await _skip_failed_search(search, search_errors)
+        if search_result is None:
+            continue
+
+        if search_result[0].user_kind == UserKinds.BOT:
+            is_bot_found = True
             continue
 
-        if user.user_kind == UserKinds.BOT:
-            raise UserIsBotError
+        return search_result
 
-        return user, bot_account
+    if is_bot_found:
+        raise UserIsBotError
 
+    _raise_if_each_search_failed(searches, search_errors)
     return None
+
+
+async def _skip_failed_search(
+    search: UserSearch, search_errors: List[Exception]
+) -> Optional[UserSearchResult]:
+    try:
+        return await search
+    except Exception as exc:
+        search_errors.append(exc)
+        return None
+
+
+def _raise_if_each_search_failed(
+    searches: Sequence[UserSearch], search_errors: List[Exception]
+) -> None:
+    if search_errors and len(search_errors) == len(searches):
+        raise search_errors[0]
@@ -22,6 +22,8 @@ from pydantic import BaseModel, ValidationError
 from starlette.requests import Request
 from starlette.status import HTTP_400_BAD_REQUEST, HTTP_403_FORBIDDEN
 
+from app.services.bot_accounts import get_bot_accounts_index
+from app.services.botx_user_search import search_user_by_huid
 from app.settings import settings
 
 DOCS = """Установка параметров для выполнение RPC методов.
@@ -41,19 +43,22 @@ class RPCAuthConfig(BaseModel):
     chat_id: UUID = uuid4()
 
 
+class RPCBatchCall(BaseModel):
+    method: str
+    params: Dict[str, Any] = {}  # noqa: WPS110
+
+
 async def expand_config(
     config: RPCAuthConfig, bot: Bot
 ) -> Tuple[BotAccountWithSecret, UserFromSearch]:
-    bot_account = [bot for bot in bot.bot_accounts if bot.id == config.bot_id]
-    if not bot_account:
+    bot_account = get_bot_accounts_index(bot).get(config.bot_id)
+    if bot_account is None:
         raise HTTPException(
             status_code=HTTP_400_BAD_REQUEST,
             detail=f"Bot with id {config.bot_id} not found",
         )
     try:
-        user_info = await bot.search_user_by_huid(
-            bot_id=bot_account[0].id, huid=config.sender_huid
-        )
+        user_info = await search_user_by_huid(bot, bot_account.id, config.sender_huid)
     except UserNotFoundError:
         user_info = UserFromSearch(
             huid=config.sender_huid,
@@ -68,7 +73,7 @@ async def expand_config(
             user_kind=UserKinds.CTS_USER,
         )
 
-    return bot_account[0], user_info
+    return bot_account, user_info
 
 
 def event_factory(
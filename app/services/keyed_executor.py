@@ -0,0 +1,37 @@
+"""Executor running calls with the same key one by one."""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")  # noqa: WPS111
+
+
+class KeyedExecutor:
+    """Run calls with the same key in order of submission, others in parallel.
+
+    Calls wait on per-key FIFO lock, which is dropped with the last of them.
+    """
+
+    def __init__(self) -> None:
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._waiters_counts: Dict[Hashable, int] = {}
+
+    @property
+    def active_keys_count(self) -> int:
+        return len(self._locks)
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[key] = lock
+
+        self._waiters_counts[key] = self._waiters_counts.get(key, 0) + 1
+        try:  # noqa: WPS501
+            async with lock:
+                return await call()
+        finally:
+            self._waiters_counts[key] -= 1
+            if not self._waiters_counts[key]:
+                self._waiters_counts.pop(key)
+                self._locks.pop(key)
@@ -1,22 +1,153 @@
 """Helpers to format log messages in smart logger wrapper."""
-from pprint import pformat
-from typing import Any, Dict, Optional
+import json
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Optional, Tuple
 
-from pybotx.logger import trim_file_data_in_incoming_json
+from pybotx.constants import MAX_FILE_LEN_IN_LOGS
 
 from app.logger import logger
 
+RawCommand = Optional[Dict[str, Any]]
+Replacer = Callable[[Any], Any]
 
-def format_raw_command(raw_command: Optional[Dict[str, Any]]) -> str:
+# Limits of logged payload, the rest is replaced by markers
+MAX_DEPTH = 8
+MAX_ITEMS = 50
+MAX_STRING_LENGTH = 1000
+
+ATTACHMENT_CONTENT_PATH = ("data", "content")
+# SmartApp files are sent as links in `async_files`, but RPC params may embed
+# files in BotX format: `{"file_name": ..., "data": "data:..."}`
+RPC_PARAMS_PATH = ("command", "data", "data", "params")
+FILE_NAME_KEY = "file_name"
+FILE_DATA_KEY = "data"
+
+
+def format_raw_command(raw_command: RawCommand) -> str:
     if raw_command is None:
         logger.warning("Empty raw_command")
         return "<empty raw_command>"
-    trimmed_raw_command = trim_file_data_in_incoming_json(raw_command)
-    return pformat(trimmed_raw_command)
+    return format_bounded_json(
+        replace_nested(raw_command, ("attachments",), _trim_attachments_content)
+    )
 
 
-def format_smartapp_event(raw_command: Optional[Dict[str, Any]]) -> str:
+def format_smartapp_event(raw_command: RawCommand) -> str:
     if raw_command is None:
         logger.warning("Empty raw_command")
         return "<empty raw_command>"
-    return pformat(raw_command)
+    return format_bounded_json(
+        replace_nested(raw_command, RPC_PARAMS_PATH, _trim_params_files_data)
+    )
+
+
+def replace_nested(jsonable_obj: Any, path: Tuple[str, ...], replace: Replacer) -> Any:
+    """Copy object with value by path of dict keys replaced, if it's present."""
+    if not path:
+        return replace(jsonable_obj)
+
+    key, *nested_path = path
+    if not isinstance(jsonable_obj, dict) or key not in jsonable_obj:
+        return jsonable_obj
+
+    nested_value = replace_nested(jsonable_obj[key], tuple(nested_path), replace)
+    return {**jsonable_obj, key: nested_value}
+
+
+def format_bounded_json(jsonable_obj: Any) -> str:
+    """Format object as compact JSON with trimmed long structures."""
+    return json.dumps(
+        trim_jsonable(jsonable_obj),
+        default=str,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+def trim_jsonable(jsonable_obj: Any, depth: int = 0) -> Any:
+    """Copy object with trimmed long strings and collections."""
+    if isinstance(jsonable_obj, str):
+        return _trim_string(jsonable_obj)
+
+    if not isinstance(jsonable_obj, (dict, list, tuple)):
+        return jsonable_obj
+
+    if depth >= MAX_DEPTH:
+        type_name = type(jsonable_obj).__name__
+        return f"<{type_name} too deep>"
+
+    trimmed_count = len(jsonable_obj) - MAX_ITEMS
+    if isinstance(jsonable_obj, dict):
+        trimmed_dict = {
+            str(key): trim_jsonable(dict_value, depth + 1)
+            for key, dict_value in list(jsonable_obj.items())[:MAX_ITEMS]
+        }
+        if trimmed_count > 0:
+            trimmed_dict["<trimmed>"] = f"{trimmed_count} more items"
+        return trimmed_dict
+
+    trimmed_list = [
+        trim_jsonable(list_item, depth + 1) for list_item in jsonable_obj[:MAX_ITEMS]
+    ]
+    if trimmed_count > 0:
+        trimmed_list.append(f"<{trimmed_count} more items>")
+    return trimmed_list
+
+
+def lazy_formatted(
+    formatter: Callable[[RawCommand], str], raw_command: RawCommand
+) -> Callable[[], str]:
+    """Return function which formats command on first call and then reuses it."""
+    return lru_cache(maxsize=1)(partial(formatter, raw_command))
+
+
+def _trim_attachments_content(attachments: Any) -> Any:
+    if not isinstance(attachments, list):
+        return attachments
+
+    # Link and location attachments don't have content
+    return [
+        replace_nested(attachment, ATTACHMENT_CONTENT_PATH, _trim_file_data)
+        for attachment in attachments
+    ]
+
+
+def _trim_params_files_data(rpc_params: Any) -> Any:
+    if not isinstance(rpc_params, dict):
+        return rpc_params
+
+    return {
+        param_name: _trim_param_files_data(param_value)
+        for param_name, param_value in rpc_params.items()
+    }
+
+
+def _trim_param_files_data(param_value: Any) -> Any:
+    if isinstance(param_value, list):
+        return [_trim_botx_file_data(list_item) for list_item in param_value]
+
+    return _trim_botx_file_data(param_value)
+
+
+def _trim_botx_file_data(botx_file: Any) -> Any:
+    if isinstance(botx_file, dict) and FILE_NAME_KEY in botx_file:
+        return replace_nested(botx_file, (FILE_DATA_KEY,), _trim_file_data)
+
+    return botx_file
+
+
+def _trim_file_data(file_data: Any) -> Any:
+    if isinstance(file_data, str) and len(file_data) > MAX_FILE_LEN_IN_LOGS:
+        file_data_start = file_data[:MAX_FILE_LEN_IN_LOGS]
+        return f"{file_data_start}...<trimmed>"
+
+    return file_data
+
+
+def _trim_string(string_value: str) -> str:
+    trimmed_length = len(string_value) - MAX_STRING_LENGTH
+    if trimmed_length > 0:
+        string_start = string_value[:MAX_STRING_LENGTH]
+        return f"{string_start}...<{trimmed_length} more chars>"
+
+    return string_value
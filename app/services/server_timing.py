@@ -0,0 +1,127 @@
+"""Breakdown of request time for `Server-Timing` response header."""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar, cast
+
+from fastapi import Response
+
+TCallable = TypeVar("TCallable", bound=Callable[..., Any])
+# Durations (in seconds) by buckets
+Timings = Dict[str, float]
+
+SERVER_TIMING_HEADER = "Server-Timing"
+# Time not spent in other buckets is attributed to handler
+HANDLER_BUCKET = "handler"
+TIMING_BUCKETS = ("auth", "db", "redis", "botx")
+
+
+@dataclass
+class TimedBlock:
+    bucket: str
+    # Time of nested blocks, it's excluded from this block bucket
+    nested_duration: float = 0
+
+
+request_timings: ContextVar[Optional[Timings]] = ContextVar(
+    "request_timings", default=None
+)
+active_timed_block: ContextVar[Optional[TimedBlock]] = ContextVar(
+    "active_timed_block", default=None
+)
+
+
+def add_timing(bucket: str, duration: float) -> None:
+    """Add duration (in seconds) to bucket of current request, if it's timed.
+
+    Duration is excluded from bucket of enclosing `timed` block, so buckets
+    don't overlap.
+    """
+    timings = request_timings.get()
+    if timings is None:
+        return
+
+    timings[bucket] = timings.get(bucket, 0) + duration
+    parent_block = active_timed_block.get()
+    if parent_block is not None:
+        parent_block.nested_duration += duration
+
+
+@contextmanager
+def timed(bucket: str) -> Iterator[None]:
+    """Add duration of block without time of nested blocks to bucket."""
+    if request_timings.get() is None:
+        yield
+        return
+
+    timed_block = TimedBlock(bucket)
+    token = active_timed_block.set(timed_block)
+    start = time.perf_counter()
+    try:  # noqa: WPS501
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        active_timed_block.reset(token)
+        # Concurrent nested blocks may overlap, so own time is never negative
+        own_duration = max(duration - timed_block.nested_duration, 0)
+        add_timing(bucket, own_duration)
+        # Parent excludes whole block, own time is already excluded above
+        parent_block = active_timed_block.get()
+        if parent_block is not None:
+            parent_block.nested_duration += duration - own_duration
+
+
+def timed_method(bucket: str) -> Callable[[TCallable], TCallable]:
+    """Add duration of async method to bucket."""
+
+    def decorator(method: TCallable) -> TCallable:
+        @wraps(method)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with timed(bucket):
+                return await method(*args, **kwargs)
+
+        return cast(TCallable, wrapper)
+
+    return decorator
+
+
+def format_server_timing(timings: Timings, total_duration: float) -> str:
+    """Format durations of buckets in milliseconds.
+
+    Concurrent calls may overlap, so handler time is never negative.
+    """
+    bucket_durations = {bucket: timings.get(bucket, 0) for bucket in TIMING_BUCKETS}
+    bucket_durations[HANDLER_BUCKET] = max(
+        total_duration - sum(bucket_durations.values()), 0
+    )
+    bucket_durations["total"] = total_duration
+
+    return ", ".join(
+        "{0};dur={1:.3f}".format(bucket, bucket_duration * 1000)
+        for bucket, bucket_duration in bucket_durations.items()
+    )
+
+
+def add_server_timing(func: Callable) -> Callable:
+    """Collect timings of endpoint and add them to its response."""
+
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Response:
+        timings: Timings = {}
+        token = request_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            response = await func(*args, **kwargs)
+        finally:
+            request_timings.reset(token)
+
+        total_duration = time.perf_counter() - start
+        response.headers[SERVER_TIMING_HEADER] = format_server_timing(
+            timings, total_duration
+        )
+        return response
+
+    return wrapper
@@ -1,19 +1,77 @@
 """Middleware for creating db_session per-request."""
 
-from typing import Callable
+from functools import partial
+from typing import Any, Callable, Optional
 
 from pybotx_smartapp_rpc import RPCArgsBaseModel, RPCResponse, SmartApp
 
+from app.db.sqlalchemy import AsyncSession, AsyncSessionFactory, has_writes
+from app.logger import logger
+
+
+class LazyDBSession:
+    """Session proxy which opens session on first attribute access."""
+
+    def __init__(self, session_factory: AsyncSessionFactory, read_only: bool) -> None:
+        self._session_factory = session_factory
+        self._read_only = read_only
+        self._db_session: Optional[AsyncSession] = None
+
+    def __getattr__(self, attr_name: str) -> Any:
+        """Proxy attributes of session opening it if needed."""
+        if self._db_session is None:
+            self._db_session = self._session_factory()
+            self._db_session.info["read_only"] = self._read_only
+
+        return getattr(self._db_session, attr_name)
+
+    async def finish(self, success: bool) -> None:
+        """Commit session with writes on success or roll it back and close."""
+        if self._db_session is None:
+            return
+
+        try:  # noqa: WPS501
+            if not success:
+                await self._db_session.rollback()
+            elif has_writes(self._db_session):
+                await self._finish_writes(self._db_session)
+        finally:
+            await self._db_session.close()
+
+    async def _finish_writes(self, db_session: AsyncSession) -> None:
+        if self._read_only:
+            # Writes are rolled back on close
+            logger.error("Read-only DB session has writes, they are rolled back")
+            return
+
+        await db_session.commit()
+
 
 async def db_session_middleware(
-    smartapp: SmartApp, rpc_arguments: RPCArgsBaseModel, call_next: Callable
+    smartapp: SmartApp,
+    rpc_arguments: RPCArgsBaseModel,
+    call_next: Callable,
+    read_only: bool = False,
 ) -> RPCResponse:
-    session_factory = smartapp.bot.state.db_session_factory
+    """Provide db session for the call, opened on first use.
 
-    async with session_factory() as db_session:
-        smartapp.state.db_session = db_session
+    Session is committed only if there were writes and rolled back on errors.
+    Reads of `read_only` session go to replicas, if configured, and the
+    session isn't committed: its writes are logged as error and rolled back.
+    """
+    lazy_db_session = LazyDBSession(smartapp.bot.state.db_session_factory, read_only)
+    smartapp.state.db_session = lazy_db_session
 
+    try:
         response = await call_next(smartapp, rpc_arguments)
-        await db_session.commit()
+    # Cancellation must roll back too
+    except BaseException:  # noqa: WPS424
+        await lazy_db_session.finish(success=False)
+        raise
+
+    await lazy_db_session.finish(success=True)
 
     return response
+
+
+read_only_db_session_middleware = partial(db_session_middleware, read_only=True)
@@ -0,0 +1,13 @@
+"""Middleware to observe duration of RPC methods."""
+
+from pybotx_smartapp_rpc import HandlerWithArgs, RPCArgsBaseModel, RPCResponse, SmartApp
+
+from app.metrics.instruments import RPC_METHOD_DURATION, measure
+
+
+async def metrics_middleware(
+    smartapp: SmartApp, rpc_arguments: RPCArgsBaseModel, call_next: HandlerWithArgs
+) -> RPCResponse:
+    rpc_method = smartapp.event.data.get("method") if smartapp.event else None
+    with measure(RPC_METHOD_DURATION, method=rpc_method):
+        return await call_next(smartapp, rpc_arguments)
@@ -4,7 +4,7 @@ from typing import Any, Dict, Optional
 from pybotx_smart_logger import wrap_smart_logger
 from pybotx_smartapp_rpc import HandlerWithArgs, RPCArgsBaseModel, RPCResponse, SmartApp
 
-from app.services.log_formatters import format_smartapp_event
+from app.services.log_formatters import format_smartapp_event, lazy_formatted
 from app.settings import settings
 
 
@@ -22,7 +22,7 @@ async def smart_logger_middleware(
         raw_command = smartapp.event.raw_command
     async with wrap_smart_logger(
         log_source="SmartApp RPC handler",
-        context_func=lambda: format_smartapp_event(raw_command),
+        context_func=lazy_formatted(format_smartapp_event, raw_command),
         debug=is_enabled_debug(smartapp),
     ):
         return await call_next(smartapp, rpc_arguments)
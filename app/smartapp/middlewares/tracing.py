@@ -0,0 +1,25 @@
+"""Middleware to trace RPC methods."""
+
+from pybotx_smartapp_rpc import (
+    HandlerWithArgs,
+    RPCArgsBaseModel,
+    RPCErrorResponse,
+    RPCResponse,
+    SmartApp,
+)
+
+from app.tracing.spans import SpanKind, tracer
+
+
+async def tracing_middleware(
+    smartapp: SmartApp, rpc_arguments: RPCArgsBaseModel, call_next: HandlerWithArgs
+) -> RPCResponse:
+    rpc_method = smartapp.event.data.get("method") if smartapp.event else None
+    with tracer.span(
+        f"rpc {rpc_method}", SpanKind.SERVER, {"rpc.method": str(rpc_method)}
+    ) as span:
+        rpc_response = await call_next(smartapp, rpc_arguments)
+        if span is not None and isinstance(rpc_response, RPCErrorResponse):
+            span.error = ", ".join(rpc_error.id for rpc_error in rpc_response.errors)
+
+        return rpc_response
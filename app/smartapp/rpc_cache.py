@@ -0,0 +1,131 @@
+"""Caching of RPC methods results in redis."""
+
+import asyncio
+from functools import update_wrapper
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar, cast
+
+from pybotx_smartapp_rpc import RPCArgsBaseModel, RPCResultResponse, SmartApp
+from pybotx_smartapp_rpc.typing import RPCResponse
+
+from app.caching.redis_repo import RedisRepo
+
+RPCCacheKey = Callable[[SmartApp, Optional[RPCArgsBaseModel]], Hashable]
+THandler = TypeVar("THandler", bound=Callable[..., Awaitable[RPCResponse]])
+
+CACHE_KEY_PREFIX = "rpc_cache"
+
+
+class CachedRPCHandler:
+    """RPC handler wrapper which stores successful responses in redis.
+
+    Concurrent calls with the same key in one process are computed once. The
+    handler runs in the task of one of callers with its request state (e.g.
+    `db_session`), others wait for its response. If that caller is cancelled,
+    one of waiting callers computes response with its own request state.
+    """
+
+    def __init__(
+        self,
+        rpc_handler: Callable[..., Awaitable[RPCResponse]],
+        ttl: int,
+        key: Optional[RPCCacheKey],
+        per_user: bool,
+    ) -> None:
+        self._rpc_handler = rpc_handler
+        self._ttl = ttl
+        self._key = key
+        self._per_user = per_user
+        self._namespace = f"{rpc_handler.__module__}:{rpc_handler.__qualname__}"
+        self._in_flight: Dict[Hashable, "asyncio.Future[RPCResponse]"] = {}
+
+        # Router inspects signature and name of the original handler
+        update_wrapper(self, rpc_handler)
+
+    async def __call__(self, smartapp: SmartApp, *args: Any) -> RPCResponse:
+        cache_key = self._build_cache_key(smartapp, args[0] if args else None)
+
+        redis_repo: RedisRepo = smartapp.bot.state.redis_repo
+        cached_response = await redis_repo.get(cache_key)
+        if cached_response is not None:
+            return RPCResultResponse(**cached_response)
+
+        computation = self._in_flight.get(cache_key)
+        while computation is not None:
+            # Unlike awaiting, waiting doesn't cancel computation with caller
+            await asyncio.wait((computation,))
+            if not computation.cancelled():
+                return computation.result()
+
+            computation = self._in_flight.get(cache_key)
+
+        return await self._compute_in_flight(cache_key, smartapp, *args)
+
+    async def _compute_in_flight(
+        self, cache_key: Hashable, smartapp: SmartApp, *args: Any
+    ) -> RPCResponse:
+        computation = asyncio.get_running_loop().create_future()
+        self._in_flight[cache_key] = computation
+        try:
+            response = await self._compute(cache_key, smartapp, *args)
+        except Exception as exc:
+            computation.set_exception(exc)
+            # Error is raised here, so it isn't logged if nobody waits for it
+            computation.exception()
+            raise
+        # Cancelled caller passes computation to waiting ones
+        except BaseException:  # noqa: WPS424
+            computation.cancel()
+            raise
+        finally:
+            self._in_flight.pop(cache_key, None)
+
+        computation.set_result(response)
+        return response
+
+    async def _compute(
+        self, cache_key: Hashable, smartapp: SmartApp, *args: Any
+    ) -> RPCResponse:
+        response = await self._rpc_handler(smartapp, *args)
+        if isinstance(response, RPCResultResponse) and not response.files:
+            redis_repo: RedisRepo = smartapp.bot.state.redis_repo
+            await redis_repo.set(
+                cache_key,
+                {"result": response.result, "encrypted": response.encrypted},
+                expire=self._ttl,
+            )
+
+        return response
+
+    def _build_cache_key(
+        self, smartapp: SmartApp, rpc_arguments: Optional[RPCArgsBaseModel]
+    ) -> Hashable:
+        args_key: Hashable = None
+        if self._key is not None:
+            args_key = self._key(smartapp, rpc_arguments)
+        elif rpc_arguments is not None:
+            args_key = rpc_arguments.json(sort_keys=True)
+
+        sender_huid = None
+        if self._per_user and smartapp.event is not None:
+            sender_huid = smartapp.event.sender.huid
+
+        return (CACHE_KEY_PREFIX, self._namespace, args_key, sender_huid)
+
+
+def cached(
+    ttl: int,
+    key: Optional[RPCCacheKey] = None,
+    per_user: bool = False,
+) -> Callable[[THandler], THandler]:
+    """Cache successful RPC method responses in `bot.state.redis_repo`.
+
+    Must be placed under `@rpc.method(...)`. Responses are keyed by handler
+    name and validated args (or by `key` result) and, if `per_user` is set,
+    by sender huid. Responses with files and errors aren't cached. `key` must
+    return value of type supported by `build_key`.
+    """
+
+    def decorator(rpc_handler: THandler) -> THandler:
+        return cast(THandler, CachedRPCHandler(rpc_handler, ttl, key, per_user))
+
+    return decorator
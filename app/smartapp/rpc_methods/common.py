@@ -7,6 +7,9 @@ from pybotx_smartapp_rpc import RPCArgsBaseModel, RPCResultResponse, RPCRouter,
 
 from app.db.record.repo import RecordRepo
 from app.smartapp.middlewares.db_session import db_session_middleware
+from app.smartapp.rpc_cache import cached
+
+VERSION_CACHE_TTL = 60
 
 rpc = RPCRouter()
 
@@ -67,6 +70,7 @@ async def test_redis_callback_repo(smartapp: SmartApp) -> RPCResultResponse[str]
 
 
 @rpc.method("debug:version")
+@cached(ttl=VERSION_CACHE_TTL)
 async def build_version(smartapp: SmartApp) -> RPCResultResponse[str]:
     """Show app version."""
     cmd = "poetry version --short"
@@ -0,0 +1,127 @@
+"""Export of spans to files in OTLP JSON format."""
+
+import json
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.logger import logger
+from app.tracing.spans import Span
+
+EXPORT_BATCH_SIZE = 100
+# Spans are written at least once per interval (in seconds), if there are new ones
+EXPORT_INTERVAL = 5
+
+OTLP_STATUS_OK = 1
+OTLP_STATUS_ERROR = 2
+
+
+class FileSpanExporter:
+    """Append spans to file of this process in directory.
+
+    Each line of file is OTLP/JSON export request, so files can be read by
+    OpenTelemetry Collector `otlpjsonfile` receiver or sent to any OTLP/HTTP
+    endpoint as is. Spans are written by batches in background thread.
+    """
+
+    def __init__(self, directory: str, service_name: str) -> None:
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        file_name = "spans-{0}-{1}.jsonl".format(os.getpid(), time.time_ns())
+        self._path = Path(directory) / file_name
+        self._resource = {
+            "attributes": _encode_attributes({"service.name": service_name})
+        }
+        self._spans: List[Span] = []
+        self._last_export_time = time.monotonic()
+        # Single writer keeps batches in order and off the event loop
+        self._writer = ThreadPoolExecutor(max_workers=1)
+        self._last_write: Optional["Future[None]"] = None
+
+    def export(self, span: Span) -> None:
+        self._spans.append(span)
+        is_export_overdue = time.monotonic() - self._last_export_time > EXPORT_INTERVAL
+        if len(self._spans) >= EXPORT_BATCH_SIZE or is_export_overdue:
+            self._last_write = self._writer.submit(
+                self._write_in_background, self._take_spans()
+            )
+
+    def flush(self) -> None:
+        """Write collected spans synchronously, e.g. on shutdown."""
+        if self._last_write is not None:
+            self._last_write.result()
+
+        self._write_spans(self._take_spans())
+
+    def _take_spans(self) -> List[Span]:
+        self._last_export_time = time.monotonic()
+        spans = self._spans
+        self._spans = []
+        return spans
+
+    def _write_in_background(self, spans: List[Span]) -> None:
+        try:
+            self._write_spans(spans)
+        except Exception:
+            logger.exception("Spans export failed")
+
+    def _write_spans(self, spans: List[Span]) -> None:
+        if not spans:
+            return
+
+        export_request = {
+            "resourceSpans": [
+                {
+                    "resource": self._resource,
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "app"},
+                            "spans": [encode_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        with self._path.open("a") as spans_file:
+            encoded_request = json.dumps(export_request)
+            spans_file.write(f"{encoded_request}\n")
+
+
+def encode_span(span: Span) -> Dict[str, Any]:
+    """Encode span as OTLP/JSON."""
+    encoded_span = {
+        "traceId": span.context.trace_id,
+        "spanId": span.context.span_id,
+        "name": span.name,
+        "kind": int(span.kind),
+        "startTimeUnixNano": str(span.start_time),
+        "endTimeUnixNano": str(span.end_time),
+        "attributes": _encode_attributes(span.attributes),
+        "status": {"code": OTLP_STATUS_OK},
+    }
+    if span.parent_span_id is not None:
+        encoded_span["parentSpanId"] = span.parent_span_id
+    if span.error is not None:
+        encoded_span["status"] = {"code": OTLP_STATUS_ERROR, "message": span.error}
+
+    return encoded_span
+
+
+def _encode_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"key": key, "value": _encode_value(attribute_value)}
+        for key, attribute_value in attributes.items()
+    ]
+
+
+def _encode_value(attribute_value: Any) -> Dict[str, Any]:
+    if isinstance(attribute_value, bool):
+        return {"boolValue": attribute_value}
+    if isinstance(attribute_value, int):
+        # 64-bit integers are strings in OTLP/JSON
+        return {"intValue": str(attribute_value)}
+    if isinstance(attribute_value, float):
+        return {"doubleValue": attribute_value}
+
+    return {"stringValue": str(attribute_value)}
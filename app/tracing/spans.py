@@ -0,0 +1,179 @@
+"""Tracing spans propagated through tasks and processes."""
+
+import re
+import secrets
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import wraps
+from typing import (  # noqa: WPS235
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Protocol,
+    TypeVar,
+    cast,
+)
+
+TCallable = TypeVar("TCallable", bound=Callable[..., Any])
+
+# W3C Trace Context header, also used to pass trace to tasks worker
+TRACEPARENT = "traceparent"
+TRACEPARENT_PATTERN = re.compile(
+    "[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}"
+)
+TRACE_ID_BYTES = 16
+SPAN_ID_BYTES = 8
+
+
+class SpanKind(IntEnum):
+    """Span kinds with values of OTLP."""
+
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+    PRODUCER = 4
+    CONSUMER = 5
+
+
+class SpanContext(NamedTuple):
+    trace_id: str
+    span_id: str
+
+
+@dataclass
+class Span:
+    name: str
+    context: SpanContext
+    parent_span_id: Optional[str]
+    kind: SpanKind
+    attributes: Dict[str, Any]
+    start_time: int = field(default_factory=time.time_ns)
+    end_time: Optional[int] = None
+    error: Optional[str] = None
+
+    def fail(self, exc: BaseException) -> None:
+        error_type = type(exc).__name__
+        self.error = f"{error_type}: {exc}"  # noqa: WPS601
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None:
+        """Export ended span."""
+
+    def flush(self) -> None:
+        """Export spans collected by exporter."""
+
+
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """Create spans, which are exported on end.
+
+    Tracing is disabled until exporter is set, then no spans are created.
+    """
+
+    def __init__(self) -> None:
+        self.exporter: Optional[SpanExporter] = None
+
+    def start_span(
+        self,
+        name: str,
+        kind: SpanKind = SpanKind.INTERNAL,
+        parent: Optional[SpanContext] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Span:
+        """Start span, child of `parent` or of current span."""
+        if parent is None:
+            parent_span = current_span.get()
+            parent = None if parent_span is None else parent_span.context
+
+        return Span(
+            name=name,
+            context=SpanContext(
+                trace_id=(
+                    parent.trace_id if parent else secrets.token_hex(TRACE_ID_BYTES)
+                ),
+                span_id=secrets.token_hex(SPAN_ID_BYTES),
+            ),
+            parent_span_id=parent.span_id if parent else None,
+            kind=kind,
+            attributes=attributes or {},
+        )
+
+    def end_span(self, span: Span) -> None:
+        span.end_time = time.time_ns()
+        if self.exporter is not None:
+            self.exporter.export(span)
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        kind: SpanKind = SpanKind.INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Optional[Span]]:
+        """Run block in span, which is current for the block."""
+        if self.exporter is None:
+            yield None
+            return
+
+        span = self.start_span(name, kind, attributes=attributes)
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:  # noqa: WPS424
+            span.fail(exc)
+            raise
+        finally:
+            current_span.reset(token)
+            self.end_span(span)
+
+
+def traced_method(span_prefix: str) -> Callable[[TCallable], TCallable]:
+    """Run async method in span named by prefix and method name."""
+
+    def decorator(method: TCallable) -> TCallable:
+        span_name = f"{span_prefix} {method.__name__}"
+
+        @wraps(method)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with tracer.span(span_name, SpanKind.CLIENT):
+                return await method(*args, **kwargs)
+
+        return cast(TCallable, wrapper)
+
+    return decorator
+
+
+def format_traceparent(span_context: SpanContext) -> str:
+    return f"00-{span_context.trace_id}-{span_context.span_id}-01"
+
+
+def parse_traceparent(traceparent: Optional[str]) -> Optional[SpanContext]:
+    """Parse `traceparent` value, invalid one is ignored."""
+    traceparent_match = TRACEPARENT_PATTERN.fullmatch(traceparent or "")
+    if traceparent_match is None:
+        return None
+
+    return SpanContext(
+        trace_id=traceparent_match.group(1), span_id=traceparent_match.group(2)
+    )
+
+
+def get_traceparent() -> Optional[str]:
+    """Return `traceparent` of current span to continue trace in other process."""
+    span = current_span.get()
+    if span is None:
+        return None
+
+    return format_traceparent(span.context)
+
+
+tracer = Tracer()
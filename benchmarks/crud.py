@@ -0,0 +1,95 @@
+"""Compare per-row and bulk CRUD operations on `records` table.
+
+Requires migrated database from `POSTGRES_DSN`, all changes are rolled back.
+Run from project root: `python -m benchmarks.crud`.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.crud import CRUD
+from app.db.record.models import RecordModel
+from app.db.sqlalchemy import engine
+
+ROWS_COUNT = 5000
+ROW_FORMAT = "{0:<10} {1:<10} {2:>10} {3:>14}"
+
+Operation = Callable[[CRUD, List[Dict[str, Any]]], Awaitable[None]]
+
+
+async def create_per_row(crud: CRUD, models_data: List[Dict[str, Any]]) -> None:
+    for model_data in models_data:
+        await crud.create(model_data=model_data)
+
+
+async def create_bulk(crud: CRUD, models_data: List[Dict[str, Any]]) -> None:
+    await crud.create_many(models_data=models_data)
+
+
+async def update_per_row(crud: CRUD, models_data: List[Dict[str, Any]]) -> None:
+    for model_data in models_data:
+        await crud.update(pkey_val=model_data["id"], model_data=model_data)
+
+
+async def update_bulk(crud: CRUD, models_data: List[Dict[str, Any]]) -> None:
+    await crud.update_many(models_data=models_data)
+
+
+async def measure(
+    session_factory: async_sessionmaker[AsyncSession],
+    create_operation: Operation,
+    update_operation: Operation,
+) -> List[float]:
+    timings = []
+    async with session_factory() as session:
+        crud = CRUD(session=session, cls_model=RecordModel)
+
+        start = time.perf_counter()
+        await create_operation(
+            crud, [{"record_data": f"record {index}"} for index in range(ROWS_COUNT)]
+        )
+        timings.append(time.perf_counter() - start)
+
+        created_records = await crud.all()
+        start = time.perf_counter()
+        await update_operation(
+            crud,
+            [
+                {"id": record.id, "record_data": f"{record.record_data} (updated)"}
+                for record in created_records
+            ],
+        )
+        timings.append(time.perf_counter() - start)
+
+        await session.rollback()
+
+    return timings
+
+
+async def main() -> None:
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    operations = {
+        "per-row": (create_per_row, update_per_row),
+        "bulk": (create_bulk, update_bulk),
+    }
+
+    print(  # noqa: WPS421
+        ROW_FORMAT.format("path", "operation", "total, s", "per row, us")
+    )
+    for path_name, (create_operation, update_operation) in operations.items():
+        timings = await measure(session_factory, create_operation, update_operation)
+        for operation_name, timing in zip(("create", "update"), timings):
+            per_row_us = timing / ROWS_COUNT * 10**6
+            row_text = ROW_FORMAT.format(
+                path_name, operation_name, f"{timing:.3f}", f"{per_row_us:.1f}"
+            )
+            print(row_text)  # noqa: WPS421
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+"""Compare CRUD statements built on each call and prebuilt once per model.
+
+Requires migrated database from `POSTGRES_DSN`, all changes are rolled back.
+Run from project root: `python -m benchmarks.crud_overhead`.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.inspection import inspect
+
+from app.db.crud import CRUD, Returning
+from app.db.record.models import RecordModel
+from app.db.record.repo import RecordRepo
+from app.db.sqlalchemy import engine
+
+CALLS_COUNT = 5000
+ROW_FORMAT = "{0:<10} {1:<10} {2:>10} {3:>14}"
+
+
+class LegacyCRUD(CRUD):
+    """CRUD which inspects model and builds statements on each call."""
+
+    async def update(
+        self,
+        *,
+        pkey_val: Any,
+        model_data: Dict[str, Any],
+        returning: Returning = False,
+    ) -> Any:
+        primary_key = inspect(self._cls_model).primary_key[0]
+        query = (
+            update(self._cls_model)
+            .where(primary_key == pkey_val)
+            .values(**model_data)
+            .execution_options(synchronize_session="fetch")
+        )
+        return await self._execute_returning(query, returning)
+
+    async def delete(self, *, pkey_val: Any) -> None:
+        primary_key = inspect(self._cls_model).primary_key[0].name
+        query = (
+            delete(self._cls_model)
+            .where(getattr(self._cls_model, primary_key) == pkey_val)
+            .execution_options(synchronize_session="fetch")
+        )
+        await self._session.execute(query)
+
+    async def get(self, *, pkey_val: Any) -> Any:
+        primary_key = inspect(self._cls_model).primary_key[0]
+        query = select(self._cls_model).where(primary_key == pkey_val)
+        rows = await self._session.execute(query)
+        return rows.scalars().one()
+
+
+def build_repo(session: AsyncSession, crud_class: type) -> RecordRepo:
+    repo = RecordRepo(session)
+    repo._crud = crud_class(session=session, cls_model=RecordModel)  # noqa: WPS437
+    return repo
+
+
+async def measure(session: AsyncSession, crud_class: type) -> List[float]:
+    repo = build_repo(session, crud_class)
+    records = []
+    for index in range(CALLS_COUNT):
+        records.append(await repo.create(f"record {index}"))
+
+    timings = []
+    start = time.perf_counter()
+    for record in records:
+        await repo.get(record.id)
+    timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for updated_record in records:
+        await repo.update(updated_record.id, f"{updated_record.record_data} (updated)")
+    timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for deleted_record in records:
+        await repo.delete(deleted_record.id)
+    timings.append(time.perf_counter() - start)
+
+    return timings
+
+
+async def main() -> None:
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    crud_classes = {"per-call": LegacyCRUD, "prebuilt": CRUD}
+
+    print(  # noqa: WPS421
+        ROW_FORMAT.format("path", "operation", "total, s", "per call, us")
+    )
+    for path_name, crud_class in crud_classes.items():
+        async with session_factory() as session:
+            timings = await measure(session, crud_class)
+            await session.rollback()
+
+        for operation_name, timing in zip(("get", "update", "delete"), timings):
+            per_call_us = timing / CALLS_COUNT * 10**6
+            row_text = ROW_FORMAT.format(
+                path_name, operation_name, f"{timing:.3f}", f"{per_call_us:.1f}"
+            )
+            print(row_text)  # noqa: WPS421
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+"""Compare throughput of stdlib records through current and new log pipelines.
+
+Half of records are DEBUG and rejected by INFO level, as SQLAlchemy and
+pybotx debug logs in production. Records are written to `os.devnull` and
+time includes writing of all queued records.
+Run from project root: `python -m benchmarks.logging_pipeline`.
+"""
+
+import logging
+import os
+import time
+from typing import Any, Dict
+
+from app.logger import (
+    BackgroundStreamWriter,
+    InterceptHandler,
+    RateLimitFilter,
+    format_json,
+    logger,
+)
+
+RECORDS_COUNT = 20000
+RATE_LIMIT = 1000
+ROW_FORMAT = "{0:<22} {1:>12} {2:>14}"
+
+
+def build_pipelines(devnull: Any) -> Dict[str, Dict[str, Any]]:
+    return {
+        "current (enqueue)": {
+            "root_level": logging.NOTSET,
+            "handler": {"sink": devnull, "level": logging.INFO, "enqueue": True},
+        },
+        "json": {
+            "root_level": logging.INFO,
+            "handler": {
+                "sink": BackgroundStreamWriter(devnull),
+                "level": logging.INFO,
+                "format": format_json,
+            },
+        },
+        "json + rate limit": {
+            "root_level": logging.INFO,
+            "handler": {
+                "sink": BackgroundStreamWriter(devnull),
+                "level": logging.INFO,
+                "format": format_json,
+                "filter": RateLimitFilter(RATE_LIMIT),
+            },
+        },
+    }
+
+
+def measure(root_level: int, handler: Dict[str, Any]) -> float:
+    logging.root.handlers = [InterceptHandler(level=root_level)]
+    logging.root.setLevel(root_level)
+    logger.remove()
+    logger.add(**handler)
+
+    stdlib_logger = logging.getLogger("sqlalchemy.engine.Engine")
+    start = time.perf_counter()
+    for index in range(RECORDS_COUNT // 2):
+        stdlib_logger.debug("[cached since %ss ago] {'id': %s}", 0.5, index)
+        stdlib_logger.info("SELECT record.id FROM record WHERE record.id = %s", index)
+
+    # Wait for queued records
+    logger.remove()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    print(ROW_FORMAT.format("pipeline", "total, s", "records/s"))  # noqa: WPS421
+    with open(os.devnull, "w") as devnull:
+        for pipeline_name, pipeline in build_pipelines(devnull).items():
+            timing = measure(**pipeline)
+            row_text = ROW_FORMAT.format(
+                pipeline_name, f"{timing:.3f}", f"{RECORDS_COUNT / timing:.0f}"
+            )
+            print(row_text)  # noqa: WPS421
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Compare redis serializers by dump size and encode/decode time.
+
+Run from project root: `python -m benchmarks.serializers`.
+"""
+
+import timeit
+from typing import Any, Dict, List, Tuple
+from uuid import uuid4
+
+from pybotx import UserFromSearch, UserKinds
+from pydantic import BaseModel
+
+from app.caching.serializers import (
+    CompressedSerializer,
+    JSONSerializer,
+    PickleSerializer,
+    Serializer,
+)
+
+ROUNDS = 1000
+COMPRESSION_THRESHOLD = 1024
+USERS_COUNT = 500
+US_IN_SECOND = 10**6
+ROW_FORMAT = "{0:<12} {1:<12} {2:>10} {3:>12} {4:>12}"
+
+
+class Payload(BaseModel):
+    users: List[Dict[str, Any]]
+    options: Dict[str, str]
+
+
+def build_user() -> UserFromSearch:
+    return UserFromSearch(
+        huid=uuid4(),
+        ad_login="ad_login",
+        ad_domain="ad.domain",
+        username="Username",
+        company="Company",
+        company_position="Position",
+        department="Department",
+        emails=["user@example.com"],
+        other_id=None,
+        user_kind=UserKinds.CTS_USER,
+    )
+
+
+def build_payloads() -> Dict[str, Any]:
+    return {
+        "small str": "test_value",
+        "user": build_user(),
+        "large model": Payload(
+            users=[
+                {"huid": str(uuid4()), "name": "Username"} for _ in range(USERS_COUNT)
+            ],
+            options={f"key_{index}": "value" * 10 for index in range(100)},
+        ),
+    }
+
+
+def measure(serializer: Serializer, storage_value: Any) -> Tuple[int, str, str]:
+    dump = serializer.dumps(storage_value)
+    encode_time = timeit.timeit(lambda: serializer.dumps(storage_value), number=ROUNDS)
+    decode_time = timeit.timeit(lambda: serializer.loads(dump), number=ROUNDS)
+
+    encode_us = encode_time / ROUNDS * US_IN_SECOND
+    decode_us = decode_time / ROUNDS * US_IN_SECOND
+    return len(dump), f"{encode_us:.1f}", f"{decode_us:.1f}"
+
+
+def main() -> None:
+    serializers = {
+        "pickle": PickleSerializer(),
+        "pickle+zlib": CompressedSerializer(PickleSerializer(), COMPRESSION_THRESHOLD),
+        "json": JSONSerializer(),
+        "json+zlib": CompressedSerializer(JSONSerializer(), COMPRESSION_THRESHOLD),
+    }
+
+    print(  # noqa: WPS421
+        ROW_FORMAT.format("payload", "serializer", "bytes", "encode, us", "decode, us")
+    )
+    for payload_name, storage_value in build_payloads().items():
+        for serializer_name, serializer in serializers.items():
+            row = measure(serializer, storage_value)
+            row_text = ROW_FORMAT.format(payload_name, serializer_name, *row)
+            print(row_text)  # noqa: WPS421
+
+
+if __name__ == "__main__":
+    main()
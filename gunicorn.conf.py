@@ -0,0 +1,12 @@
+"""Gunicorn server hooks, file is loaded by gunicorn from working directory."""
+
+from typing import Any
+
+from app.metrics.registry import clear_metrics_directory
+from app.settings import settings
+
+
+def on_starting(server: Any) -> None:
+    # Dumps of previous run must not be summed with dumps of new workers
+    if settings.METRICS_MULTIPROCESS_DIR:
+        clear_metrics_directory(settings.METRICS_MULTIPROCESS_DIR)
@@ -0,0 +1,151 @@
+import asyncio
+from typing import AsyncGenerator, Tuple
+
+import pytest
+from pybotx import Bot
+
+from app.caching.cached_redis_repo import CachedRedisRepo
+from app.caching.local_cache import LocalCache
+from app.metrics.instruments import REDIS_LOCAL_CACHE_EVENTS, REDIS_OPERATION_DURATION
+
+INVALIDATION_TIMEOUT = 1
+
+CachedRepos = Tuple[CachedRedisRepo, CachedRedisRepo]
+
+
+@pytest.fixture
+async def cached_repos(bot: Bot) -> AsyncGenerator[CachedRepos, None]:
+    repos = (
+        CachedRedisRepo(bot.state.redis, prefix="local_cache_test"),
+        CachedRedisRepo(bot.state.redis, prefix="local_cache_test"),
+    )
+    for repo in repos:
+        await repo.start()
+
+    yield repos
+
+    for started_repo in repos:
+        await started_repo.stop()
+
+
+async def wait_invalidation(repo: CachedRedisRepo) -> None:
+    async def waiter() -> None:
+        while not repo.local_cache_stats.invalidations:
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(waiter(), timeout=INVALIDATION_TIMEOUT)
+
+
+def test_local_cache_evicts_least_recently_used() -> None:
+    # - Arrange -
+    local_cache = LocalCache(maxsize=2, ttl=60)
+    local_cache.put("first", b"1")
+    local_cache.put("second", b"2")
+    local_cache.get("first")
+
+    # - Act -
+    local_cache.put("third", b"3")
+
+    # - Assert -
+    assert local_cache.get("second") is None
+    assert local_cache.get("first") == b"1"
+    assert local_cache.stats.evictions == 1
+
+
+def test_local_cache_skips_put_after_invalidation() -> None:
+    # - Arrange -
+    local_cache = LocalCache(maxsize=2, ttl=60)
+    generation = local_cache.generation
+
+    # - Act -
+    local_cache.invalidate(["key"])
+    local_cache.put("key", b"stale", generation=generation)
+
+    # - Assert -
+    assert local_cache.get("key") is None
+
+
+async def test_cached_redis_repo_serves_hits_locally(
+    cached_repos: CachedRepos,
+) -> None:
+    # - Arrange -
+    repo, _ = cached_repos
+    await repo.set("hot_key", {"value": 1})
+
+    # - Act -
+    first_value = await repo.get("hot_key")
+    second_value = await repo.get("hot_key")
+
+    # - Assert -
+    assert first_value == second_value == {"value": 1}
+    assert repo.local_cache_stats.misses == 1
+    assert repo.local_cache_stats.hits == 1
+
+
+async def test_cached_redis_repo_invalidates_other_processes(
+    cached_repos: CachedRepos,
+) -> None:
+    # - Arrange -
+    writer, reader = cached_repos
+    # Own invalidations are applied synchronously, so value is cached
+    await reader.set("changed_key", "old_value")
+    await reader.get("changed_key")
+
+    # - Act -
+    await writer.set("changed_key", "new_value")
+    await wait_invalidation(reader)
+
+    # - Assert -
+    assert await reader.get("changed_key") == "new_value"
+
+
+def get_observed_count(operation: str) -> int:
+    for label_values, sample in REDIS_OPERATION_DURATION.dump()["samples"]:
+        if label_values == [operation, "ok"]:
+            return sample[-1]
+
+    return 0
+
+
+def get_local_cache_events_count(event: str) -> int:
+    for label_values, sample in REDIS_LOCAL_CACHE_EVENTS.dump()["samples"]:
+        if label_values == [event]:
+            return sample
+
+    return 0
+
+
+async def test_cached_redis_repo_observes_redis_reads_of_misses_only(
+    cached_repos: CachedRepos,
+) -> None:
+    # - Arrange -
+    repo, _ = cached_repos
+    await repo.set_many({"observed_key": 1, "other_observed_key": 2})
+    await repo.get("observed_key")
+    get_count = get_observed_count("get")
+    get_many_count = get_observed_count("get_many")
+
+    # - Act -
+    await repo.get("observed_key")
+    cached_values = await repo.get_many(["observed_key", "other_observed_key"])
+
+    # - Assert -
+    assert cached_values == [1, 2]
+    assert get_observed_count("get") == get_count
+    assert get_observed_count("get_many") == get_many_count + 1
+    assert repo.local_cache_stats.hits == 2
+
+
+async def test_local_cache_events_are_counted_in_metric(
+    cached_repos: CachedRepos,
+) -> None:
+    # - Arrange -
+    repo, _ = cached_repos
+    misses_count = get_local_cache_events_count("misses")
+
+    # - Act -
+    await repo.get("missing_key")
+
+    # - Assert -
+    assert get_local_cache_events_count("misses") == misses_count + 1
+    assert REDIS_LOCAL_CACHE_EVENTS.dump()["type"] == "counter"
@@ -0,0 +1,74 @@
+import subprocess  # noqa: S404
+import sys
+from uuid import UUID
+
+import pytest
+
+from app.caching.keys import MAX_PLAIN_KEY_LENGTH, build_key
+
+
+def test_build_key_simple_keys_are_readable() -> None:
+    # - Arrange -
+    huid = UUID("86c4814b-feee-4ff0-b04d-4b3226318078")
+
+    # - Act -
+    keys = [build_key(key) for key in ("key", 1, huid, ("a", 1))]
+
+    # - Assert -
+    assert keys == [
+        "s:key",
+        "i:1",
+        "u:86c4814b-feee-4ff0-b04d-4b3226318078",
+        't:["s:a","i:1"]',
+    ]
+
+
+def test_build_key_different_types_dont_collide() -> None:
+    # - Act -
+    keys = {build_key(key) for key in (1, "1", True, ("1",))}
+
+    # - Assert -
+    assert len(keys) == 4
+
+
+def test_build_key_long_keys_are_hashed() -> None:
+    # - Act -
+    long_key = build_key("k" * MAX_PLAIN_KEY_LENGTH)
+    long_tuple_key = build_key(("k" * MAX_PLAIN_KEY_LENGTH,))
+
+    # - Assert -
+    assert long_key.startswith("h:")
+    assert long_tuple_key.startswith("h:")
+    assert long_key != long_tuple_key
+
+
+def test_build_key_frozenset_key_doesnt_depend_on_hash_seed() -> None:
+    # - Arrange -
+    build_key_code = (
+        "from app.caching.keys import build_key;"
+        "print(build_key(frozenset(('alpha', 'beta', 'gamma', 'delta'))))"
+    )
+
+    # - Act -
+    keys = {
+        subprocess.run(  # noqa: S603
+            [sys.executable, "-c", build_key_code],
+            env={"PYTHONHASHSEED": hash_seed},
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        for hash_seed in ("1", "2", "3")
+    }
+
+    # - Assert -
+    assert keys == {'fs:["s:alpha","s:beta","s:delta","s:gamma"]\n'}
+
+
+def test_build_key_rejects_unsupported_key_types() -> None:
+    # - Act -
+    with pytest.raises(TypeError) as exc:
+        build_key(("key", b"bytes"))
+
+    # - Assert -
+    assert "bytes" in str(exc.value)  # noqa: WPS441
@@ -0,0 +1,74 @@
+from app.caching.redis_repo import RedisRepo
+from app.caching.serializers import CompressedSerializer, PickleSerializer
+
+
+async def test_redis_repo_set_many_and_get_many(redis_repo: RedisRepo) -> None:
+    # - Arrange -
+    await redis_repo.set_many({"bulk_1": "value_1", ("bulk", 2): {"value": 2}})
+
+    # - Act -
+    cached_values = await redis_repo.get_many(
+        ["bulk_1", ("bulk", 2), "bulk_missing"], default="default"
+    )
+
+    # - Assert -
+    assert cached_values == ["value_1", {"value": 2}, "default"]
+
+
+async def test_redis_repo_set_many_with_per_key_expire(redis_repo: RedisRepo) -> None:
+    # - Arrange -
+    redis = redis_repo._redis  # noqa: WPS437
+    await redis_repo.set_many(
+        {"with_expire": 1, "without_expire": 2}, expire={"with_expire": 100}
+    )
+
+    # - Act -
+    with_expire_ttl = await redis.ttl(redis_repo._key("with_expire"))  # noqa: WPS437
+    without_expire_ttl = await redis.ttl(
+        redis_repo._key("without_expire")  # noqa: WPS437
+    )
+
+    # - Assert -
+    assert 0 < with_expire_ttl <= 100
+    assert without_expire_ttl == -1
+
+
+async def test_redis_repo_delete_many(redis_repo: RedisRepo) -> None:
+    # - Arrange -
+    await redis_repo.set_many({"delete_1": 1, "delete_2": 2})
+
+    # - Act -
+    await redis_repo.delete_many(["delete_1", "delete_2"])
+
+    # - Assert -
+    assert await redis_repo.get_many(["delete_1", "delete_2"]) == [None, None]
+
+
+async def test_redis_repo_pipeline(redis_repo: RedisRepo) -> None:
+    # - Act -
+    async with redis_repo.pipeline() as pipeline:
+        pipeline.set("pipeline_key", "value")
+        pipeline.get("pipeline_key")
+        pipeline.delete("pipeline_key")
+        pipeline.get("pipeline_key", default="default")
+
+    # - Assert -
+    assert pipeline.replies == [None, "value", None, "default"]  # noqa: WPS441
+
+
+async def test_redis_repo_treats_dump_of_other_serializer_as_missing(
+    redis_repo: RedisRepo,
+) -> None:
+    # - Arrange -
+    await redis_repo.set("serialized_key", "value")
+    compressed_repo = RedisRepo(
+        redis_repo._redis,  # noqa: WPS437
+        prefix=redis_repo._prefix,  # noqa: WPS437
+        serializer=CompressedSerializer(PickleSerializer(), threshold=100),
+    )
+
+    # - Act -
+    cached_value = await compressed_repo.get("serialized_key", default="default")
+
+    # - Assert -
+    assert cached_value == "default"
@@ -0,0 +1,82 @@
+from uuid import UUID
+
+import pytest
+from pybotx import UserFromSearch, UserKinds
+from pybotx.models.method_callbacks import BotAPIMethodSuccessfulCallback
+
+from app.caching.serializers import (
+    CompressedSerializer,
+    JSONSerializer,
+    PickleSerializer,
+    SerializationError,
+    Serializer,
+)
+
+
+@pytest.fixture
+def user() -> UserFromSearch:
+    return UserFromSearch(
+        huid=UUID("86c4814b-feee-4ff0-b04d-4b3226318078"),
+        ad_login=None,
+        ad_domain=None,
+        username="Test User",
+        company=None,
+        company_position=None,
+        department=None,
+        emails=[],
+        other_id=None,
+        user_kind=UserKinds.CTS_USER,
+    )
+
+
+@pytest.mark.parametrize(
+    "serializer",
+    [
+        PickleSerializer(),
+        JSONSerializer(),
+        CompressedSerializer(JSONSerializer(), threshold=0),
+    ],
+)
+def test_serializer_roundtrip(serializer: Serializer, user: UserFromSearch) -> None:
+    # - Arrange -
+    callback = BotAPIMethodSuccessfulCallback(
+        sync_id=UUID("21a9ec9e-f21f-4406-ac44-1a78d2ccf9e3"),
+        status="ok",
+        result={"key": "value"},
+    )
+
+    # - Act -
+    loaded_user = serializer.loads(serializer.dumps(user))
+    loaded_callback = serializer.loads(serializer.dumps(callback))
+
+    # - Assert -
+    assert loaded_user == user
+    assert loaded_callback == callback
+
+
+def test_compressed_serializer_compresses_above_threshold() -> None:
+    # - Arrange -
+    serializer = CompressedSerializer(JSONSerializer(), threshold=100)
+    large_value = "value" * 100
+
+    # - Act -
+    small_dump = serializer.dumps("value")
+    large_dump = serializer.dumps(large_value)
+
+    # - Assert -
+    assert small_dump == b'\x00"value"'
+    assert len(large_dump) < len(large_value)
+    assert serializer.loads(large_dump) == large_value
+
+
+@pytest.mark.parametrize(
+    "dump",
+    [b"\x80\x04\x95", b'"value"', b"\x01not compressed"],
+)
+def test_compressed_serializer_rejects_dumps_of_other_settings(dump: bytes) -> None:
+    # - Arrange -
+    serializer = CompressedSerializer(PickleSerializer(), threshold=100)
+
+    # - Act -
+    with pytest.raises(SerializationError):
+        serializer.loads(dump)
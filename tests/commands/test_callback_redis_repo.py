@@ -1,7 +1,8 @@
 import asyncio
-import os
 from http import HTTPStatus
-from typing import AsyncGenerator, Callable
+from typing import AsyncGenerator, Callable, Union
+from unittest.mock import AsyncMock, patch
+from uuid import UUID, uuid4
 
 import httpx
 import pytest
@@ -13,24 +14,53 @@ from pybotx import (
     IncomingMessage,
     lifespan_wrapper,
 )
+from pybotx.models.method_callbacks import BotAPIMethodSuccessfulCallback
 from redis import asyncio as aioredis
 from respx import MockRouter
 
-from app.caching.callback_redis_repo import CallbackRedisRepo
+from app.caching.callback_redis_repo import (
+    CallbackRedisRepo,
+    MultiplexedCallbackRedisRepo,
+)
+from app.caching.serializers import SerializationError
 from app.main import get_application
 from app.settings import settings
 from tests.conftest import mock_authorization
 
-pytestmark = pytest.mark.xfail(
-    os.getenv("CI") == "true", reason="CI is too slow for this tests"
-)
+CALLBACK_CREATION_TIMEOUT = 5
+
+CallbackRepo = Union[CallbackRedisRepo, MultiplexedCallbackRedisRepo]
+
+
+@pytest.fixture(params=[CallbackRedisRepo, MultiplexedCallbackRedisRepo])
+async def callback_repo(
+    request: pytest.FixtureRequest,
+) -> AsyncGenerator[CallbackRepo, None]:
+    redis = aioredis.from_url(settings.REDIS_DSN)
+    yield request.param(redis)
+    await redis.aclose()
+
+
+@pytest.fixture
+def callback_created(
+    callback_repo: CallbackRepo, monkeypatch: pytest.MonkeyPatch
+) -> asyncio.Event:
+    """Event set when callback is created, so its result can be sent."""
+    callback_created = asyncio.Event()
+    create_callback = callback_repo.create_botx_method_callback
+
+    async def create_and_notify(sync_id: UUID) -> None:  # noqa: WPS430
+        await create_callback(sync_id)
+        callback_created.set()
+
+    monkeypatch.setattr(callback_repo, "create_botx_method_callback", create_and_notify)
+    return callback_created
 
 
 @pytest.fixture
-async def bot() -> AsyncGenerator[Bot, None]:
-    redis_repo = CallbackRedisRepo(aioredis.from_url(settings.REDIS_DSN))
+async def bot(callback_repo: CallbackRepo) -> AsyncGenerator[Bot, None]:
     fastapi_app = get_application(
-        add_internal_error_handler=False, callback_repo=redis_repo
+        add_internal_error_handler=False, callback_repo=callback_repo
     )
     built_bot = fastapi_app.state.bot
 
@@ -45,6 +75,7 @@ async def test_callback_redis_repo_successful_callback(
     respx_mock: MockRouter,
     host: str,
     bot: Bot,
+    callback_created: asyncio.Event,
     incoming_message_factory: Callable[..., IncomingMessage],
 ) -> None:
     # - Arrange -
@@ -68,7 +99,9 @@ async def test_callback_redis_repo_successful_callback(
     # - Act -
     async with lifespan_wrapper(bot):
         task = bot.async_execute_bot_command(message)
-        await asyncio.sleep(0)
+        await asyncio.wait_for(
+            callback_created.wait(), timeout=CALLBACK_CREATION_TIMEOUT
+        )
 
         await bot.set_raw_botx_method_result(
             {
@@ -90,6 +123,7 @@ async def test_callback_redis_repo_unsuccessful_callback(
     respx_mock: MockRouter,
     host: str,
     bot: Bot,
+    callback_created: asyncio.Event,
     incoming_message_factory: Callable[..., IncomingMessage],
 ) -> None:
     # - Arrange -
@@ -113,7 +147,9 @@ async def test_callback_redis_repo_unsuccessful_callback(
     # - Act -
     async with lifespan_wrapper(bot):
         task = bot.async_execute_bot_command(message)
-        await asyncio.sleep(0)
+        await asyncio.wait_for(
+            callback_created.wait(), timeout=CALLBACK_CREATION_TIMEOUT
+        )
 
         await bot.set_raw_botx_method_result(
             {
@@ -171,6 +207,7 @@ async def test_callback_redis_repo_wait_callback(
     respx_mock: MockRouter,
     host: str,
     bot: Bot,
+    callback_created: asyncio.Event,
     incoming_message_factory: Callable[..., IncomingMessage],
 ) -> None:
     # - Arrange -
@@ -194,7 +231,9 @@ async def test_callback_redis_repo_wait_callback(
     # - Act -
     async with lifespan_wrapper(bot):
         task = bot.async_execute_bot_command(message)
-        await asyncio.sleep(0.1)
+        await asyncio.wait_for(
+            callback_created.wait(), timeout=CALLBACK_CREATION_TIMEOUT
+        )
 
         await bot.set_raw_botx_method_result(
             {
@@ -248,3 +287,56 @@ async def test_callback_redis_repo_no_wait_callback(
         "Callback `21a9ec9e-f21f-4406-ac44-1a78d2ccf9e3` wasn't waited"
         in loguru_caplog.text
     )
+
+
+async def test_multiplexed_callback_repo_resubscribes_after_failed_subscribe() -> (
+    None
+):
+    # - Arrange -
+    redis = aioredis.from_url(settings.REDIS_DSN)
+    callback_repo = MultiplexedCallbackRedisRepo(redis)
+    sync_id = uuid4()
+    failed_pubsub = redis.pubsub()
+    failed_pubsub.psubscribe = AsyncMock(  # type: ignore [assignment]
+        side_effect=ConnectionError("Redis is unavailable")
+    )
+
+    # - Act -
+    with patch.object(redis, "pubsub", side_effect=[failed_pubsub, redis.pubsub()]):
+        with pytest.raises(ConnectionError):
+            await callback_repo.create_botx_method_callback(sync_id)
+
+        await callback_repo.create_botx_method_callback(sync_id)
+
+    # - Assert -
+    callback_future = await callback_repo.pop_botx_method_callback(sync_id)
+    assert not callback_future.done()
+
+    await callback_repo.stop_callbacks_waiting()
+    await redis.aclose()
+
+
+async def test_multiplexed_callback_repo_fails_only_undecodable_callback() -> None:
+    # - Arrange -
+    redis = aioredis.from_url(settings.REDIS_DSN)
+    callback_repo = MultiplexedCallbackRedisRepo(redis, prefix="test")
+    broken_sync_id, sync_id = uuid4(), uuid4()
+    await callback_repo.create_botx_method_callback(broken_sync_id)
+    await callback_repo.create_botx_method_callback(sync_id)
+    callback = BotAPIMethodSuccessfulCallback(sync_id=sync_id, status="ok", result={})
+
+    # - Act -
+    await redis.publish(f"test:{broken_sync_id}", b"undecodable")
+    with pytest.raises(SerializationError):
+        await callback_repo.wait_botx_method_callback(broken_sync_id, timeout=1)
+
+    await callback_repo.set_botx_method_callback_result(callback)
+    received_callback = await callback_repo.wait_botx_method_callback(
+        sync_id, timeout=1
+    )
+
+    # - Assert -
+    assert received_callback == callback
+
+    await callback_repo.stop_callbacks_waiting()
+    await redis.aclose()
@@ -0,0 +1,115 @@
+import asyncio
+from dataclasses import replace
+from typing import Callable, List
+from uuid import uuid4
+
+import pytest
+from pybotx import Bot, IncomingMessage
+from pybotx.models.commands import BotCommand
+
+from app.bot.command_queue import CommandQueue, CommandQueueFullError
+
+
+async def test_command_queue_keeps_chat_order(
+    incoming_message_factory: Callable[..., IncomingMessage],
+) -> None:
+    # - Arrange -
+    processed_bodies: List[str] = []
+
+    async def executor(bot_command: BotCommand) -> None:  # noqa: WPS430
+        assert isinstance(bot_command, IncomingMessage)
+        # Later commands are faster, so they would overtake without ordering
+        await asyncio.sleep(0.01 / int(bot_command.body))
+        processed_bodies.append(bot_command.body)
+
+    message = incoming_message_factory()
+    command_queue = CommandQueue(executor, capacity=10, consumers_count=4)
+    command_queue.start()
+
+    # - Act -
+    bodies = [str(index) for index in range(1, 6)]
+    messages = [replace(message, body=body) for body in bodies]
+    processed_futures = [command_queue.put(message) for message in messages]
+    await asyncio.gather(*processed_futures)
+    await command_queue.stop()
+
+    # - Assert -
+    assert processed_bodies == bodies
+    assert command_queue.stats.processed == 5
+    assert command_queue.stats.depth == 0
+
+
+async def test_command_queue_slow_chat_doesnt_block_other_chats(
+    incoming_message_factory: Callable[..., IncomingMessage],
+) -> None:
+    # - Arrange -
+    slow_command_released = asyncio.Event()
+
+    async def executor(bot_command: BotCommand) -> None:  # noqa: WPS430
+        assert isinstance(bot_command, IncomingMessage)
+        if bot_command.body == "slow":
+            await slow_command_released.wait()
+
+    slow_message = incoming_message_factory(body="slow")
+    other_chat = replace(slow_message.chat, id=uuid4())
+    other_chat_message = replace(slow_message, body="fast", chat=other_chat)
+    command_queue = CommandQueue(executor, capacity=10, consumers_count=2)
+    command_queue.start()
+
+    # - Act -
+    slow_processed = command_queue.put(slow_message)
+    blocked_processed = command_queue.put(replace(slow_message, body="fast"))
+    other_chats_processed = [
+        command_queue.put(other_chat_message) for _ in range(3)
+    ] + [command_queue.put(replace(other_chat_message, chat=None)) for _ in range(3)]
+    await asyncio.wait_for(asyncio.gather(*other_chats_processed), timeout=1)
+
+    # - Assert -
+    assert not slow_processed.done()
+    assert not blocked_processed.done()
+
+    slow_command_released.set()
+    await command_queue.stop()
+    assert command_queue.stats.processed == 8
+
+
+async def test_command_queue_rejects_commands_when_full(
+    incoming_message_factory: Callable[..., IncomingMessage],
+) -> None:
+    # - Arrange -
+    async def executor(bot_command: BotCommand) -> None:  # noqa: WPS430
+        """Never called, queue isn't started."""
+
+    message = incoming_message_factory()
+    command_queue = CommandQueue(executor, capacity=1, consumers_count=1)
+    command_queue.put(message)
+
+    # - Act -
+    with pytest.raises(CommandQueueFullError):
+        command_queue.put(message)
+
+    # - Assert -
+    assert command_queue.stats.depth == 1
+    assert command_queue.stats.rejected == 1
+
+
+async def test_bot_passes_commands_through_queue(
+    bot: Bot,
+    incoming_message_factory: Callable[..., IncomingMessage],
+) -> None:
+    # - Arrange -
+    executed_commands: List[BotCommand] = []
+
+    async def executor(bot_command: BotCommand) -> None:  # noqa: WPS430
+        executed_commands.append(bot_command)
+
+    message = incoming_message_factory()
+    bot.state.command_queue = CommandQueue(executor, capacity=1, consumers_count=1)
+    bot.state.command_queue.start()
+
+    # - Act -
+    await bot.async_execute_bot_command(message)
+    await bot.state.command_queue.stop()
+
+    # - Assert -
+    assert executed_commands == [message]
@@ -108,6 +108,8 @@ async def bot(
     built_bot.answer_message = AsyncMock(return_value=uuid4())
 
     async with LifespanManager(fastapi_app):
+        # Cached values mustn't leak between tests
+        await built_bot.state.redis.flushdb()
         yield built_bot
 
 
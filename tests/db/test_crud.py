@@ -0,0 +1,132 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.crud import CRUD
+from app.db.record.models import RecordModel
+
+
+async def test_crud_create_many(db_session: AsyncSession) -> None:
+    # - Arrange -
+    crud = CRUD(session=db_session, cls_model=RecordModel)
+
+    # - Act -
+    created_records = await crud.create_many(
+        models_data=[{"record_data": f"record {index}"} for index in range(5)],
+        chunk_size=2,
+    )
+
+    # - Assert -
+    assert [record.record_data for record in created_records] == [
+        f"record {index}" for index in range(5)
+    ]
+    assert len(await crud.all()) == 5
+
+
+async def test_crud_update_many_and_delete_many(db_session: AsyncSession) -> None:
+    # - Arrange -
+    crud = CRUD(session=db_session, cls_model=RecordModel)
+    first_record, second_record, third_record = await crud.create_many(
+        models_data=[
+            {"record_data": "first"},
+            {"record_data": "second"},
+            {"record_data": "third"},
+        ]
+    )
+
+    # - Act -
+    await crud.update_many(
+        models_data=[
+            {"id": first_record.id, "record_data": "first (updated)"},
+            {"id": second_record.id, "record_data": "second (updated)"},
+        ]
+    )
+    await crud.delete_many(pkey_vals=[second_record.id, third_record.id])
+
+    # - Assert -
+    remaining_records = await crud.all()
+    assert [record.record_data for record in remaining_records] == ["first (updated)"]
+
+
+async def test_crud_upsert_many(db_session: AsyncSession) -> None:
+    # - Arrange -
+    crud = CRUD(session=db_session, cls_model=RecordModel)
+    existing_record = (await crud.create_many(models_data=[{"record_data": "old"}]))[0]
+
+    # - Act -
+    upserted_records = await crud.upsert_many(
+        models_data=[
+            {"id": existing_record.id, "record_data": "updated"},
+            {"id": existing_record.id + 1, "record_data": "inserted"},
+        ]
+    )
+
+    # - Assert -
+    assert [record.record_data for record in upserted_records] == [
+        "updated",
+        "inserted",
+    ]
+    assert {record.record_data for record in await crud.all()} == {
+        "updated",
+        "inserted",
+    }
+
+
+async def test_crud_create_and_update_returning(db_session: AsyncSession) -> None:
+    # - Arrange -
+    crud = CRUD(session=db_session, cls_model=RecordModel)
+    created_record = await crud.create(
+        model_data={"record_data": "created"}, returning=True
+    )
+
+    # - Act -
+    updated_row = await crud.update(
+        pkey_val=created_record.id,
+        model_data={"record_data": "updated"},
+        returning=["record_data"],
+    )
+
+    # - Assert -
+    assert created_record.record_data == "updated"
+    assert updated_row.record_data == "updated"
+
+
+async def test_crud_all_keyset_pagination(db_session: AsyncSession) -> None:
+    # - Arrange -
+    crud = CRUD(session=db_session, cls_model=RecordModel)
+    await crud.create_many(
+        models_data=[{"record_data": f"record {index}"} for index in range(5)]
+    )
+
+    # - Act -
+    first_page = await crud.all(limit=2)
+    second_page = await crud.all(after=first_page[-1].id, limit=2)
+    last_page = await crud.all(after=second_page[-1].id, limit=2)
+
+    # - Assert -
+    pages = [first_page, second_page, last_page]
+    assert [[record.record_data for record in page] for page in pages] == [
+        ["record 0", "record 1"],
+        ["record 2", "record 3"],
+        ["record 4"],
+    ]
+
+
+async def test_crud_stream(db_session: AsyncSession) -> None:
+    # - Arrange -
+    crud = CRUD(session=db_session, cls_model=RecordModel)
+    await crud.create_many(
+        models_data=[
+            {"record_data": record_data}
+            for record_data in ("record 0", "record 1", "record 0", "record 0")
+        ]
+    )
+
+    # - Act -
+    streamed_records = [
+        record
+        async for record in crud.stream(
+            field="record_data", field_value="record 0", chunk_size=2
+        )
+    ]
+
+    # - Assert -
+    assert len(streamed_records) == 3
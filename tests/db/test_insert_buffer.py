@@ -0,0 +1,71 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.insert_buffer import InsertBuffer
+from app.db.record.models import RecordModel
+from app.db.record.repo import RecordRepo
+from app.db.sqlalchemy import build_db_sessionmaker
+
+
+async def test_insert_buffer_coalesces_concurrent_inserts(
+    db_session: AsyncSession,
+) -> None:
+    # - Arrange -
+    session_factory = Mock(wraps=build_db_sessionmaker())
+    insert_buffer = InsertBuffer(session_factory, RecordModel, delay=0.01)
+    record_repo = RecordRepo(db_session, insert_buffer=insert_buffer)
+
+    # - Act -
+    record_ids = await asyncio.gather(
+        *[record_repo.create_deferred(f"record {index}") for index in range(5)]
+    )
+
+    # - Assert -
+    session_factory.assert_called_once()
+    for index, record_id in enumerate(record_ids):
+        record = await record_repo.get(record_id)
+        assert record.record_data == f"record {index}"
+
+
+async def test_insert_buffer_flushed_on_max_size(db_session: AsyncSession) -> None:
+    # - Arrange -
+    insert_buffer = InsertBuffer(
+        build_db_sessionmaker(), RecordModel, delay=60, max_size=2
+    )
+
+    # - Act -
+    record_ids = await asyncio.wait_for(
+        asyncio.gather(
+            insert_buffer.insert({"record_data": "first"}),
+            insert_buffer.insert({"record_data": "second"}),
+        ),
+        timeout=1,
+    )
+
+    # - Assert -
+    assert len(set(record_ids)) == 2
+
+
+async def test_insert_buffer_fails_only_callers_of_invalid_rows(
+    db_session: AsyncSession,
+) -> None:
+    # - Arrange -
+    insert_buffer = InsertBuffer(build_db_sessionmaker(), RecordModel, delay=60)
+    valid_insert = asyncio.create_task(insert_buffer.insert({"record_data": "valid"}))
+    invalid_insert = asyncio.create_task(
+        insert_buffer.insert({"id": "invalid", "record_data": "invalid"})
+    )
+    await asyncio.sleep(0)
+
+    # - Act -
+    await insert_buffer.flush()
+
+    # - Assert -
+    with pytest.raises(SQLAlchemyError):
+        await invalid_insert
+    record = await RecordRepo(db_session).get(await valid_insert)
+    assert record.record_data == "valid"
@@ -0,0 +1,183 @@
+import asyncio
+from typing import Any, AsyncGenerator, List
+
+import pytest
+from sqlalchemy import event, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.db.record.models import RecordModel
+from app.db.replicas import ReplicaBalancer, RoutingSession
+from app.db.sqlalchemy import build_engine, engine
+from app.schemas.enums import ReplicaBalancing
+from app.settings import settings
+
+
+@pytest.fixture
+async def replica_engines() -> AsyncGenerator[List[AsyncEngine], None]:
+    replica_engines = [build_engine(settings.POSTGRES_DSN) for _ in range(2)]
+    yield replica_engines
+
+    for replica_engine in replica_engines:
+        await replica_engine.dispose()
+
+
+def build_session(replica_balancer: ReplicaBalancer, read_only: bool) -> AsyncSession:
+    db_session = async_sessionmaker(
+        bind=engine,
+        sync_session_class=RoutingSession,
+        replica_balancer=replica_balancer,
+    )()
+    db_session.info["read_only"] = read_only
+    return db_session
+
+
+async def test_replica_balancer_round_robin(
+    replica_engines: List[AsyncEngine],
+) -> None:
+    # - Arrange -
+    replica_balancer = ReplicaBalancer(replica_engines, ReplicaBalancing.ROUND_ROBIN)
+
+    # - Act -
+    chosen_engines = [replica_balancer.choose() for _ in range(4)]
+
+    # - Assert -
+    assert chosen_engines == replica_engines * 2
+
+
+async def test_replica_balancer_least_connections(
+    replica_engines: List[AsyncEngine],
+) -> None:
+    # - Arrange -
+    first_replica, second_replica = replica_engines
+    replica_balancer = ReplicaBalancer(
+        replica_engines, ReplicaBalancing.LEAST_CONNECTIONS
+    )
+
+    # - Act -
+    async with first_replica.connect():
+        chosen_engine = replica_balancer.choose()
+
+    # - Assert -
+    assert chosen_engine is second_replica
+
+
+async def test_replica_balancer_skips_unhealthy_replicas(
+    replica_engines: List[AsyncEngine],
+) -> None:
+    # - Arrange -
+    unavailable_replica = build_engine("postgresql://postgres@localhost:1/postgres")
+    replica_balancer = ReplicaBalancer(
+        [unavailable_replica, replica_engines[0]], ReplicaBalancing.ROUND_ROBIN
+    )
+
+    # - Act -
+    replica_errors = await replica_balancer.check_health()
+
+    # - Assert -
+    assert len(replica_errors) == 1
+    assert replica_errors[0].startswith("replica 0:")
+    assert {replica_balancer.choose() for _ in range(3)} == {replica_engines[0]}
+
+
+async def test_routing_session_reads_from_replica_until_write(
+    replica_engines: List[AsyncEngine],
+) -> None:
+    # - Arrange -
+    replica_balancer = ReplicaBalancer(replica_engines, ReplicaBalancing.ROUND_ROBIN)
+    read_only_session = build_session(replica_balancer, read_only=True)
+    sync_session = read_only_session.sync_session
+    select_query = select(RecordModel)
+    insert_query = insert(RecordModel)
+
+    # - Act -
+    first_read_bind = sync_session.get_bind(clause=select_query)
+    second_read_bind = sync_session.get_bind(clause=select_query)
+    write_bind = sync_session.get_bind(clause=insert_query)
+    read_after_write_bind = sync_session.get_bind(clause=select_query)
+
+    # - Assert -
+    assert first_read_bind is replica_engines[0].sync_engine
+    assert second_read_bind is first_read_bind
+    assert write_bind is engine.sync_engine
+    assert read_after_write_bind is engine.sync_engine
+
+
+async def test_routing_session_uses_primary_for_read_write_session(
+    replica_engines: List[AsyncEngine],
+) -> None:
+    # - Arrange -
+    replica_balancer = ReplicaBalancer(replica_engines, ReplicaBalancing.ROUND_ROBIN)
+    db_session = build_session(replica_balancer, read_only=False)
+
+    # - Act -
+    read_bind = db_session.sync_session.get_bind(clause=select(RecordModel))
+
+    # - Assert -
+    assert read_bind is engine.sync_engine
+
+
+async def test_routing_session_chooses_replica_per_transaction(
+    db_migrations: None,
+    replica_engines: List[AsyncEngine],
+) -> None:
+    # - Arrange -
+    replica_balancer = ReplicaBalancer(replica_engines, ReplicaBalancing.ROUND_ROBIN)
+    read_only_session = build_session(replica_balancer, read_only=True)
+
+    # - Act -
+    async with read_only_session:
+        await read_only_session.execute(select(RecordModel))
+        first_connection = await read_only_session.connection()
+        await read_only_session.rollback()
+
+        await read_only_session.execute(select(RecordModel))
+        second_connection = await read_only_session.connection()
+
+    # - Assert -
+    assert first_connection.engine.sync_engine is replica_engines[0].sync_engine
+    assert second_connection.engine.sync_engine is replica_engines[1].sync_engine
+
+
+async def test_replica_balancer_probes_failed_replica_again(
+    replica_engines: List[AsyncEngine],
+) -> None:
+    # - Arrange -
+    replica_engine = replica_engines[0]
+    replica_balancer = ReplicaBalancer(
+        [replica_engine], ReplicaBalancing.ROUND_ROBIN, recheck_interval=0
+    )
+
+    def fail_connect(*args: Any) -> None:
+        raise ConnectionError("Replica is unavailable")
+
+    event.listen(replica_engine.sync_engine, "do_connect", fail_connect)
+    await replica_balancer.check_health()
+    event.remove(replica_engine.sync_engine, "do_connect", fail_connect)
+
+    # - Act -
+    chosen_before_probe = replica_balancer.choose()
+    await asyncio.sleep(0.1)
+    chosen_after_probe = replica_balancer.choose()
+
+    # - Assert -
+    assert chosen_before_probe is None
+    assert chosen_after_probe is replica_engine
+
+
+async def test_routing_session_sends_textual_statements_to_primary(
+    replica_engines: List[AsyncEngine],
+) -> None:
+    # - Arrange -
+    replica_balancer = ReplicaBalancer(replica_engines, ReplicaBalancing.ROUND_ROBIN)
+    read_only_session = build_session(replica_balancer, read_only=True)
+    sync_session = read_only_session.sync_session
+
+    # - Act -
+    opted_in_bind = sync_session.get_bind(
+        clause=text("SELECT 1").execution_options(replica=True)
+    )
+    textual_write_bind = sync_session.get_bind(clause=text("UPDATE records SET id=1"))
+
+    # - Assert -
+    assert opted_in_bind is replica_engines[0].sync_engine
+    assert textual_write_bind is engine.sync_engine
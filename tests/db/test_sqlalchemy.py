@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.sqlalchemy import build_connect_args, make_url_async
+from app.settings import settings
+
+
+def test_build_connect_args_pgbouncer_mode(monkeypatch: pytest.MonkeyPatch) -> None:
+    # - Arrange -
+    monkeypatch.setattr(settings, "POSTGRES_PGBOUNCER_MODE", True)  # noqa: WPS425
+
+    # - Act -
+    connect_args = build_connect_args()
+
+    # - Assert -
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    name_func = connect_args["prepared_statement_name_func"]
+    assert name_func() != name_func()
+
+
+async def test_statement_timeout_applied_to_connections(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # - Arrange -
+    monkeypatch.setattr(settings, "POSTGRES_STATEMENT_TIMEOUT", 10)
+    engine = create_async_engine(
+        make_url_async(settings.POSTGRES_DSN), connect_args=build_connect_args()
+    )
+
+    # - Act -
+    async with engine.connect() as connection:
+        # - Assert -
+        with pytest.raises(DBAPIError, match="statement timeout"):
+            await connection.execute(text("SELECT pg_sleep(1)"))
+
+    await engine.dispose()
@@ -0,0 +1,30 @@
+from typing import AsyncGenerator
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from pybotx import Bot, UserNotFoundError
+
+from app.api.endpoints.metrics import router as metrics_router
+from app.api.endpoints.swagger_rpc_execute import router as swagger_rpc_router
+from app.api.middlewares.metrics import HTTPMetricsMiddleware
+
+
+@pytest.fixture
+async def swagger_rpc_client(bot: Bot) -> AsyncGenerator[httpx.AsyncClient, None]:
+    # Swagger RPC router is included in application only in debug mode
+    application = FastAPI()
+    application.include_router(swagger_rpc_router)
+    application.include_router(metrics_router)
+    application.add_middleware(HTTPMetricsMiddleware)
+    application.state.bot = bot
+    bot.search_user_by_huid = AsyncMock(  # type: ignore
+        side_effect=UserNotFoundError("not found")
+    )
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=application),  # type: ignore
+        base_url="http://testserver",
+    ) as client:
+        yield client
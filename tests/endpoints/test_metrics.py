@@ -0,0 +1,26 @@
+from http import HTTPStatus
+
+import httpx
+
+
+async def test_metrics_include_requests_and_rpc_methods(
+    swagger_rpc_client: httpx.AsyncClient,
+) -> None:
+    # - Act -
+    await swagger_rpc_client.post(
+        "/batch", json=[{"method": "test:echo", "params": {"text": "text"}}]
+    )
+    response = await swagger_rpc_client.get("/metrics")
+
+    # - Assert -
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        'http_request_duration_seconds_count{method="POST",path="/batch",status="200"}'
+        in response.text
+    )
+    assert (
+        'rpc_method_duration_seconds_count{method="test:echo",status="ok"}'
+        in response.text
+    )
+    assert "db_pool_checked_out_connections" in response.text
@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import httpx
+import pytest
+from pybotx import Bot
+
+from app.settings import settings
+
+
+async def test_rpc_batch_execute_returns_responses_in_order(
+    bot: Bot, swagger_rpc_client: httpx.AsyncClient
+) -> None:
+    # - Arrange -
+    calls = [
+        {"method": "test:echo", "params": {"text": "first"}},
+        {"method": "test:unknown"},
+        {"method": "test:echo", "params": {"text": "second"}},
+    ]
+
+    # - Act -
+    response = await swagger_rpc_client.post("/batch", json=calls)
+
+    # - Assert -
+    assert response.status_code == HTTPStatus.OK
+
+    first_response, unknown_response, second_response = response.json()
+    assert first_response["result"] == "first"
+    assert unknown_response["status"] == "error"
+    assert second_response["result"] == "second"
+    bot.search_user_by_huid.assert_awaited_once()  # type: ignore
+
+
+async def test_rpc_batch_execute_rejects_too_many_calls(
+    bot: Bot,
+    swagger_rpc_client: httpx.AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # - Arrange -
+    monkeypatch.setattr(settings, "RPC_BATCH_MAX_CALLS", 2)
+    calls = [{"method": "test:echo", "params": {"text": "text"}} for _ in range(3)]
+
+    # - Act -
+    response = await swagger_rpc_client.post("/batch", json=calls)
+
+    # - Assert -
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == [
+        {
+            "reason": "Too many calls in batch",
+            "id": "BatchTooLarge",
+            "meta": {"max_calls": 2},
+        }
+    ]
+    bot.search_user_by_huid.assert_not_awaited()  # type: ignore
+
+
+async def test_rpc_execute_returns_server_timing(
+    swagger_rpc_client: httpx.AsyncClient,
+) -> None:
+    # - Act -
+    response = await swagger_rpc_client.post("/test:redis")
+
+    # - Assert -
+    assert response.status_code == HTTPStatus.OK
+
+    bucket_durations = dict(
+        timing.split(";dur=")
+        for timing in response.headers["Server-Timing"].split(", ")
+    )
+    assert list(bucket_durations) == [
+        "auth",
+        "db",
+        "redis",
+        "botx",
+        "handler",
+        "total",
+    ]
+    assert float(bucket_durations["redis"]) > 0
+    assert float(bucket_durations["total"]) >= float(bucket_durations["redis"])
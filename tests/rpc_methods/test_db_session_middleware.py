@@ -0,0 +1,119 @@
+from unittest.mock import Mock
+from uuid import uuid4
+
+import pytest
+from pybotx import Bot
+from pybotx_smartapp_rpc import RPCArgsBaseModel, RPCResultResponse, SmartApp
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.record.models import RecordModel
+from app.db.record.repo import RecordRepo
+from app.smartapp.middlewares.db_session import (
+    db_session_middleware,
+    read_only_db_session_middleware,
+)
+
+
+@pytest.fixture
+def smartapp(bot: Bot) -> SmartApp:
+    return SmartApp(bot, uuid4(), uuid4())
+
+
+async def test_db_session_not_opened_if_unused(
+    smartapp: SmartApp,
+) -> None:
+    # - Arrange -
+    session_factory = Mock(wraps=smartapp.bot.state.db_session_factory)
+    smartapp.bot.state.db_session_factory = session_factory
+
+    async def handler(  # noqa: WPS430
+        smartapp: SmartApp, rpc_arguments: RPCArgsBaseModel
+    ) -> RPCResultResponse:
+        return RPCResultResponse("")
+
+    # - Act -
+    await db_session_middleware(smartapp, RPCArgsBaseModel(), handler)
+
+    # - Assert -
+    session_factory.assert_not_called()
+
+
+async def test_db_session_rolled_back_on_error(
+    smartapp: SmartApp,
+    db_session: AsyncSession,
+) -> None:
+    # - Arrange -
+    async def handler(  # noqa: WPS430
+        smartapp: SmartApp, rpc_arguments: RPCArgsBaseModel
+    ) -> RPCResultResponse:
+        await RecordRepo(smartapp.state.db_session).create(record_data="rolled back")
+        raise ValueError
+
+    # - Act -
+    with pytest.raises(ValueError):
+        await db_session_middleware(smartapp, RPCArgsBaseModel(), handler)
+
+    # - Assert -
+    assert not await RecordRepo(db_session).get_all()
+
+
+async def test_db_session_committed_on_writes(
+    smartapp: SmartApp,
+    db_session: AsyncSession,
+) -> None:
+    # - Arrange -
+    async def handler(  # noqa: WPS430
+        smartapp: SmartApp, rpc_arguments: RPCArgsBaseModel
+    ) -> RPCResultResponse:
+        await RecordRepo(smartapp.state.db_session).create(record_data="committed")
+        return RPCResultResponse("")
+
+    # - Act -
+    await db_session_middleware(smartapp, RPCArgsBaseModel(), handler)
+
+    # - Assert -
+    records = await RecordRepo(db_session).get_all()
+    assert [record.record_data for record in records] == ["committed"]
+
+
+async def test_db_session_committed_on_core_writes(
+    smartapp: SmartApp,
+    db_session: AsyncSession,
+) -> None:
+    # - Arrange -
+    async def handler(  # noqa: WPS430
+        smartapp: SmartApp, rpc_arguments: RPCArgsBaseModel
+    ) -> RPCResultResponse:
+        connection = await smartapp.state.db_session.connection()
+        await connection.execute(insert(RecordModel).values(record_data="core"))
+        return RPCResultResponse("")
+
+    # - Act -
+    await db_session_middleware(smartapp, RPCArgsBaseModel(), handler)
+
+    # - Assert -
+    records = await RecordRepo(db_session).get_all()
+    assert [record.record_data for record in records] == ["core"]
+
+
+async def test_read_only_db_session_writes_logged(
+    smartapp: SmartApp,
+    db_session: AsyncSession,
+    loguru_caplog: pytest.LogCaptureFixture,
+) -> None:
+    # - Arrange -
+    async def handler(  # noqa: WPS430
+        smartapp: SmartApp, rpc_arguments: RPCArgsBaseModel
+    ) -> RPCResultResponse:
+        await smartapp.state.db_session.execute(
+            text("INSERT INTO records (record_data) VALUES ('read only')")
+        )
+        return RPCResultResponse("")
+
+    # - Act -
+    await read_only_db_session_middleware(smartapp, RPCArgsBaseModel(), handler)
+
+    # - Assert -
+    assert not await RecordRepo(db_session).get_all()
+    assert "Read-only DB session has writes" in loguru_caplog.text
@@ -0,0 +1,102 @@
+import asyncio
+from typing import Callable
+from uuid import uuid4
+
+from pybotx import Bot, SmartAppEvent
+from pybotx_smartapp_rpc import RPCResultResponse, SmartApp
+
+from app.smartapp.rpc_cache import cached
+from app.smartapp.rpc_methods.common import EchoArgs
+
+
+def build_smartapp(bot: Bot, event: SmartAppEvent) -> SmartApp:
+    return SmartApp(bot, event.bot.id, event.chat.id, event)
+
+
+async def test_cached_computes_once_for_concurrent_calls(
+    bot: Bot,
+    smartapp_event_factory: Callable[..., SmartAppEvent],
+) -> None:
+    # - Arrange -
+    calls = []
+    text = str(uuid4())
+
+    @cached(ttl=60)
+    async def handler(
+        smartapp: SmartApp, rpc_arguments: EchoArgs
+    ) -> RPCResultResponse[str]:
+        calls.append(rpc_arguments)
+        await asyncio.sleep(0.1)
+        return RPCResultResponse(rpc_arguments.text)
+
+    smartapp = build_smartapp(bot, smartapp_event_factory())
+
+    # - Act -
+    responses = await asyncio.gather(
+        *[handler(smartapp, EchoArgs(text=text)) for _ in range(5)]
+    )
+    cached_response = await handler(smartapp, EchoArgs(text=text))
+
+    # - Assert -
+    assert len(calls) == 1
+    assert {response.result for response in responses} == {text}
+    assert cached_response == RPCResultResponse(text)
+
+
+async def test_cached_per_user_separates_senders(
+    bot: Bot,
+    smartapp_event_factory: Callable[..., SmartAppEvent],
+) -> None:
+    # - Arrange -
+    calls = []
+
+    @cached(ttl=60, key=lambda smartapp, rpc_arguments: "constant", per_user=True)
+    async def handler(smartapp: SmartApp) -> RPCResultResponse[str]:
+        calls.append(smartapp)
+        return RPCResultResponse(str(smartapp.event.sender.huid))  # type: ignore
+
+    first_event = smartapp_event_factory()
+    second_event = smartapp_event_factory()
+    second_event.sender.huid = uuid4()
+
+    # - Act -
+    first_response = await handler(build_smartapp(bot, first_event))
+    second_response = await handler(build_smartapp(bot, second_event))
+
+    # - Assert -
+    assert len(calls) == 2
+    assert first_response != second_response
+
+
+async def test_cached_waiter_computes_response_if_computing_caller_cancelled(
+    bot: Bot,
+    smartapp_event_factory: Callable[..., SmartAppEvent],
+) -> None:
+    # - Arrange -
+    computing_smartapps = []
+    computation_started = asyncio.Event()
+    text = str(uuid4())
+
+    @cached(ttl=60)
+    async def handler(
+        smartapp: SmartApp, rpc_arguments: EchoArgs
+    ) -> RPCResultResponse[str]:
+        computing_smartapps.append(smartapp)
+        computation_started.set()
+        await asyncio.sleep(0.1)
+        return RPCResultResponse(rpc_arguments.text)
+
+    first_smartapp = build_smartapp(bot, smartapp_event_factory())
+    second_smartapp = build_smartapp(bot, smartapp_event_factory())
+    first_call = asyncio.create_task(handler(first_smartapp, EchoArgs(text=text)))
+    second_call = asyncio.create_task(handler(second_smartapp, EchoArgs(text=text)))
+    await computation_started.wait()
+
+    # - Act -
+    first_call.cancel()
+    second_response = await second_call
+
+    # - Assert -
+    assert first_call.cancelled()
+    assert second_response == RPCResultResponse(text)
+    assert computing_smartapps == [first_smartapp, second_smartapp]
@@ -0,0 +1,47 @@
+from uuid import uuid4
+
+from pybotx import Bot, BotAccountWithSecret
+
+from app.services.bot_accounts import BotAccountsIndex, get_bot_accounts_index
+from app.services.execute_rpc import RPCAuthConfig
+
+
+def test_bot_accounts_index_lookups(secret_key: str) -> None:
+    # - Arrange -
+    first_account = BotAccountWithSecret(
+        id=uuid4(), cts_url="https://cts.example.com", secret_key=secret_key
+    )
+    second_account = BotAccountWithSecret(
+        id=uuid4(), cts_url="https://cts.example.com", secret_key=secret_key
+    )
+
+    # - Act -
+    bot_accounts_index = BotAccountsIndex([first_account, second_account])
+
+    # - Assert -
+    assert bot_accounts_index.get(second_account.id) is second_account
+    assert bot_accounts_index.get(uuid4()) is None
+    assert bot_accounts_index.list_by_host("cts.example.com") == [
+        first_account,
+        second_account,
+    ]
+    assert list(bot_accounts_index) == [first_account, second_account]
+
+
+async def test_bot_accounts_index_built_on_startup(bot: Bot) -> None:
+    # - Act -
+    bot_accounts_index = get_bot_accounts_index(bot)
+
+    # - Assert -
+    assert bot_accounts_index is bot.state.bot_accounts_index
+    assert list(bot_accounts_index) == list(bot.bot_accounts)
+
+
+def test_rpc_auth_config_defaults_are_stable() -> None:
+    # - Act -
+    first_config = RPCAuthConfig()
+    second_config = RPCAuthConfig()
+
+    # - Assert -
+    assert first_config.sender_huid == second_config.sender_huid
+    assert first_config.chat_id == second_config.chat_id
@@ -1,10 +1,38 @@
+import asyncio
+from typing import Any
 from unittest.mock import AsyncMock
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import pytest
-from pybotx import Bot, UserFromSearch, UserKinds, UserNotFoundError
+from pybotx import (
+    Bot,
+    BotAccountWithSecret,
+    UserFromSearch,
+    UserKinds,
+    UserNotFoundError,
+)
 
-from app.services.botx_user_search import UserIsBotError, search_user_on_each_cts
+from app.services.botx_user_search import (
+    UserIsBotError,
+    search_user_on_each_cts,
+    search_users_on_each_cts,
+)
+from app.settings import settings
+
+
+def build_user(huid: UUID) -> UserFromSearch:
+    return UserFromSearch(
+        huid=huid,
+        ad_login=None,
+        ad_domain=None,
+        username="Test User",
+        company=None,
+        company_position=None,
+        department=None,
+        emails=[],
+        other_id=None,
+        user_kind=UserKinds.CTS_USER,
+    )
 
 
 async def test_search_user_on_each_cts_user_is_bot_error_raised(
@@ -78,3 +106,171 @@ async def test_search_user_on_each_cts_suceed(
     found_user, bot_account = search_result
     assert found_user is user
     assert bot_account is list(bot.bot_accounts)[0]
+
+
+async def test_search_user_on_each_cts_caches_users(
+    bot: Bot,
+) -> None:
+    # - Arrange -
+    user = UserFromSearch(
+        huid=UUID("86c4814b-feee-4ff0-b04d-4b3226318078"),
+        ad_login=None,
+        ad_domain=None,
+        username="Test User",
+        company=None,
+        company_position=None,
+        department=None,
+        emails=[],
+        other_id=None,
+        user_kind=UserKinds.CTS_USER,
+    )
+
+    bot.search_user_by_huid = AsyncMock(return_value=user)  # type: ignore
+    await search_user_on_each_cts(bot, UUID("86c4814b-feee-4ff0-b04d-4b3226318078"))
+
+    # - Act -
+    search_result = await search_user_on_each_cts(
+        bot, UUID("86c4814b-feee-4ff0-b04d-4b3226318078")
+    )
+
+    # - Assert -
+    assert search_result
+    assert search_result[0] == user
+    bot.search_user_by_huid.assert_awaited_once()
+
+
+async def test_search_user_on_each_cts_caches_not_found_users(
+    bot: Bot,
+) -> None:
+    # - Arrange -
+    bot.search_user_by_huid = AsyncMock(  # type: ignore
+        side_effect=UserNotFoundError("not found")
+    )
+    await search_user_on_each_cts(bot, UUID("86c4814b-feee-4ff0-b04d-4b3226318078"))
+
+    # - Act -
+    search_result = await search_user_on_each_cts(
+        bot, UUID("86c4814b-feee-4ff0-b04d-4b3226318078")
+    )
+
+    # - Assert -
+    assert search_result is None
+    assert bot.search_user_by_huid.await_count == len(list(bot.bot_accounts))
+
+
+async def test_search_user_on_each_cts_first_hit_wins(
+    bot: Bot,
+    secret_key: str,
+) -> None:
+    # - Arrange -
+    slow_account = BotAccountWithSecret(
+        id=uuid4(), cts_url="https://slow.example.com", secret_key=secret_key
+    )
+    fast_account = BotAccountWithSecret(
+        id=uuid4(), cts_url="https://fast.example.com", secret_key=secret_key
+    )
+    multi_cts_bot = Bot(collectors=[], bot_accounts=[slow_account, fast_account])
+    multi_cts_bot.state.redis_repo = bot.state.redis_repo
+    user = build_user(UUID("86c4814b-feee-4ff0-b04d-4b3226318078"))
+
+    async def search_user_by_huid(bot_id: UUID, huid: UUID) -> UserFromSearch:
+        if bot_id == slow_account.id:
+            await asyncio.sleep(10)
+        return user
+
+    multi_cts_bot.search_user_by_huid = search_user_by_huid  # type: ignore
+
+    # - Act -
+    search_result = await asyncio.wait_for(
+        search_user_on_each_cts(multi_cts_bot, user.huid), timeout=1
+    )
+
+    # - Assert -
+    assert search_result == (user, fast_account)
+
+
+async def test_search_user_on_each_cts_host_timeout(
+    bot: Bot,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # - Arrange -
+    monkeypatch.setattr(settings, "USER_SEARCH_TIMEOUT", 0.01)
+
+    async def search_user_by_huid(**kwargs: Any) -> UserFromSearch:
+        await asyncio.sleep(10)
+        raise NotImplementedError
+
+    bot.search_user_by_huid = search_user_by_huid  # type: ignore
+
+    # - Act -
+    search_result = await search_user_on_each_cts(
+        bot, UUID("86c4814b-feee-4ff0-b04d-4b3226318078")
+    )
+
+    # - Assert -
+    assert search_result is None
+
+
+async def test_search_users_on_each_cts(bot: Bot) -> None:
+    # - Arrange -
+    found_huid = UUID("86c4814b-feee-4ff0-b04d-4b3226318078")
+    missing_huid = UUID("dd4d6c98-2ad5-4bfc-b3dd-7d4f0de0f9c6")
+
+    async def search_user_by_huid(bot_id: UUID, huid: UUID) -> UserFromSearch:
+        if huid == missing_huid:
+            raise UserNotFoundError("not found")
+        return build_user(huid)
+
+    bot.search_user_by_huid = search_user_by_huid  # type: ignore
+
+    # - Act -
+    search_results = await search_users_on_each_cts(
+        bot, [found_huid, missing_huid, found_huid], concurrency=1
+    )
+
+    # - Assert -
+    assert search_results == {
+        found_huid: (build_user(found_huid), list(bot.bot_accounts)[0]),
+        missing_huid: None,
+    }
+
+
+async def test_search_user_on_each_cts_skips_failed_host(
+    bot: Bot,
+    secret_key: str,
+) -> None:
+    # - Arrange -
+    failed_account = BotAccountWithSecret(
+        id=uuid4(), cts_url="https://failed.example.com", secret_key=secret_key
+    )
+    working_account = BotAccountWithSecret(
+        id=uuid4(), cts_url="https://working.example.com", secret_key=secret_key
+    )
+    multi_cts_bot = Bot(collectors=[], bot_accounts=[failed_account, working_account])
+    multi_cts_bot.state.redis_repo = bot.state.redis_repo
+    user = build_user(UUID("86c4814b-feee-4ff0-b04d-4b3226318078"))
+
+    async def search_user_by_huid(bot_id: UUID, huid: UUID) -> UserFromSearch:
+        if bot_id == failed_account.id:
+            raise ConnectionError("cts is unavailable")
+        await asyncio.sleep(0.01)
+        return user
+
+    multi_cts_bot.search_user_by_huid = search_user_by_huid  # type: ignore
+
+    # - Act -
+    search_result = await search_user_on_each_cts(multi_cts_bot, user.huid)
+
+    # - Assert -
+    assert search_result == (user, working_account)
+
+
+async def test_search_user_on_each_cts_fails_if_each_host_failed(bot: Bot) -> None:
+    # - Arrange -
+    bot.search_user_by_huid = AsyncMock(  # type: ignore
+        side_effect=ConnectionError("cts is unavailable")
+    )
+
+    # - Act -
+    with pytest.raises(ConnectionError):
+        await search_user_on_each_cts(bot, UUID("86c4814b-feee-4ff0-b04d-4b3226318078"))
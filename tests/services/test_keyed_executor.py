@@ -0,0 +1,50 @@
+import asyncio
+from functools import partial
+from typing import List
+
+from app.services.keyed_executor import KeyedExecutor
+
+
+async def test_keyed_executor_runs_same_key_in_order() -> None:
+    # - Arrange -
+    keyed_executor = KeyedExecutor()
+    finished_calls: List[int] = []
+
+    async def call(call_index: int) -> int:  # noqa: WPS430
+        # Later calls are faster, so they would overtake without ordering
+        await asyncio.sleep(0.01 / call_index)
+        finished_calls.append(call_index)
+        return call_index
+
+    # - Act -
+    calls = [partial(call, index) for index in range(1, 4)]
+    call_results = await asyncio.gather(
+        *[keyed_executor.run("chat", indexed_call) for indexed_call in calls]
+    )
+
+    # - Assert -
+    assert finished_calls == [1, 2, 3]
+    assert call_results == [1, 2, 3]
+    assert keyed_executor.active_keys_count == 0
+
+
+async def test_keyed_executor_runs_different_keys_in_parallel() -> None:
+    # - Arrange -
+    keyed_executor = KeyedExecutor()
+    second_call_started = asyncio.Event()
+
+    async def start_second_call() -> None:  # noqa: WPS430
+        second_call_started.set()
+
+    # - Act -
+    # First call would wait forever if calls of other keys waited for it
+    await asyncio.wait_for(
+        asyncio.gather(
+            keyed_executor.run("first chat", second_call_started.wait),
+            keyed_executor.run("second chat", start_second_call),
+        ),
+        timeout=1,
+    )
+
+    # - Assert -
+    assert keyed_executor.active_keys_count == 0
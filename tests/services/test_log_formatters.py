@@ -0,0 +1,155 @@
+import json
+from typing import Any, Dict
+from unittest.mock import Mock
+
+from pybotx.constants import MAX_FILE_LEN_IN_LOGS
+from pybotx.models.system_events.smartapp_event import BotAPISmartAppEvent
+
+from app.services.log_formatters import (
+    MAX_DEPTH,
+    MAX_ITEMS,
+    MAX_STRING_LENGTH,
+    format_raw_command,
+    format_smartapp_event,
+    lazy_formatted,
+    trim_jsonable,
+)
+
+
+def build_smartapp_event_payload(rpc_params: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "bot_id": "24348246-6791-4ac0-9d86-b948cd6a0e46",
+        "sync_id": "a465f0f3-1354-491c-8f11-f400164295cb",
+        "proto_version": 4,
+        "command": {
+            "body": "system:smartapp_event",
+            "command_type": "system",
+            "data": {
+                "ref": "6fafda2c-6505-57a5-a088-25ea5d1d0364",
+                "smartapp_id": "24348246-6791-4ac0-9d86-b948cd6a0e46",
+                "data": {
+                    "type": "smartapp_rpc",
+                    "method": "upload",
+                    "params": rpc_params,
+                },
+                "opts": {},
+                "smartapp_api_version": 1,
+            },
+            "metadata": {},
+        },
+        "async_files": [],
+        "attachments": [],
+        "entities": [],
+        "from": {
+            "user_huid": "b9197d3a-d855-5d34-ba8a-eff3a975ab20",
+            "group_chat_id": "dea55ee4-7a9f-5da0-8c5d-995c2e8a2b98",
+            "host": "cts.example.com",
+            "chat_type": "chat",
+            "ad_login": None,
+            "ad_domain": None,
+            "username": None,
+            "is_admin": True,
+            "is_creator": True,
+            "manufacturer": None,
+            "device": None,
+            "device_software": None,
+            "device_meta": None,
+            "platform": None,
+            "platform_package_id": None,
+            "app_version": None,
+            "locale": "en",
+            "user_udid": None,
+        },
+    }
+
+
+def test_format_smartapp_event_trims_files_data_in_rpc_params() -> None:
+    # - Arrange -
+    file_data = "data:image/png;base64,{0}".format("A" * 10000)
+    botx_file = {"file_name": "image.png", "data": file_data}
+    raw_command = build_smartapp_event_payload(
+        {"document": botx_file, "images": [botx_file], "title": "Images"}
+    )
+    BotAPISmartAppEvent.parse_obj(raw_command)
+
+    # - Act -
+    formatted_event = format_smartapp_event(raw_command)
+
+    # - Assert -
+    rpc_request = json.loads(formatted_event)["command"]["data"]["data"]
+    logged_document = rpc_request["params"]["document"]
+    assert logged_document == {
+        "file_name": "image.png",
+        "data": "{0}...<trimmed>".format(file_data[:MAX_FILE_LEN_IN_LOGS]),
+    }
+    assert rpc_request["params"]["images"] == [logged_document]
+    assert rpc_request["params"]["title"] == "Images"
+    assert "\n" not in formatted_event
+
+
+def test_format_raw_command_trims_attachments_content() -> None:
+    # - Arrange -
+    file_content = "data:image/png;base64,{0}".format("A" * 10000)
+    link_attachment = {"type": "link", "data": {"url": "https://example.com"}}
+    raw_command = {
+        "command": {"body": "/upload"},
+        "attachments": [
+            {"type": "image", "data": {"content": file_content}},
+            link_attachment,
+        ],
+    }
+
+    # - Act -
+    formatted_command = format_raw_command(raw_command)
+
+    # - Assert -
+    logged_image, logged_link = json.loads(formatted_command)["attachments"]
+    assert logged_image["data"]["content"] == "{0}...<trimmed>".format(
+        file_content[:MAX_FILE_LEN_IN_LOGS]
+    )
+    assert logged_link == link_attachment
+
+
+def test_format_smartapp_event_bounds_data_urls_out_of_files() -> None:
+    # - Arrange -
+    params_text = "data:{0}".format("A" * MAX_STRING_LENGTH)
+    raw_command = build_smartapp_event_payload({"text": params_text})
+
+    # - Act -
+    formatted_event = format_smartapp_event(raw_command)
+
+    # - Assert -
+    rpc_request = json.loads(formatted_event)["command"]["data"]["data"]
+    logged_text = rpc_request["params"]["text"]
+    assert logged_text == "{0}...<5 more chars>".format(params_text[:MAX_STRING_LENGTH])
+
+
+def test_trim_jsonable_bounds_long_and_deep_structures() -> None:
+    # - Arrange -
+    deep_dict: dict = {}
+    nested_dict = deep_dict
+    for _ in range(MAX_DEPTH + 1):
+        nested_dict["nested"] = {}
+        nested_dict = nested_dict["nested"]
+
+    # - Act -
+    trimmed_list = trim_jsonable(list(range(MAX_ITEMS + 10)))
+    trimmed_dict = trim_jsonable(deep_dict)
+
+    # - Assert -
+    assert trimmed_list[-1] == "<10 more items>"
+    assert len(trimmed_list) == MAX_ITEMS + 1
+    assert "too deep" in json.dumps(trimmed_dict)
+
+
+def test_lazy_formatted_formats_once() -> None:
+    # - Arrange -
+    formatter = Mock(return_value="formatted")
+    format_once = lazy_formatted(formatter, {"command": {}})
+
+    # - Act -
+    formatted_commands = [format_once(), format_once()]
+
+    # - Assert -
+    assert formatted_commands == ["formatted", "formatted"]
+    formatter.assert_called_once_with({"command": {}})
@@ -0,0 +1,154 @@
+import json
+import logging
+import threading
+from io import StringIO
+from typing import Iterator, List
+
+import pytest
+
+from app.logger import (
+    BackgroundStreamWriter,
+    InterceptHandler,
+    RateLimitFilter,
+    format_json,
+    logger,
+)
+
+
+class BlockingStream(StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.write_started = threading.Event()
+        self.write_allowed = threading.Event()
+
+    def write(self, message: str) -> int:
+        self.write_started.set()
+        self.write_allowed.wait()
+        return super().write(message)
+
+
+class FailingOnceStream(StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.write_failed = threading.Event()
+
+    def write(self, message: str) -> int:
+        if not self.write_failed.is_set():
+            self.write_failed.set()
+            raise OSError("Stream is not writable")
+
+        return super().write(message)
+
+
+@pytest.fixture
+def stdlib_logger() -> Iterator[logging.Logger]:
+    stdlib_logger = logging.getLogger("tests.stdlib")
+    stdlib_logger.addHandler(InterceptHandler())
+    stdlib_logger.setLevel(logging.INFO)
+    stdlib_logger.propagate = False
+    yield stdlib_logger
+    stdlib_logger.handlers = []
+    stdlib_logger.setLevel(logging.NOTSET)
+    stdlib_logger.propagate = True
+
+
+def test_rate_limit_filter_drops_records_over_limit() -> None:
+    # - Arrange -
+    messages: List[str] = []
+    handler_id = logger.add(
+        messages.append, format="{message}", filter=RateLimitFilter(2)
+    )
+
+    # - Act -
+    for index in range(4):
+        logger.info(f"info {index}")
+    logger.warning("warning")
+    logger.remove(handler_id)
+
+    # - Assert -
+    assert [message.strip() for message in messages] == ["info 0", "info 1", "warning"]
+
+
+def test_format_json_serializes_record_with_extra() -> None:
+    # - Arrange -
+    messages: List[str] = []
+    handler_id = logger.add(messages.append, format=format_json)
+
+    # - Act -
+    logger.bind(chat_id="chat").info("Message")
+    logger.remove(handler_id)
+
+    # - Assert -
+    json_record = json.loads(messages[0])
+    assert json_record["message"] == "Message"
+    assert json_record["level"] == "INFO"
+    assert json_record["extra"] == {"chat_id": "chat"}
+
+
+def test_rate_limit_filter_limits_each_stdlib_logger(
+    stdlib_logger: logging.Logger,
+) -> None:
+    # - Arrange -
+    messages: List[str] = []
+    handler_id = logger.add(
+        messages.append, format="{message}", filter=RateLimitFilter(1)
+    )
+    other_stdlib_logger = logging.getLogger("tests.stdlib.other")
+
+    # - Act -
+    stdlib_logger.info("first 0")
+    stdlib_logger.info("first 1")
+    other_stdlib_logger.info("other 0")
+    logger.remove(handler_id)
+
+    # - Assert -
+    assert [message.strip() for message in messages] == ["first 0", "other 0"]
+
+
+def test_format_json_uses_stdlib_logger_name(stdlib_logger: logging.Logger) -> None:
+    # - Arrange -
+    messages: List[str] = []
+    handler_id = logger.add(messages.append, format=format_json)
+
+    # - Act -
+    stdlib_logger.info("Message")
+    logger.remove(handler_id)
+
+    # - Assert -
+    json_record = json.loads(messages[0])
+    assert json_record["logger"] == "tests.stdlib"
+    assert "extra" not in json_record
+
+
+def test_background_stream_writer_drops_messages_over_queue_size() -> None:
+    # - Arrange -
+    stream = BlockingStream()
+    writer = BackgroundStreamWriter(stream, max_size=1)
+
+    # - Act -
+    writer.write("first\n")
+    stream.write_started.wait()
+    writer.write("second\n")
+    writer.write("third\n")
+    stream.write_allowed.set()
+    writer.stop()
+
+    # - Assert -
+    assert stream.getvalue() == "first\nsecond\n"
+    assert writer.dropped_count == 1
+
+
+def test_background_stream_writer_survives_write_error() -> None:
+    # - Arrange -
+    stream = FailingOnceStream()
+    writer = BackgroundStreamWriter(stream)
+
+    # - Act -
+    writer.write("first\n")
+    stream.write_failed.wait()
+    writer.write("second\n")
+    writer.stop()
+
+    # - Assert -
+    assert stream.getvalue() == "second\n"
+    assert writer.dropped_count == 1
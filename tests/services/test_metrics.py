@@ -0,0 +1,116 @@
+import os
+import time
+from pathlib import Path
+
+from app.metrics.registry import (
+    STALE_WRITE_INTERVALS,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    MultiprocessMetricsStore,
+    clear_metrics_directory,
+    merge_dumps,
+    render_dump,
+)
+
+WRITE_INTERVAL = 5
+
+
+def test_histogram_rendered_with_cumulative_buckets() -> None:
+    # - Arrange -
+    registry = MetricsRegistry()
+    histogram = Histogram(
+        "duration_seconds",
+        "Duration.",
+        labelnames=("operation",),
+        buckets=(0.1, 1),
+        registry=registry,
+    )
+
+    # - Act -
+    for amount in (0.05, 0.5, 5):
+        histogram.observe(amount, operation="get")
+
+    # - Assert -
+    assert render_dump(registry.dump()) == (
+        "# HELP duration_seconds Duration.\n"
+        "# TYPE duration_seconds histogram\n"
+        'duration_seconds_bucket{operation="get",le="0.1"} 1\n'
+        'duration_seconds_bucket{operation="get",le="1"} 2\n'
+        'duration_seconds_bucket{operation="get",le="+Inf"} 3\n'
+        'duration_seconds_sum{operation="get"} 5.55\n'
+        'duration_seconds_count{operation="get"} 3\n'
+    )
+
+
+def test_merge_dumps_sums_samples_of_processes() -> None:
+    # - Arrange -
+    processes_dumps = []
+    for requests_count in (1, 2):
+        registry = MetricsRegistry()
+        counter = Counter("requests_total", "Requests.", ("path",), registry)
+        counter.inc(requests_count, path="/")
+        counter.inc(path=f"/{requests_count}")
+        processes_dumps.append(registry.dump())
+
+    # - Act -
+    merged_dump = merge_dumps(processes_dumps)
+
+    # - Assert -
+    assert merged_dump["requests_total"]["samples"] == [
+        [["/"], 3],
+        [["/1"], 1],
+        [["/2"], 1],
+    ]
+
+
+def test_multiprocess_store_reads_dumps_of_all_processes(tmp_path: Path) -> None:
+    # - Arrange -
+    registry = MetricsRegistry()
+    Gauge("queue_depth", "Depth.", registry=registry).set(3)
+    Counter("requests_total", "Requests.", registry=registry).inc()
+    stores = [MultiprocessMetricsStore(str(tmp_path), WRITE_INTERVAL) for _ in range(2)]
+
+    # - Act -
+    stores[0].write(registry.dump())
+    stores[1].write(registry.dump(include_gauges=False))
+    merged_dump = merge_dumps(stores[0].read_all())
+
+    # - Assert -
+    assert merged_dump["queue_depth"]["samples"] == [[[], 3]]
+    assert merged_dump["requests_total"]["samples"] == [[[], 2]]
+
+
+def test_multiprocess_store_skips_gauges_of_stale_dumps(tmp_path: Path) -> None:
+    # - Arrange -
+    registry = MetricsRegistry()
+    Gauge("queue_depth", "Depth.", registry=registry).set(3)
+    Counter("requests_total", "Requests.", registry=registry).inc()
+    stale_store, store = [
+        MultiprocessMetricsStore(str(tmp_path), WRITE_INTERVAL) for _ in range(2)
+    ]
+    stale_store.write(registry.dump())
+    stale_time = time.time() - WRITE_INTERVAL * (STALE_WRITE_INTERVALS + 1)
+    for dump_path in tmp_path.glob("*.json"):
+        os.utime(dump_path, (stale_time, stale_time))
+
+    # - Act -
+    store.write(registry.dump())
+    merged_dump = merge_dumps(store.read_all())
+
+    # - Assert -
+    assert merged_dump["queue_depth"]["samples"] == [[[], 3]]
+    assert merged_dump["requests_total"]["samples"] == [[[], 2]]
+
+
+def test_clear_metrics_directory_removes_dumps(tmp_path: Path) -> None:
+    # - Arrange -
+    store = MultiprocessMetricsStore(str(tmp_path), WRITE_INTERVAL)
+    store.write(MetricsRegistry().dump())
+
+    # - Act -
+    clear_metrics_directory(str(tmp_path))
+
+    # - Assert -
+    assert not store.read_all()
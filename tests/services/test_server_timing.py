@@ -0,0 +1,33 @@
+from typing import Iterator
+
+import pytest
+
+from app.services import server_timing
+
+
+@pytest.fixture
+def timings() -> Iterator[server_timing.Timings]:
+    timings: server_timing.Timings = {}
+    token = server_timing.request_timings.set(timings)
+    yield timings
+    server_timing.request_timings.reset(token)
+
+
+def test_nested_timed_blocks_are_excluded_from_parent_bucket(
+    timings: server_timing.Timings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # - Arrange -
+    clock = iter((0, 1, 3, 6))
+    monkeypatch.setattr(server_timing.time, "perf_counter", lambda: next(clock))
+
+    # - Act -
+    with server_timing.timed("auth"):
+        with server_timing.timed("redis"):
+            server_timing.add_timing("db", 0.5)
+
+    # - Assert -
+    assert timings == {"db": 0.5, "redis": 1.5, "auth": 4.0}
+    assert server_timing.format_server_timing(timings, 7).startswith(
+        "auth;dur=4000.000, db;dur=500.000, redis;dur=1500.000, "
+        "botx;dur=0.000, handler;dur=1000.000"
+    )
@@ -0,0 +1,127 @@
+import json
+import threading
+from pathlib import Path
+from typing import Awaitable, Callable, List
+
+import pytest
+from pybotx_smartapp_rpc import RPCResponse
+
+from app.tracing.exporter import EXPORT_BATCH_SIZE, FileSpanExporter
+from app.tracing.spans import (
+    Span,
+    SpanContext,
+    SpanKind,
+    format_traceparent,
+    parse_traceparent,
+    tracer,
+)
+
+
+class ListSpanExporter:
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def flush(self) -> None:
+        """Spans are available immediately."""
+
+
+@pytest.fixture
+def span_exporter(monkeypatch: pytest.MonkeyPatch) -> ListSpanExporter:
+    span_exporter = ListSpanExporter()
+    monkeypatch.setattr(tracer, "exporter", span_exporter)
+    return span_exporter
+
+
+def test_file_exporter_writes_otlp_json(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # - Arrange -
+    span_exporter = FileSpanExporter(str(tmp_path), "bot")
+    monkeypatch.setattr(tracer, "exporter", span_exporter)
+
+    # - Act -
+    with tracer.span("rpc test:echo", SpanKind.SERVER):
+        with pytest.raises(ValueError):
+            with tracer.span("db SELECT", SpanKind.CLIENT, {"db.system": "postgresql"}):
+                raise ValueError("failed")
+    span_exporter.flush()
+
+    # - Assert -
+    spans_path = next(tmp_path.glob("*.jsonl"))
+    export_request = json.loads(spans_path.read_text())
+    resource_spans = export_request["resourceSpans"][0]
+    db_span, rpc_span = resource_spans["scopeSpans"][0]["spans"]
+
+    assert db_span["traceId"] == rpc_span["traceId"]
+    assert db_span["parentSpanId"] == rpc_span["spanId"]
+    assert "parentSpanId" not in rpc_span
+    assert db_span["status"] == {"code": 2, "message": "ValueError: failed"}
+    assert db_span["attributes"] == [
+        {"key": "db.system", "value": {"stringValue": "postgresql"}}
+    ]
+
+
+def test_file_exporter_writes_full_batches_in_background(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # - Arrange -
+    span_exporter = FileSpanExporter(str(tmp_path), "bot")
+    monkeypatch.setattr(tracer, "exporter", span_exporter)
+    writer_threads = set()
+    write_spans = span_exporter._write_spans  # noqa: WPS437
+
+    def tracked_write_spans(spans: List[Span]) -> None:  # noqa: WPS430
+        writer_threads.add(threading.get_ident())
+        write_spans(spans)
+
+    monkeypatch.setattr(span_exporter, "_write_spans", tracked_write_spans)
+    exported_names = []
+
+    # - Act -
+    for span_index in range(EXPORT_BATCH_SIZE + 1):
+        span_name = f"db SELECT {span_index}"
+        with tracer.span(span_name, SpanKind.CLIENT):
+            exported_names.append(span_name)
+    span_exporter.flush()
+
+    # - Assert -
+    spans_path = next(tmp_path.glob("*.jsonl"))
+    scope_spans = [
+        json.loads(export_request)["resourceSpans"][0]["scopeSpans"][0]
+        for export_request in spans_path.read_text().splitlines()
+    ]
+    written_names = [span["name"] for spans in scope_spans for span in spans["spans"]]
+    assert written_names == exported_names
+    assert len(writer_threads) == 2
+    assert threading.get_ident() in writer_threads
+
+
+def test_traceparent_continues_trace() -> None:
+    # - Arrange -
+    span_context = SpanContext(trace_id="a" * 32, span_id="b" * 16)
+
+    # - Act -
+    parsed_context = parse_traceparent(format_traceparent(span_context))
+
+    # - Assert -
+    assert parsed_context == span_context
+    assert parse_traceparent("invalid") is None
+
+
+async def test_rpc_method_span_includes_db_statements(
+    perform_rpc_request: Callable[..., Awaitable[RPCResponse]],
+    span_exporter: ListSpanExporter,
+) -> None:
+    # - Act -
+    await perform_rpc_request(method="test:db")
+
+    # - Assert -
+    rpc_span = span_exporter.spans[-1]
+    db_spans = [span for span in span_exporter.spans if span.name.startswith("db ")]
+
+    assert rpc_span.kind == SpanKind.SERVER
+    assert db_spans
+    assert {span.parent_span_id for span in db_spans} == {rpc_span.context.span_id}